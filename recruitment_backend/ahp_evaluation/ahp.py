@@ -1,26 +1,94 @@
 import numpy as np
-from ahp_evaluation.models import GenericCandidateForm
-from users.models import Job, Constraint, SkillRequirement
+from ahp_evaluation.priorities import compute_priorities
+from data_normalization.features import form_text, get_features
+from data_normalization.vocabulary import get_vocabulary, intern_terms, unpack_terms
 
 class AHP:
-    def __init__(self, job, candidate):
+    def __init__(self, job, candidate, form_data=None):
         """
         Initialise l'AHP avec le poste et le candidat.
         job: L'objet Job (contenant les contraintes et compétences)
         candidate: L'objet Candidate (contenant les informations sur le CV)
+        form_data: Critères du formulaire déjà chargés (sinon, les compétences du formulaire
+        calculées à l'écriture sont utilisées)
         """
         self.job = job
         self.candidate = candidate
         self.matrice_comparaison = self._creer_matrice_comparaison()
 
-        # Récupération des informations du candidat via le formulaire générique
-        self.form_data = GenericCandidateForm.objects.filter(candidate=self.candidate).first()
+        # Critères du job regroupés par catégorie, puis convertis en identifiants de compétences
+        self.contraintes_hard = []
+        self.contraintes_soft = []
+        for contrainte in self.job.constraints.all():
+            if contrainte.type == 'hard':
+                self.contraintes_hard.append(contrainte.value)
+            else:
+                self.contraintes_soft.append(contrainte.value)
+        self.competences = [competence.name for competence in self.job.skill_requirements.all()]
+        self.termes = intern_terms(self.contraintes_hard + self.contraintes_soft + self.competences)
+        self.version_requise = get_vocabulary().required_version(self.termes)
+
+        # Compétences du candidat d'après son formulaire générique
+        if form_data is not None:
+            self.termes_formulaire = set(get_vocabulary().tokenize(form_text(form_data)))
+        elif self.candidate is not None:
+            features = get_features([self.candidate], self.version_requise)[self.candidate.pk]
+            self.termes_formulaire = set(unpack_terms(features.form_terms))
+        else:
+            self.termes_formulaire = set()
+        self._correspondances = None
+
+    def _trouver_termes(self, termes_candidat):
+        """Indices des critères du job présents parmi les compétences d'un candidat"""
+        return {idx for idx, terme in enumerate(self.termes) if terme is None or terme in termes_candidat}
+
+    @classmethod
+    def score_many(cls, job, candidates):
+        """
+        Calcule le score de tous les candidats d'une offre en une seule fois.
+        ➡️ Les critères du job et leurs poids sont calculés une seule fois, les compétences
+        (formulaires) de tous les candidats sont chargées en une requête,
+        puis les scores sont obtenus par un produit matrice-vecteur (candidats × critères).
+        Retourne un tableau numpy de scores aligné sur `candidates`.
+        """
+        candidates = list(candidates)
+        ahp = cls(job, None)
+        poids_criteres = ahp.calculer_poids_criteres()
+
+        # Chargement groupé des caractéristiques calculées à l'écriture
+        features = get_features(candidates, ahp.version_requise)
+
+        # Matrice de correspondance : une ligne par candidat, une colonne par critère du job
+        nb_hard = len(ahp.contraintes_hard)
+        nb_soft = len(ahp.contraintes_soft)
+        nb_competences = len(ahp.competences)
+        correspondances = np.zeros((len(candidates), nb_hard + nb_soft + nb_competences))
+        for ligne, candidate in enumerate(candidates):
+            trouves = ahp._trouver_termes(set(unpack_terms(features[candidate.pk].form_terms)))
+            if trouves:
+                correspondances[ligne, list(trouves)] = 1
+
+        # Contribution de chaque critère au score final : poids de sa catégorie / taille de la catégorie
+        contributions = np.concatenate([
+            np.full(nb_hard, poids_criteres[0] / nb_hard if nb_hard else 0),
+            np.full(nb_soft, poids_criteres[1] / nb_soft if nb_soft else 0),
+            np.full(nb_competences, poids_criteres[2] / nb_competences if nb_competences else 0),
+        ])
+        # Catégories sans critère : mêmes valeurs par défaut que evaluer_* (hard/soft = 1, compétences = 0)
+        score_defaut = (poids_criteres[0] if not nb_hard else 0) + (poids_criteres[1] if not nb_soft else 0)
+
+        scores = correspondances @ contributions + score_defaut
+        return np.round(scores * 100, 2)
 
     def _creer_matrice_comparaison(self):
         """
         Crée la matrice de comparaison par paires basée sur les critères du job.
         Cette matrice doit être remplie en fonction de la comparaison des critères entre eux.
+        Si le job définit sa propre matrice (comparison_matrix), elle est utilisée.
         """
+        if self.job.comparison_matrix:
+            return np.array(self.job.comparison_matrix, dtype=float)
+
         num_criteres = 3  # Exemple: 3 critères - contraintes hard, contraintes soft, compétences
         matrice_comparaison = np.ones((num_criteres, num_criteres))
 
@@ -38,14 +106,22 @@ class AHP:
 
     def calculer_poids_criteres(self):
         """
-        Calcule les poids des critères en utilisant la matrice de comparaison.
+        Calcule les poids des critères (vecteur propre principal de la matrice de comparaison).
         """
-        # Normalisation de la matrice de comparaison
-        matrice_normalisee = self.matrice_comparaison / self.matrice_comparaison.sum(axis=0)
+        return self.priorites().weights
 
-        # Calcul des poids (moyenne des lignes)
-        poids_criteres = matrice_normalisee.mean(axis=1)
-        return poids_criteres
+    def priorites(self):
+        """
+        Poids, valeur propre principale et ratio de cohérence de la matrice de comparaison.
+        Le calcul est mis en cache pour toutes les offres partageant la même matrice.
+        """
+        return compute_priorities(self.matrice_comparaison)
+
+    def ratio_coherence(self):
+        """
+        Ratio de cohérence (CR) de la matrice : les jugements sont acceptables si CR <= 0.1.
+        """
+        return self.priorites().consistency_ratio
 
     def calculer_score_candidat(self):
         """
@@ -67,38 +143,45 @@ class AHP:
 
         return round(score_total * 100, 2)
 
+    def _trouver_correspondances(self):
+        """
+        Recherche tous les critères du job parmi les compétences du formulaire du candidat,
+        puis retourne le nombre de critères trouvés par catégorie (hard, soft, compétences).
+        """
+        if self._correspondances is None:
+            trouves = self._trouver_termes(self.termes_formulaire)
+            nb_hard = len(self.contraintes_hard)
+            nb_soft = len(self.contraintes_soft)
+            self._correspondances = (
+                sum(1 for idx in trouves if idx < nb_hard),
+                sum(1 for idx in trouves if nb_hard <= idx < nb_hard + nb_soft),
+                sum(1 for idx in trouves if idx >= nb_hard + nb_soft),
+            )
+        return self._correspondances
+
     def evaluer_contraintes_hard(self):
         """
         Évalue si le candidat satisfait les contraintes hard (par exemple, expérience).
         """
-        score_hard = 0
-        for contrainte in self.job.constraints.filter(type='hard'):
-            # On vérifie si la contrainte (comme une expérience) est présente dans le formulaire du candidat
-            if contrainte.description.lower() in self.form_data.experience.lower():
-                score_hard += 1
-        return score_hard / len(self.job.constraints.filter(type='hard')) if self.job.constraints.filter(type='hard') else 1
+        if not self.contraintes_hard:
+            return 1
+        return self._trouver_correspondances()[0] / len(self.contraintes_hard)
 
     def evaluer_contraintes_soft(self):
         """
         Évalue si le candidat satisfait les contraintes soft (par exemple, compétences en communication).
         """
-        score_soft = 0
-        for contrainte in self.job.constraints.filter(type='soft'):
-            # On vérifie si la contrainte (comme des compétences en communication) est présente dans le formulaire du candidat
-            if contrainte.description.lower() in self.form_data.communication_skills:
-                score_soft += 1
-        return score_soft / len(self.job.constraints.filter(type='soft')) if self.job.constraints.filter(type='soft') else 1
+        if not self.contraintes_soft:
+            return 1
+        return self._trouver_correspondances()[1] / len(self.contraintes_soft)
 
     def evaluer_competences(self):
         """
         Évalue si le candidat possède les compétences requises pour le poste.
         """
-        score_competences = 0
-        for competence in self.job.skill_requirements.all():
-            # On vérifie si la compétence est présente dans les données du formulaire du candidat
-            if competence.name.lower() in self.form_data.skills.lower():
-                score_competences += 1
-        return score_competences / len(self.job.skill_requirements.all()) if self.job.skill_requirements.all() else 0
+        if not self.competences:
+            return 0
+        return self._trouver_correspondances()[2] / len(self.competences)
 
     def __str__(self):
         """
@@ -0,0 +1,108 @@
+"""
+Moteur de calcul des priorités AHP.
+➡️ À partir d'une matrice de comparaison par paires (n × n), calcule :
+ weights → vecteur propre principal normalisé (méthode des puissances)
+ lambda_max → valeur propre principale
+ consistency_index → indice de cohérence CI = (lambda_max - n) / (n - 1)
+ consistency_ratio → ratio de cohérence CR = CI / RI (acceptable si CR <= 0.1)
+Les résultats sont mis en cache (LRU) par matrice : les offres qui partagent
+la même matrice ne refont pas le calcul à chaque évaluation de candidat.
+"""
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+
+# Indices aléatoires de Saaty (RI) selon la taille de la matrice
+RANDOM_INDEX = {
+    1: 0.0, 2: 0.0, 3: 0.58, 4: 0.90, 5: 1.12, 6: 1.24, 7: 1.32, 8: 1.41,
+    9: 1.45, 10: 1.49, 11: 1.51, 12: 1.48, 13: 1.56, 14: 1.57, 15: 1.59,
+}
+
+# Au-delà de ce ratio, les jugements de la matrice sont considérés incohérents
+CONSISTENCY_THRESHOLD = 0.1
+
+PRIORITIES_CACHE_SIZE = 1024
+
+# Cache LRU : empreinte de la matrice → priorités
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+Priorities = namedtuple('Priorities', ['weights', 'lambda_max', 'consistency_index', 'consistency_ratio', 'iterations'])
+
+
+def validate_comparison_matrix(matrix):
+    """
+    Vérifie qu'une matrice de comparaison est carrée, strictement positive et réciproque
+    (a[j][i] = 1 / a[i][j]). Retourne la matrice sous forme de tableau numpy.
+    """
+    try:
+        matrix = np.asarray(matrix, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("La matrice de comparaison doit contenir uniquement des nombres.")
+
+    if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1] or matrix.shape[0] == 0:
+        raise ValueError("La matrice de comparaison doit être carrée (n × n).")
+    if not np.all(np.isfinite(matrix)) or np.any(matrix <= 0):
+        raise ValueError("Les valeurs de la matrice de comparaison doivent être strictement positives.")
+    if not np.allclose(matrix * matrix.T, 1.0, rtol=1e-3):
+        raise ValueError("La matrice de comparaison doit être réciproque (a[j][i] = 1 / a[i][j]).")
+    return matrix
+
+
+def compute_priorities(matrix, tolerance=1e-10, max_iterations=1000):
+    """
+    Calcule les priorités (poids) d'une matrice de comparaison par paires.
+    Le résultat est partagé entre tous les appels avec une matrice identique.
+    """
+    matrix = np.ascontiguousarray(matrix, dtype=float)
+    key = (matrix.shape[0], hashlib.blake2b(matrix.tobytes(), digest_size=16).digest(), tolerance, max_iterations)
+
+    with _cache_lock:
+        priorities = _cache.get(key)
+        if priorities is not None:
+            _cache.move_to_end(key)
+            return priorities
+
+    priorities = _compute_priorities(matrix, tolerance, max_iterations)
+    with _cache_lock:
+        _cache[key] = priorities
+        if len(_cache) > PRIORITIES_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return priorities
+
+
+def clear_priorities_cache():
+    """Vide le cache des priorités (ex: dans les tests)"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _compute_priorities(matrix, tolerance, max_iterations):
+    size = matrix.shape[0]
+
+    # Méthode des puissances avec arrêt anticipé dès que le vecteur est stable
+    weights = np.full(size, 1.0 / size)
+    iterations = 0
+    for iterations in range(1, max_iterations + 1):
+        next_weights = matrix @ weights
+        next_weights /= next_weights.sum()
+        converged = np.abs(next_weights - weights).max() < tolerance
+        weights = next_weights
+        if converged:
+            break
+
+    lambda_max = float(np.mean((matrix @ weights) / weights))
+    if size > 2:
+        consistency_index = (lambda_max - size) / (size - 1)
+        random_index = RANDOM_INDEX.get(size, RANDOM_INDEX[max(RANDOM_INDEX)])
+        consistency_ratio = consistency_index / random_index
+    else:
+        # Une matrice réciproque 1×1 ou 2×2 est toujours cohérente
+        consistency_index = 0.0
+        consistency_ratio = 0.0
+
+    weights.setflags(write=False)
+    return Priorities(weights, lambda_max, consistency_index, consistency_ratio, iterations)
@@ -0,0 +1,91 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+
+from jobs.models import Job
+from users.models import User, EmployerProfile
+from . import priorities
+from .priorities import clear_priorities_cache, compute_priorities, validate_comparison_matrix
+
+# Exemple classique de Saaty : poids ≈ (0.637, 0.258, 0.105), CR ≈ 0.033
+SAATY_MATRIX = [[1, 3, 5], [1 / 3, 1, 3], [1 / 5, 1 / 3, 1]]
+# Jugements circulaires (A ≫ B ≫ C ≫ A) : réciproque mais incohérente
+INCONSISTENT_MATRIX = [[1, 9, 1 / 9], [1 / 9, 1, 9], [9, 1 / 9, 1]]
+
+
+class PrioritiesTest(SimpleTestCase):
+    """
+    Vecteur propre principal, ratio de cohérence et cache des priorités AHP.
+    """
+
+    def setUp(self):
+        clear_priorities_cache()
+
+    def test_saaty_matrix(self):
+        result = compute_priorities(validate_comparison_matrix(SAATY_MATRIX))
+        for weight, expected in zip(result.weights, (0.6370, 0.2583, 0.1047)):
+            self.assertAlmostEqual(weight, expected, places=4)
+        self.assertAlmostEqual(result.weights.sum(), 1.0)
+        self.assertAlmostEqual(result.lambda_max, 3.0385, places=4)
+        self.assertAlmostEqual(result.consistency_ratio, 0.0332, places=4)
+
+    def test_consistent_matrix_has_zero_ratio(self):
+        # a[i][j] = w[i] / w[j] : matrice parfaitement cohérente
+        weights = [0.5, 0.3, 0.2]
+        result = compute_priorities([[wi / wj for wj in weights] for wi in weights])
+        for weight, expected in zip(result.weights, weights):
+            self.assertAlmostEqual(weight, expected)
+        self.assertAlmostEqual(result.consistency_ratio, 0.0)
+
+    def test_invalid_matrices(self):
+        for matrix in ([[1, 2], [2, 1]], [[1, 2, 3], [0.5, 1, 2]], [[1, -1], [-1, 1]], [['a', 1], [1, 1]]):
+            with self.assertRaises(ValueError):
+                validate_comparison_matrix(matrix)
+
+    def test_equal_matrix_hits_cache(self):
+        with mock.patch.object(priorities, '_compute_priorities', wraps=priorities._compute_priorities) as compute:
+            first = compute_priorities(SAATY_MATRIX)
+            # Matrice égale mais distincte (autre objet, autre type)
+            second = compute_priorities([list(row) for row in SAATY_MATRIX])
+            self.assertEqual(compute.call_count, 1)
+            compute_priorities(INCONSISTENT_MATRIX)
+            self.assertEqual(compute.call_count, 2)
+        self.assertIs(first, second)
+        self.assertFalse(first.weights.flags.writeable)
+
+
+class ComparisonMatrixValidationTest(TestCase):
+    """
+    La matrice de comparaison d'une offre est vérifiée à l'écriture (réciprocité, CR <= 0.1).
+    """
+
+    def setUp(self):
+        cache.clear()
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.client = APIClient()
+        self.client.force_authenticate(employer_user)
+
+    def create_job(self, matrix):
+        return self.client.post('/api/jobs/', {
+            'title': 'Développeur', 'description': 'Python', 'salary': 1000, 'location': 'Douala',
+            'deadline': '2030-01-01', 'comparison_matrix': matrix,
+        }, format='json')
+
+    def test_consistent_matrix_is_accepted(self):
+        response = self.create_job(SAATY_MATRIX)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(len(Job.objects.get(pk=response.data['id']).comparison_matrix), 3)
+
+    def test_inconsistent_matrix_is_rejected(self):
+        response = self.create_job(INCONSISTENT_MATRIX)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('CR', str(response.data['comparison_matrix']))
+        self.assertFalse(Job.objects.exists())
+
+    def test_non_reciprocal_matrix_is_rejected(self):
+        response = self.create_job([[1, 3, 5], [3, 1, 3], [1 / 5, 1 / 3, 1]])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('réciproque', str(response.data['comparison_matrix']))
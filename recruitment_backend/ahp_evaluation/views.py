@@ -1,6 +1,7 @@
 from rest_framework import viewsets, status
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from data_normalization.features import refresh_user_features
 from .models import CandidateForm
 from .serializers import CandidateFormSerializer
 
@@ -34,8 +35,13 @@ class CandidateFormViewSet(viewsets.ViewSet):
                 serializer.save()  # user est automatiquement attribué via le sérialiseur
                 created_items.append(serializer.data)
             else:
+                if created_items:
+                    # Les critères précédents sont déjà enregistrés
+                    refresh_user_features(request.user)
                 return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+        # Caractéristiques du candidat recalculées une seule fois, à l'écriture
+        refresh_user_features(request.user)
         return Response(created_items, status=status.HTTP_201_CREATED)
 
     def destroy(self, request, pk=None):
@@ -45,6 +51,7 @@ class CandidateFormViewSet(viewsets.ViewSet):
         try:
             candidate_form = CandidateForm.objects.get(pk=pk, user=request.user)
             candidate_form.delete()
+            refresh_user_features(request.user)
             return Response({"success": "Critère supprimé."}, status=status.HTTP_204_NO_CONTENT)
         except CandidateForm.DoesNotExist:
             return Response({"error": "Critère introuvable."}, status=status.HTTP_404_NOT_FOUND)
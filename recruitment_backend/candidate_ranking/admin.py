@@ -1,3 +1,5 @@
 from django.contrib import admin
+from .models import PostingDelta, PostingList
 
-# Register your models here.
+admin.site.register(PostingList)
+admin.site.register(PostingDelta)
@@ -0,0 +1,137 @@
+"""
+Index inversé compétence → candidats, maintenu de façon incrémentale.
+➡️ Chaque compétence a une liste compactée (PostingList : identifiants triés et
+empaquetés, lus en un bloc) et un journal de modifications (PostingDelta),
+alimenté à chaque recalcul des caractéristiques d'un candidat.
+➡️ La lecture applique le journal à la liste compactée. Au-delà de
+COMPACT_THRESHOLD modifications, le journal d'une compétence est fusionné dans
+sa liste (`compact_postings`, ou `python manage.py rebuild_candidate_index`).
+➡️ Un candidat supprimé peut rester dans les listes : les résultats de recherche
+ne retiennent que les profils existants.
+"""
+import numpy as np
+from django.db import transaction
+
+from data_normalization.models import CandidateFeatures
+from data_normalization.vocabulary import unpack_terms
+from .models import PostingDelta, PostingList
+
+CANDIDATES_DTYPE = '<u4'
+COMPACT_THRESHOLD = 1000
+SAVE_BATCH_SIZE = 1000
+EMPTY = np.empty(0, dtype=np.int64)
+
+
+def pack_candidates(candidate_ids):
+    return np.asarray(candidate_ids, dtype=CANDIDATES_DTYPE).tobytes()
+
+
+def unpack_candidates(data):
+    return np.frombuffer(data, dtype=CANDIDATES_DTYPE).astype(np.int64)
+
+
+def indexed_terms(features):
+    """
+    Compétences d'un candidat présentes dans l'index (bio et CV) : les mêmes que celles
+    lues par le scoring des candidatures (jobs.ahp), le formulaire générique n'en fait pas partie.
+    """
+    if features is None:
+        return set()
+    return set(unpack_terms(features.terms))
+
+
+def record_changes(changes):
+    """
+    Ajoute au journal les modifications de l'index.
+    changes : itérable de (id du profil, compétences avant, compétences après)
+    """
+    deltas = []
+    for candidate_id, before, after in changes:
+        deltas.extend(PostingDelta(skill_id=skill_id, candidate_id=candidate_id, added=True) for skill_id in sorted(after - before))
+        deltas.extend(PostingDelta(skill_id=skill_id, candidate_id=candidate_id, added=False) for skill_id in sorted(before - after))
+    PostingDelta.objects.bulk_create(deltas, batch_size=SAVE_BATCH_SIZE)
+
+
+def _apply(base, deltas):
+    """Liste compactée + journal (dans l'ordre) → liste à jour"""
+    if not deltas:
+        return base
+    state = {}
+    for candidate_id, added in deltas:
+        state[candidate_id] = added
+    added = np.array(sorted(candidate_id for candidate_id, present in state.items() if present), dtype=np.int64)
+    removed = np.array(sorted(candidate_id for candidate_id, present in state.items() if not present), dtype=np.int64)
+    return np.setdiff1d(np.union1d(base, added), removed, assume_unique=True)
+
+
+def _read(skill_ids):
+    bases = {
+        skill_id: unpack_candidates(data)
+        for skill_id, data in PostingList.objects.filter(skill_id__in=skill_ids).values_list('skill_id', 'candidates')
+    }
+    journal = {}
+    for delta_id, skill_id, candidate_id, added in (
+        PostingDelta.objects.filter(skill_id__in=skill_ids).order_by('id').values_list('id', 'skill_id', 'candidate_id', 'added')
+    ):
+        journal.setdefault(skill_id, []).append((delta_id, candidate_id, added))
+    return bases, journal
+
+
+def load_postings(skill_ids):
+    """
+    Listes à jour des compétences : {id de la compétence: tableau trié des ids de profils}.
+    Retourne aussi les compétences dont le journal mérite d'être compacté.
+    """
+    skill_ids = set(skill_ids)
+    bases, journal = _read(skill_ids)
+    postings = {
+        skill_id: _apply(bases.get(skill_id, EMPTY), [(c, a) for _, c, a in journal.get(skill_id, [])])
+        for skill_id in skill_ids
+    }
+    to_compact = [skill_id for skill_id, deltas in journal.items() if len(deltas) >= COMPACT_THRESHOLD]
+    return postings, to_compact
+
+
+def compact_postings(skill_ids=None):
+    """
+    Fusionne le journal des compétences dans leurs listes compactées.
+    Seules les modifications lues sont supprimées : celles écrites entre-temps restent au journal.
+    Retourne le nombre de modifications fusionnées.
+    """
+    if skill_ids is None:
+        skill_ids = PostingDelta.objects.values_list('skill_id', flat=True).distinct()
+    merged = 0
+    with transaction.atomic():
+        bases, journal = _read(set(skill_ids))
+        for skill_id, deltas in journal.items():
+            candidates = _apply(bases.get(skill_id, EMPTY), [(c, a) for _, c, a in deltas])
+            PostingList.objects.update_or_create(
+                skill_id=skill_id, defaults={'candidates': pack_candidates(candidates), 'size': len(candidates)}
+            )
+            delta_ids = [delta_id for delta_id, _, _ in deltas]
+            for start in range(0, len(delta_ids), SAVE_BATCH_SIZE):
+                PostingDelta.objects.filter(id__in=delta_ids[start:start + SAVE_BATCH_SIZE]).delete()
+            merged += len(deltas)
+    return merged
+
+
+def rebuild_index():
+    """
+    Reconstruit entièrement l'index depuis les caractéristiques des candidats (CandidateFeatures).
+    Retourne le nombre de compétences indexées.
+    """
+    postings = {}
+    features = CandidateFeatures.objects.only('candidate_id', 'terms').order_by('candidate_id')
+    for feature in features.iterator(SAVE_BATCH_SIZE):
+        for skill_id in indexed_terms(feature):
+            postings.setdefault(skill_id, []).append(feature.candidate_id)
+
+    with transaction.atomic():
+        PostingDelta.objects.all().delete()
+        PostingList.objects.all().delete()
+        PostingList.objects.bulk_create(
+            (PostingList(skill_id=skill_id, candidates=pack_candidates(candidates), size=len(candidates))
+             for skill_id, candidates in postings.items()),
+            batch_size=SAVE_BATCH_SIZE,
+        )
+    return len(postings)
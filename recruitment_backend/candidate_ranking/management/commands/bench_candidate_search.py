@@ -0,0 +1,79 @@
+import statistics
+import time
+from datetime import date
+
+import numpy as np
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from candidate_ranking.index import pack_candidates
+from candidate_ranking.models import PostingList
+from candidate_ranking.search import search_candidates
+from data_normalization.models import Skill, SkillAlias
+from jobs.models import Constraint, Job, SkillRequirement
+from users.models import EmployerProfile, User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Mesure la durée de la recherche des meilleurs candidats d'une offre dans l'index inversé. Aucune donnée n'est conservée."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--candidates', type=int, default=1_000_000)
+        parser.add_argument('--skills', type=int, default=300)
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = np.random.default_rng(options['seed'])
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                sizes = self._create_index(options['candidates'], options['skills'], rng)
+                self.stdout.write(f"Index : {options['candidates']} candidats, {options['skills']} compétences, "
+                                  f"{sum(sizes)} entrées en {time.perf_counter() - start:.1f} s")
+                for label, hard in (("2 contraintes hard", ['skill0', 'skill3']), ("sans contrainte hard", [])):
+                    job = self._create_job(hard, ['skill1', 'skill2', 'skill4', 'skill8', 'skill20'])
+                    search_candidates(job, options['limit'])  # compilation du plan
+                    timings = []
+                    for _ in range(options['repeat']):
+                        start = time.perf_counter()
+                        results = search_candidates(job, options['limit'])
+                        timings.append((time.perf_counter() - start) * 1000)
+                    timings.sort()
+                    self.stdout.write(
+                        f"{label} : médiane {statistics.median(timings):.1f} ms, "
+                        f"p95 {timings[int(len(timings) * 0.95) - 1]:.1f} ms, meilleur score {results[0][1] if results else '-'}"
+                    )
+                raise Rollback()
+        except Rollback:
+            pass
+
+    def _create_index(self, count, skills, rng):
+        """Listes synthétiques : la compétence de rang i est possédée par ~ 50 % / (i + 1)^0.8 des candidats"""
+        created = Skill.objects.bulk_create(Skill(name=f'skill{i}') for i in range(skills))
+        SkillAlias.objects.bulk_create(SkillAlias(key=skill.name, skill=skill) for skill in created)
+        sizes = []
+        postings = []
+        for rank, skill in enumerate(created):
+            share = 0.5 / (rank + 1) ** 0.8
+            candidates = np.flatnonzero(rng.random(count) < share) + 1
+            sizes.append(len(candidates))
+            postings.append(PostingList(skill=skill, candidates=pack_candidates(candidates), size=len(candidates)))
+        PostingList.objects.bulk_create(postings, batch_size=50)
+        return sizes
+
+    def _create_job(self, hard, others):
+        user = User.objects.create(username=f'bench-search-{Job.objects.count()}', email=f'bench-search-{Job.objects.count()}@example.com', role='employer')
+        employer = EmployerProfile.objects.create(user=user, company_name='Benchmark', sector='Benchmark')
+        job = Job.objects.create(employer=employer, title='Benchmark', description='', salary=0, location='', deadline=date.today())
+        for name in hard:
+            Constraint.objects.create(job=job, type='hard', value=name, weight=2)
+        Constraint.objects.create(job=job, type='soft', value=others[0], weight=1)
+        for name in others[1:]:
+            SkillRequirement.objects.create(job=job, name=name, value='Expert', weight=1)
+        return job
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from candidate_ranking.index import compact_postings, rebuild_index
+
+
+class Command(BaseCommand):
+    help = "Reconstruit l'index inversé des candidats depuis leurs caractéristiques, ou compacte son journal"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--compact', action='store_true', help="Fusionner le journal dans les listes sans tout reconstruire")
+
+    def handle(self, *args, **options):
+        if options['compact']:
+            self.stdout.write(f"{compact_postings()} modification(s) fusionnée(s)")
+        else:
+            self.stdout.write(f"{rebuild_index()} compétence(s) indexée(s)")
@@ -1,3 +1,33 @@
 from django.db import models
+from data_normalization.models import Skill
 
-# Create your models here.
+"""
+Index inversé : compétence normalisée → candidats qui la possèdent.
+PostingList → Liste compactée : identifiants triés des profils candidats, empaquetés (entiers 32 bits)
+PostingDelta → Modification pas encore compactée : ajout (added) ou retrait d'un candidat
+"""
+
+
+class PostingList(models.Model):
+    skill = models.OneToOneField(Skill, on_delete=models.CASCADE, primary_key=True, related_name='postings')
+    candidates = models.BinaryField(default=bytes)
+    size = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.skill_id} : {self.size} candidat(s)"
+
+
+class PostingDelta(models.Model):
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='posting_deltas', db_index=False)
+    candidate_id = models.PositiveIntegerField()  # Profil candidat (CandidateProfile)
+    added = models.BooleanField()
+
+    class Meta:
+        indexes = [
+            # Lecture du journal d'une compétence dans l'ordre des modifications
+            models.Index(fields=['skill', 'id'], name='posting_delta_skill_idx'),
+        ]
+
+    def __str__(self):
+        return f"{'+' if self.added else '-'}{self.candidate_id} ({self.skill_id})"
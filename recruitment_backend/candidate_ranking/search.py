@@ -0,0 +1,153 @@
+"""
+Recherche des candidats correspondant à une offre, sans attendre leurs candidatures.
+➡️ 1. Les listes de l'index des contraintes hard sont intersectées, de la plus
+courte à la plus longue : seuls les candidats qui les satisfont toutes restent.
+Sans contrainte hard, les candidats possédant au moins un critère de l'offre sont retenus.
+➡️ 2. Le score (même barème que le scoring des candidatures) n'est calculé que pour
+ces candidats, critère par critère à partir des listes de l'index : aucun profil
+n'est lu.
+➡️ 3. Les `limit` meilleurs sont extraits avec un tas, après un premier filtre
+vectorisé sur le score du `limit`-ième.
+➡️ Les candidats dont les caractéristiques précèdent une compétence de l'offre
+sont d'abord réindexés (`ensure_index_fresh`). Les profils créés hors de l'API
+(sans caractéristiques) sont indexés par `python manage.py rebuild_candidate_features`.
+"""
+import heapq
+import threading
+
+import numpy as np
+
+from data_normalization.features import refresh_features
+from jobs.ahp import get_scoring_plan
+from recruitment_backend.async_utils import submit
+from users.models import CandidateProfile
+from .index import compact_postings, load_postings
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 200
+# Caractéristiques périmées recalculées pendant la requête ; au-delà, en arrière-plan
+SYNC_REFRESH_LIMIT = 1000
+REFRESH_BATCH_SIZE = 500
+
+# Tâches de fond en cours (versions du vocabulaire à rattraper, compactage)
+_background = set()
+_background_lock = threading.Lock()
+
+
+def _submit_once(key, func, *args):
+    """Lance une tâche de fond, sauf si la même est déjà en cours"""
+    with _background_lock:
+        if key in _background:
+            return
+        _background.add(key)
+
+    def run():
+        try:
+            func(*args)
+        finally:
+            with _background_lock:
+                _background.discard(key)
+
+    submit(run)
+
+
+def _stale_candidates(required_version):
+    return CandidateProfile.objects.filter(features__vocabulary_version__lt=required_version)
+
+
+def refresh_stale_candidates(required_version):
+    """Recalcule (par lots) les caractéristiques calculées avant `required_version`"""
+    while True:
+        batch = list(_stale_candidates(required_version).only('id', 'user_id', 'bio', 'cv')[:REFRESH_BATCH_SIZE])
+        if not batch:
+            return
+        refresh_features(batch)
+
+
+def ensure_index_fresh(required_version):
+    """
+    Met à jour l'index pour les compétences d'une offre.
+    Retourne False si des candidats restent à réindexer (recalcul lancé en arrière-plan).
+    """
+    stale = list(_stale_candidates(required_version).only('id', 'user_id', 'bio', 'cv')[:SYNC_REFRESH_LIMIT + 1])
+    if len(stale) <= SYNC_REFRESH_LIMIT:
+        refresh_features(stale)
+        return True
+
+    _submit_once(('refresh', required_version), refresh_stale_candidates, required_version)
+    return False
+
+
+def _top(scores, candidate_ids, limit):
+    """Les `limit` meilleurs (score décroissant, puis id croissant) : [(id du profil, score)]"""
+    if len(scores) > limit:
+        threshold = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        keep = scores >= threshold
+        scores, candidate_ids = scores[keep], candidate_ids[keep]
+    best = heapq.nlargest(limit, zip(scores.tolist(), (-candidate_ids).tolist()))
+    return [(-negative_id, score) for score, negative_id in best]
+
+
+def _contains(sorted_ids, values):
+    """Masque : présence de chaque valeur (triée, sans doublon) dans un tableau trié"""
+    if not len(sorted_ids):
+        return np.zeros(len(values), dtype=bool)
+    if len(values) * 16 < len(sorted_ids):
+        # Peu de valeurs : recherche dichotomique plutôt qu'un parcours de toute la liste
+        positions = np.minimum(np.searchsorted(sorted_ids, values), len(sorted_ids) - 1)
+        return sorted_ids[positions] == values
+    return np.isin(values, sorted_ids, assume_unique=True)
+
+
+def search_candidates(job, limit=DEFAULT_LIMIT):
+    """
+    Meilleurs candidats pour une offre : [(id du profil, score)], au plus `limit`.
+    """
+    plan = get_scoring_plan(job)
+    terms = [term for term in plan.terms if term is not None]
+    if not terms:
+        return []
+    postings, to_compact = load_postings(terms)
+    if to_compact:
+        _submit_once('compact', compact_postings, to_compact)
+
+    # Barème : chaque critère vaut `miss` s'il est absent, `hit` s'il est présent
+    hard = set(idx for idx in plan.hard if plan.terms[idx] is not None)
+    base = 0
+    increments = []
+    for idx, term in enumerate(plan.terms):
+        hit, miss, weight = plan.hit_values[idx], plan.miss_values[idx], plan.weights[idx]
+        if term is None or idx in hard:
+            base += hit * weight
+        else:
+            base += miss * weight
+            increments.append((postings[term], (hit - miss) * weight))
+
+    if hard:
+        # 1. Intersection des contraintes hard, de la liste la plus courte à la plus longue
+        lists = sorted((postings[plan.terms[idx]] for idx in hard), key=len)
+        survivors = lists[0]
+        for candidates in lists[1:]:
+            if not len(survivors):
+                return []
+            survivors = survivors[_contains(candidates, survivors)]
+        # 2. Score des candidats restants, critère par critère (recherche dans les listes triées)
+        scores = np.full(len(survivors), float(base))
+        for candidates, increment in increments:
+            scores += _contains(candidates, survivors) * increment
+    else:
+        # Sans filtre : scores accumulés dans un tableau indexé par id de profil
+        size = max((int(candidates[-1]) + 1 for candidates, _ in increments if len(candidates)), default=0)
+        matched = np.zeros(size, dtype=bool)
+        dense = np.full(size, float(base))
+        for candidates, increment in increments:
+            dense[candidates] += increment
+            matched[candidates] = True
+        survivors = np.flatnonzero(matched)
+        scores = dense[survivors]
+    if not len(survivors):
+        return []
+
+    scores = np.round(scores / plan.weight_sum * 100, 2) if plan.weight_sum else np.zeros(len(survivors))
+    # 3. Les meilleurs, avec un tas
+    return _top(scores, survivors, limit)
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+
+class MatchingCandidateSerializer(serializers.Serializer):
+    candidate_id = serializers.IntegerField(source='candidate.pk')
+    username = serializers.CharField(source='candidate.user.username')
+    name = serializers.CharField(source='candidate.user.name')
+    score = serializers.FloatField()
+    experience_years = serializers.IntegerField(source='candidate.features.experience_years', allow_null=True)
+    has_applied = serializers.BooleanField()
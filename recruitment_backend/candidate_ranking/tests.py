@@ -1,3 +1,127 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from ahp_evaluation.models import CandidateForm
+from data_normalization.features import refresh_features
+from data_normalization.vocabulary import get_vocabulary, load_aliases
+from jobs.ahp import calculate_candidate_score
+from jobs.models import CandidateApplication, Constraint, Job, SkillRequirement
+from users.models import CandidateProfile, EmployerProfile, User
+from .index import compact_postings, load_postings, rebuild_index
+from .models import PostingDelta, PostingList
+from .search import search_candidates
+
+
+class CandidateSearchTestMixin:
+
+    def setUp(self):
+        load_aliases({'python': ['python3', 'py'], 'django': [], 'sql': ['postgresql'], 'anglais': ['english']})
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=self.employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        Constraint.objects.create(job=self.job, type='hard', value='Python', weight=2)
+        Constraint.objects.create(job=self.job, type='soft', value='Anglais', weight=1)
+        SkillRequirement.objects.create(job=self.job, name='Django', value='Expert', weight=1)
+        SkillRequirement.objects.create(job=self.job, name='SQL', value='Expert', weight=1)
+        self.client = APIClient()
+
+    def add_candidate(self, bio):
+        index = CandidateProfile.objects.count()
+        user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+        candidate = CandidateProfile.objects.create(user=user, bio=bio)
+        refresh_features([candidate])
+        return candidate
+
+    def skill(self, name):
+        return get_vocabulary().lookup(name)
+
+
+class CandidateIndexTest(CandidateSearchTestMixin, TestCase):
+    """
+    L'index inversé est tenu à jour à chaque recalcul des caractéristiques, puis compacté.
+    """
+
+    def postings(self, *names):
+        postings, _ = load_postings([self.skill(name) for name in names])
+        return [postings[self.skill(name)].tolist() for name in names]
+
+    def test_incremental_updates_and_compaction(self):
+        first = self.add_candidate('Python3 et Django')
+        second = self.add_candidate('py, postgresql')
+        self.assertEqual(self.postings('python', 'django', 'sql'), [[first.pk, second.pk], [first.pk], [second.pk]])
+
+        first.bio = 'Python et SQL'
+        refresh_features([first])
+        self.assertEqual(self.postings('python', 'django', 'sql'), [[first.pk, second.pk], [], [first.pk, second.pk]])
+
+        # Le compactage fusionne le journal sans changer le contenu de l'index
+        pending = PostingDelta.objects.count()
+        self.assertEqual(compact_postings(), pending)
+        self.assertFalse(PostingDelta.objects.exists())
+        self.assertEqual(self.postings('python', 'django', 'sql'), [[first.pk, second.pk], [], [first.pk, second.pk]])
+        self.assertEqual(PostingList.objects.get(skill_id=self.skill('sql')).size, 2)
+
+        # Modifications postérieures au compactage : lues depuis le journal
+        second.bio = 'Django'
+        refresh_features([second])
+        self.assertEqual(self.postings('python', 'django', 'sql'), [[first.pk], [second.pk], [first.pk]])
+        rebuild_index()
+        self.assertEqual(self.postings('python', 'django', 'sql'), [[first.pk], [second.pk], [first.pk]])
+
+
+class MatchingCandidatesTest(CandidateSearchTestMixin, TestCase):
+    """
+    Recherche des meilleurs candidats d'une offre : contraintes hard, puis score, puis top-K.
+    """
+
+    def test_search_scores_like_application_scoring(self):
+        candidates = [
+            self.add_candidate(bio) for bio in (
+                'Python Django SQL anglais', 'python3', 'Django SQL anglais', 'py, english, postgresql', 'Java',
+            )
+        ]
+        results = search_candidates(self.job, limit=10)
+        # Le candidat sans Python (contrainte hard) est écarté
+        self.assertEqual([candidate_id for candidate_id, _ in results], [candidates[0].pk, candidates[3].pk, candidates[1].pk])
+        for candidate_id, score in results:
+            self.assertEqual(score, calculate_candidate_score(CandidateProfile.objects.get(pk=candidate_id), self.job))
+        self.assertEqual(search_candidates(self.job, limit=1), results[:1])
+
+        # Compétences du formulaire générique : ignorées par le scoring des candidatures, donc par la recherche
+        form_only = self.add_candidate('Java')
+        partly_form = self.add_candidate('Python')
+        for candidate in (form_only, partly_form):
+            for name in ('Python', 'Django', 'SQL'):
+                CandidateForm.objects.create(user=candidate.user, name=name, value='Expert')
+        refresh_features([form_only, partly_form])
+        results = dict(search_candidates(self.job, limit=10))
+        # Python (contrainte hard) seulement dans le formulaire : écarté
+        self.assertNotIn(form_only.pk, results)
+        self.assertEqual(results[partly_form.pk], calculate_candidate_score(partly_form, self.job))
+        self.assertEqual(results[partly_form.pk], results[candidates[1].pk])
+
+    def test_endpoint(self):
+        best = self.add_candidate('Python Django')
+        other = self.add_candidate('Python')
+        CandidateApplication.objects.create(candidate=other, job=self.job, ahp_score=0)
+
+        self.client.force_authenticate(self.employer.user)
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matching-candidates/', {'limit': 5})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertTrue(response.data['complete'])
+        self.assertEqual([result['candidate_id'] for result in response.data['results']], [best.pk, other.pk])
+        self.assertEqual([result['has_applied'] for result in response.data['results']], [False, True])
+
+        # Nouvelle compétence dans l'offre : les candidats indexés avant son apparition sont réindexés
+        best.bio = 'Python Django Kotlin'
+        best.save()
+        Constraint.objects.create(job=self.job, type='hard', value='Kotlin', weight=1)
+        self.job.save()
+        kotlin = self.add_candidate('Python Kotlin')
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matching-candidates/')
+        self.assertEqual([result['candidate_id'] for result in response.data['results']], [best.pk, kotlin.pk])
+
+        other_employer = User.objects.create_user(username='other', email='other@example.com', password='pass', role='employer')
+        self.client.force_authenticate(other_employer)
+        response = self.client.get(f'/api/jobs/{self.job.pk}/matching-candidates/')
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import MatchingCandidatesView
+
+urlpatterns = [
+    path('jobs/<int:job_id>/matching-candidates/', MatchingCandidatesView.as_view(), name='matching-candidates'),
+]
@@ -1,3 +1,44 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from jobs.ahp import get_scoring_plan
+from jobs.models import CandidateApplication, Job
+from users.models import CandidateProfile
+from users.permissions import IsEmployer
+from .search import DEFAULT_LIMIT, MAX_LIMIT, ensure_index_fresh, search_candidates
+from .serializers import MatchingCandidateSerializer
+
+
+class MatchingCandidatesView(APIView):
+    """
+    Meilleurs candidats pour une offre de l'employeur connecté, qu'ils aient postulé ou non.
+    GET /api/jobs/<job_id>/matching-candidates/?limit=20
+    complete → False si des candidats sont encore en cours de réindexation (résultats partiels)
+    """
+    permission_classes = [IsEmployer]
+
+    def get(self, request, job_id):
+        job = get_object_or_404(Job, id=job_id, employer__user=request.user)
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_LIMIT))
+        except ValueError:
+            return Response({'detail': "limit doit être un entier."}, status=status.HTTP_400_BAD_REQUEST)
+        limit = max(1, min(limit, MAX_LIMIT))
+
+        complete = ensure_index_fresh(get_scoring_plan(job).required_version)
+        matches = search_candidates(job, limit)
+
+        # Seuls les profils retenus sont lus (un profil supprimé peut rester dans l'index)
+        ids = [candidate_id for candidate_id, _ in matches]
+        profiles = CandidateProfile.objects.select_related('user', 'features').in_bulk(ids)
+        applied = set(CandidateApplication.objects.filter(job=job, candidate_id__in=ids).values_list('candidate_id', flat=True))
+        results = [
+            {'candidate': profiles[candidate_id], 'score': score, 'has_applied': candidate_id in applied}
+            for candidate_id, score in matches if candidate_id in profiles
+        ]
+        return Response({
+            'complete': complete,
+            'results': MatchingCandidateSerializer(results, many=True).data,
+        })
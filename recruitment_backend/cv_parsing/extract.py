@@ -0,0 +1,153 @@
+"""
+Extraction du texte et des sections d'un CV (PDF, DOCX, TXT).
+➡️ Ce module n'utilise pas Django : il est chargé par les processus du pool
+d'analyse (pipeline.py) sans initialiser le projet.
+➡️ DOCX : lecture directe de word/document.xml dans l'archive (zipfile).
+PDF : nécessite le paquet pypdf (requirements.txt). S'il manque, l'échec est
+signalé comme temporaire (`retry`) : le CV sera analysé une fois pypdf installé.
+➡️ Sections : une ligne courte dont le texte correspond à un titre connu
+(ex: "Compétences", "EXPÉRIENCE PROFESSIONNELLE :") ouvre une section qui se
+termine au titre suivant.
+"""
+import os
+import re
+import unicodedata
+import zipfile
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:  # dépendance optionnelle : les PDF ne peuvent pas être analysés
+    pypdf = None
+
+
+class ExtractionError(Exception):
+    pass
+
+
+class MissingDependencyError(ExtractionError):
+    """Format reconnu mais analyseur non installé : l'échec n'est pas définitif"""
+
+
+_WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+SECTION_TITLES = {
+    'experience': ('experience', 'experiences', 'experience professionnelle', 'experiences professionnelles',
+                   'parcours professionnel', 'work experience', 'professional experience', 'employment history'),
+    'skills': ('competences', 'competences techniques', 'savoir-faire', 'skills', 'technical skills'),
+    'languages': ('langues', 'langues parlees', 'languages'),
+    'education': ('formation', 'formations', 'diplomes', 'parcours academique', 'education'),
+}
+_TITLES = {title: section for section, titles in SECTION_TITLES.items() for title in titles}
+_HEADING_MAX_LENGTH = 40
+
+
+def _normalize(line):
+    """Minuscules, sans accents ni ponctuation finale (pour comparer aux titres connus)"""
+    line = unicodedata.normalize('NFKD', line.strip().lower())
+    line = ''.join(char for char in line if not unicodedata.combining(char))
+    return re.sub(r'[\s:\-–•.]+$', '', re.sub(r'\s+', ' ', line))
+
+
+def _docx_text(path):
+    paragraphs = []
+    try:
+        with zipfile.ZipFile(path) as archive, archive.open('word/document.xml') as document:
+            parts = []
+            for _, element in ElementTree.iterparse(document):
+                tag = element.tag
+                if tag == _WORD_NAMESPACE + 't':
+                    parts.append(element.text or '')
+                elif tag == _WORD_NAMESPACE + 'tab':
+                    parts.append('\t')
+                elif tag in (_WORD_NAMESPACE + 'br', _WORD_NAMESPACE + 'cr'):
+                    parts.append('\n')
+                elif tag == _WORD_NAMESPACE + 'p':
+                    paragraphs.append(''.join(parts))
+                    parts = []
+                    element.clear()
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ExtractionError(f"Fichier DOCX illisible : {exc}")
+    return '\n'.join(paragraphs)
+
+
+def _pdf_text(path):
+    if pypdf is None:
+        raise MissingDependencyError("Analyse des PDF indisponible : paquet pypdf non installé.")
+    try:
+        reader = pypdf.PdfReader(path)
+        return '\n'.join(page.extract_text() or '' for page in reader.pages)
+    except Exception as exc:
+        raise ExtractionError(f"Fichier PDF illisible : {exc}")
+
+
+def _txt_text(path):
+    with open(path, 'rb') as text_file:
+        raw = text_file.read()
+    try:
+        return raw.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        return raw.decode('latin-1')
+
+
+EXTRACTORS = {
+    '.docx': _docx_text,
+    '.pdf': _pdf_text,
+    '.txt': _txt_text,
+}
+
+
+def _sniff(path):
+    """Format d'après le contenu (les CV stockés par empreinte n'ont pas d'extension)"""
+    with open(path, 'rb') as cv_file:
+        header = cv_file.read(8)
+    if header.startswith(b'%PDF'):
+        return '.pdf'
+    if header.startswith(b'PK\x03\x04'):
+        return '.docx'
+    return '.txt'
+
+
+def extract_text(path, extension=None):
+    extension = (extension or os.path.splitext(path)[1]).lower() or _sniff(path)
+    extractor = EXTRACTORS.get(extension)
+    if extractor is None:
+        raise ExtractionError(f"Format de CV non supporté : {extension or '(aucune extension)'}.")
+    return extractor(path)
+
+
+def detect_sections(text):
+    """Découpe le texte en sections {experience, skills, languages, education: texte}"""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        if len(line.strip()) <= _HEADING_MAX_LENGTH:
+            section = _TITLES.get(_normalize(line))
+            if section is not None:
+                current = section
+                sections.setdefault(section, [])
+                continue
+        if current is not None and line.strip():
+            sections[current].append(line.strip())
+    return {section: '\n'.join(lines) for section, lines in sections.items()}
+
+
+def parse_file(path, extension=None):
+    """
+    Analyse un CV. Ne lève pas d'exception : le résultat contient l'erreur éventuelle.
+    Retourne {'text', 'sections', 'error', 'retry'} (retry : échec temporaire, à ne pas mettre en cache).
+    """
+    try:
+        text = extract_text(path, extension)
+    except MissingDependencyError as exc:
+        return {'text': '', 'sections': {}, 'error': str(exc), 'retry': True}
+    except (ExtractionError, OSError) as exc:
+        return {'text': '', 'sections': {}, 'error': str(exc), 'retry': False}
+    text = text.replace('\x00', '')
+    return {'text': text, 'sections': detect_sections(text), 'error': '', 'retry': False}
+
+
+def parse_item(item):
+    """Tâche d'un processus du pool d'analyse : (empreinte, chemin) → (empreinte, résultat)"""
+    key, path = item
+    return key, parse_file(path)
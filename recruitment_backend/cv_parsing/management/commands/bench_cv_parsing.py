@@ -0,0 +1,66 @@
+import os
+import random
+import tempfile
+import time
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cv_parsing.pipeline import parse_in_pool
+
+WORDS = ('python', 'django', 'java', 'sql', 'docker', 'gestion', 'projet', 'analyse', 'équipe', 'client', 'données')
+DOCX_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"><w:body>{}</w:body></w:document>'
+)
+
+
+class Command(BaseCommand):
+    help = "Mesure le débit d'analyse des CV (CV/s et CV/s par cœur) sur un corpus local. Rien n'est enregistré."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--corpus', help="Dossier de CV (pdf, docx, txt) ; par défaut un corpus synthétique est généré")
+        parser.add_argument('--generate', type=int, default=2000, help="Nombre de CV du corpus synthétique")
+        parser.add_argument('--workers', default='1,2,4', help="Nombres de processus (séparés par des virgules)")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        if options['corpus']:
+            if not os.path.isdir(options['corpus']):
+                raise CommandError(f"Dossier introuvable : {options['corpus']}")
+            self._bench(options['corpus'], options['workers'])
+            return
+        with tempfile.TemporaryDirectory() as corpus:
+            self._generate(corpus, options['generate'], random.Random(options['seed']))
+            self._bench(corpus, options['workers'])
+
+    def _bench(self, corpus, workers_option):
+        paths = [
+            os.path.join(root, name)
+            for root, _, names in os.walk(corpus) for name in names
+            if os.path.splitext(name)[1].lower() in ('.pdf', '.docx', '.txt')
+        ]
+        self.stdout.write(f"Corpus : {len(paths)} CV ({corpus})")
+        for workers in (int(value) for value in workers_option.split(',')):
+            start = time.perf_counter()
+            failed = sum(bool(result['error']) for _, result in parse_in_pool(((path, path) for path in paths), workers))
+            elapsed = time.perf_counter() - start
+            rate = len(paths) / elapsed
+            self.stdout.write(
+                f"{workers:>3} processus : {elapsed:.2f} s, {rate:.0f} CV/s, {rate / workers:.0f} CV/s par cœur, "
+                f"{failed} échec(s)"
+            )
+
+    def _generate(self, corpus, count, rng):
+        for index in range(count):
+            lines = [f"Candidat {index}", "Expérience professionnelle"]
+            lines += [' '.join(rng.choices(WORDS, k=12)) for _ in range(rng.randint(5, 30))]
+            lines += ["Compétences", ', '.join(rng.sample(WORDS, 5)), "Langues", "Français, Anglais"]
+            if index % 2:
+                paragraphs = ''.join(f'<w:p><w:r><w:t>{escape(line)}</w:t></w:r></w:p>' for line in lines)
+                with zipfile.ZipFile(os.path.join(corpus, f'cv-{index}.docx'), 'w') as archive:
+                    archive.writestr('word/document.xml', DOCX_TEMPLATE.format(paragraphs))
+            else:
+                with open(os.path.join(corpus, f'cv-{index}.txt'), 'w', encoding='utf-8') as cv_file:
+                    cv_file.write('\n'.join(lines))
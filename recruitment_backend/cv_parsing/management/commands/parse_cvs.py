@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from cv_parsing.pipeline import run_pipeline
+
+
+class Command(BaseCommand):
+    help = "Analyse en parallèle les CV pas encore analysés (CV stockés et CV des profils candidats)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=None, help="Nombre de processus (par défaut : nombre de cœurs)")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        parsed, failed = run_pipeline(workers=options['workers'])
+        elapsed = time.perf_counter() - start
+        self.stdout.write(f"{parsed} CV analysé(s) en {elapsed:.2f} s, {failed} échec(s)")
@@ -1,3 +1,22 @@
 from django.db import models
 
-# Create your models here.
+
+"""
+Résultat de l'analyse d'un CV, identifié par l'empreinte SHA-256 de son contenu.
+➡️ Un même fichier (ré-envoi, autre candidat, nouveau scoring) n'est jamais analysé deux fois.
+    text → Texte brut extrait
+    sections → {experience, skills, languages, education: texte de la section}
+    parser_version → Version de l'analyseur ; les CV analysés par une version antérieure sont ré-analysés
+    error → Message d'erreur si l'extraction a échoué (format non supporté, fichier illisible...)
+"""
+
+class ParsedCV(models.Model):
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    text = models.TextField(blank=True)
+    sections = models.JSONField(default=dict)
+    parser_version = models.IntegerField()
+    error = models.TextField(blank=True)
+    parsed_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"CV analysé {self.sha256[:12]}"
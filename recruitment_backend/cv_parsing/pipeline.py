@@ -0,0 +1,149 @@
+"""
+Pipeline d'analyse des CV en parallèle, avec cache des résultats par empreinte.
+➡️ Les CV à analyser sont produits au fil de l'eau (file de travail bornée :
+au plus QUEUE_DEPTH tâches en attente par processus) et analysés dans un pool
+de processus. Les résultats sont enregistrés par lots dans ParsedCV.
+➡️ Un CV dont l'empreinte est déjà dans ParsedCV (version courante de
+l'analyseur) n'est jamais ré-analysé. Les échecs temporaires (analyseur non
+installé) ne sont pas enregistrés : le CV reste en attente.
+"""
+import hashlib
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from cv_upload.models import CVBlob
+from cv_upload.storage import READ_BLOCK_SIZE
+from data_normalization.features import refresh_features
+from users.models import CandidateProfile
+from .extract import parse_file, parse_item
+from .models import ParsedCV
+
+logger = logging.getLogger(__name__)
+
+# À incrémenter quand l'extraction change : les CV déjà analysés seront ré-analysés
+PARSER_VERSION = 2
+QUEUE_DEPTH = 4
+SAVE_BATCH_SIZE = 100
+
+
+def parse_in_pool(items, workers=None):
+    """
+    Analyse les CV (itérable de couples (empreinte, chemin)) dans un pool de processus.
+    Produit les couples (empreinte, résultat) dans l'ordre de fin d'analyse.
+    """
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        in_flight = set()
+        for item in items:
+            if len(in_flight) >= workers * QUEUE_DEPTH:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+            # parse_item est dans extract.py : les processus du pool n'importent pas Django
+            in_flight.add(executor.submit(parse_item, item))
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def save_results(results):
+    """Enregistre (ou remplace) des résultats d'analyse en une requête, sauf les échecs temporaires"""
+    ParsedCV.objects.bulk_create(
+        [
+            ParsedCV(sha256=key, parser_version=PARSER_VERSION, text=result['text'], sections=result['sections'],
+                     error=result['error'])
+            for key, result in results if not result['retry']
+        ],
+        update_conflicts=True,
+        unique_fields=['sha256'],
+        update_fields=['text', 'sections', 'parser_version', 'error', 'parsed_at'],
+    )
+
+
+def refresh_cv_features(keys):
+    """Recalcule les caractéristiques des candidats dont le CV vient d'être analysé"""
+    files = CVBlob.objects.filter(sha256__in=keys).values('file')
+    refresh_features(CandidateProfile.objects.filter(cv__in=files))
+
+
+def file_sha256(path):
+    hasher = hashlib.sha256()
+    with open(path, 'rb') as cv_file:
+        while block := cv_file.read(READ_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher.hexdigest()
+
+
+def profile_cv_sha256(profile):
+    """Empreinte du CV d'un profil candidat (None si pas de CV)"""
+    if not profile.cv:
+        return None
+    blob = CVBlob.objects.filter(file=profile.cv.name).only('sha256').first()
+    if blob is not None:
+        return blob.sha256
+    # CV envoyé avant le stockage par contenu
+    try:
+        return file_sha256(profile.cv.path)
+    except OSError:
+        return None
+
+
+def pending_items():
+    """CV stockés (CVBlob) et CV des profils candidats pas encore analysés par la version courante"""
+    parsed = ParsedCV.objects.filter(parser_version=PARSER_VERSION).values('sha256')
+    seen = set()
+    for blob in CVBlob.objects.exclude(sha256__in=parsed).iterator():
+        seen.add(blob.sha256)
+        yield blob.sha256, blob.file.path
+
+    # CV envoyés avant le stockage par contenu : l'empreinte est calculée à la lecture
+    blob_files = CVBlob.objects.values('file')
+    profiles = CandidateProfile.objects.exclude(cv='').exclude(cv__isnull=True).exclude(cv__in=blob_files)
+    for profile in profiles.only('id', 'cv').iterator():
+        key = profile_cv_sha256(profile)
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+        if not ParsedCV.objects.filter(sha256=key, parser_version=PARSER_VERSION).exists():
+            yield key, profile.cv.path
+
+
+def run_pipeline(items=None, workers=None, batch_size=SAVE_BATCH_SIZE):
+    """
+    Analyse les CV en attente (ou `items`) et enregistre les résultats par lots.
+    Retourne (nombre de CV analysés, nombre d'échecs).
+    """
+    items = pending_items() if items is None else items
+    parsed = failed = 0
+    batch = []
+    for key, result in parse_in_pool(items, workers):
+        batch.append((key, result))
+        parsed += 1
+        failed += bool(result['error'])
+        if len(batch) >= batch_size:
+            save_results(batch)
+            refresh_cv_features([key for key, _ in batch])
+            batch = []
+    if batch:
+        save_results(batch)
+        refresh_cv_features([key for key, _ in batch])
+    return parsed, failed
+
+
+def parse_blob(sha256):
+    """
+    Analyse d'un seul CV stocké (ex: à la fin d'un envoi), dans le processus courant,
+    puis recalcule les caractéristiques des candidats qui l'utilisent.
+    """
+    if not ParsedCV.objects.filter(sha256=sha256, parser_version=PARSER_VERSION).exists():
+        blob = CVBlob.objects.filter(sha256=sha256).first()
+        if blob is None:
+            return
+        result = parse_file(blob.file.path)
+        if result['error']:
+            logger.warning("Analyse du CV %s impossible : %s", sha256, result['error'])
+        save_results([(sha256, result)])
+    refresh_cv_features([sha256])
@@ -0,0 +1,10 @@
+from rest_framework import serializers
+
+from .models import ParsedCV
+
+
+class ParsedCVSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ParsedCV
+        fields = ['sha256', 'text', 'sections', 'error', 'parsed_at']
+        read_only_fields = fields
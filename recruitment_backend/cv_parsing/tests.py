@@ -1,3 +1,155 @@
-from django.test import TestCase
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from cv_upload.models import CVBlob
+from cv_upload.storage import blob_name
+from users.models import CandidateProfile, User
+from . import extract
+from .extract import detect_sections, extract_text
+from .models import ParsedCV
+from .pipeline import PARSER_VERSION, parse_blob, pending_items, run_pipeline
+
+CV_LINES = [
+    'Jean Dupont',
+    'EXPÉRIENCE PROFESSIONNELLE :',
+    'Développeur Python chez SBSE (2020-2024)',
+    'Compétences',
+    'Python, Django, SQL',
+    'Langues',
+    'Français, Anglais',
+]
+
+
+def write_docx(path, lines):
+    paragraphs = ''.join(f'<w:p><w:r><w:t>{line}</w:t></w:r></w:p>' for line in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f'<w:body>{paragraphs}</w:body></w:document>'
+    )
+    with zipfile.ZipFile(path, 'w') as archive:
+        archive.writestr('word/document.xml', document)
+
+
+def write_pdf(path, lines):
+    """PDF minimal d'une page, une ligne de texte par instruction"""
+    text = ' '.join(f'({line}) Tj T*' for line in lines)
+    stream = f'BT /F1 12 Tf 14 TL 50 750 Td {text} ET'.encode('latin-1')
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>',
+        b'<< /Length %d >>\nstream\n%s\nendstream' % (len(stream), stream),
+        b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+    ]
+    content = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(content))
+        content += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+    xref = len(content)
+    content += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    content += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    content += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    with open(path, 'wb') as pdf_file:
+        pdf_file.write(content)
+
+
+class ExtractionTest(TestCase):
+    """
+    Extraction du texte (DOCX, TXT) et découpage en sections.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_docx_and_sections(self):
+        path = os.path.join(self.directory, 'cv.docx')
+        write_docx(path, CV_LINES)
+        text = extract_text(path)
+        self.assertEqual(text.splitlines(), CV_LINES)
+        self.assertEqual(detect_sections(text), {
+            'experience': 'Développeur Python chez SBSE (2020-2024)',
+            'skills': 'Python, Django, SQL',
+            'languages': 'Français, Anglais',
+        })
+
+    def test_pdf_sections(self):
+        path = os.path.join(self.directory, 'blob')
+        write_pdf(path, ['Competences', 'Python, Django, SQL', 'Langues', 'Francais, Anglais'])
+        sections = detect_sections(extract_text(path))
+        self.assertEqual(sections['skills'], 'Python, Django, SQL')
+        self.assertEqual(sections['languages'], 'Francais, Anglais')
+
+    def test_format_is_detected_without_extension(self):
+        path = os.path.join(self.directory, 'blob')
+        write_docx(path, CV_LINES)
+        self.assertIn('Python, Django, SQL', extract_text(path))
+
+
+class ParsingPipelineTest(TestCase):
+    """
+    Analyse en parallèle des CV stockés ; un contenu déjà analysé ne l'est plus.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        for index, extension in enumerate(['.txt', '.docx', '.txt']):
+            digest = f'{index:064x}'
+            path = os.path.join(self.media_root, blob_name(digest))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if extension == '.docx':
+                write_docx(path, CV_LINES)
+            else:
+                with open(path, 'w', encoding='utf-8') as cv_file:
+                    cv_file.write('\n'.join(CV_LINES[:index + 3]))
+            CVBlob.objects.create(sha256=digest, file=blob_name(digest), size=os.path.getsize(path))
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root)
+
+    def test_pipeline_parses_each_content_once(self):
+        self.assertEqual(run_pipeline(workers=2), (3, 0))
+        self.assertEqual(ParsedCV.objects.filter(parser_version=PARSER_VERSION).count(), 3)
+        self.assertEqual(ParsedCV.objects.get(sha256=f'{1:064x}').sections['skills'], 'Python, Django, SQL')
+        # Tout est déjà analysé : rien à refaire
+        self.assertEqual(run_pipeline(workers=2), (0, 0))
+
+    def test_parsed_cv_endpoint(self):
+        run_pipeline(workers=1)
+        user = User.objects.create_user(username='candidate', email='candidate@example.com', password='pass', role='candidate')
+        CandidateProfile.objects.create(user=user, cv=blob_name(f'{1:064x}'))
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get('/api/parsed-cv/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['sections']['languages'], 'Français, Anglais')
+
+    def test_missing_pdf_parser_is_not_cached(self):
+        digest = f'{9:064x}'
+        path = os.path.join(self.media_root, blob_name(digest))
+        write_pdf(path, ['Competences', 'Python'])
+        CVBlob.objects.create(sha256=digest, file=blob_name(digest), size=os.path.getsize(path))
+
+        # pypdf absent : échec temporaire, le CV reste à analyser
+        with mock.patch.object(extract, 'pypdf', None), self.assertLogs('cv_parsing.pipeline', 'WARNING'):
+            parse_blob(digest)
+        self.assertFalse(ParsedCV.objects.filter(sha256=digest).exists())
+        self.assertIn(digest, dict(pending_items()))
+
+        # pypdf installé : le CV est analysé
+        parse_blob(digest)
+        parsed = ParsedCV.objects.get(sha256=digest)
+        self.assertEqual((parsed.error, parsed.sections['skills']), ('', 'Python'))
@@ -0,0 +1,7 @@
+from django.urls import path
+from .views import ParsedCVView
+
+urlpatterns = [
+    path('parsed-cv/', ParsedCVView.as_view(), name='parsed-cv'),
+    path('parsed-cv/<int:candidate_id>/', ParsedCVView.as_view(), name='parsed-cv-candidate'),
+]
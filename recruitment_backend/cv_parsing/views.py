@@ -1,3 +1,34 @@
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-# Create your views here.
+from users.models import CandidateProfile
+from .models import ParsedCV
+from .pipeline import PARSER_VERSION, profile_cv_sha256
+from .serializers import ParsedCVSerializer
+
+
+class ParsedCVView(APIView):
+    """
+    Texte et sections extraits du CV d'un candidat.
+    GET /api/parsed-cv/ → CV du candidat connecté ; GET /api/parsed-cv/<candidate_id>/ → réservé aux employeurs
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, candidate_id=None):
+        if candidate_id is None:
+            profile = get_object_or_404(CandidateProfile, user=request.user)
+        elif request.user.role == 'employer':
+            profile = get_object_or_404(CandidateProfile, pk=candidate_id)
+        else:
+            return Response({'detail': "Seuls les employeurs peuvent consulter le CV d'un candidat."}, status=status.HTTP_403_FORBIDDEN)
+
+        sha256 = profile_cv_sha256(profile)
+        if sha256 is None:
+            return Response({'detail': "Aucun CV pour ce candidat."}, status=status.HTTP_404_NOT_FOUND)
+        parsed = ParsedCV.objects.filter(sha256=sha256, parser_version=PARSER_VERSION).first()
+        if parsed is None:
+            return Response({'detail': "CV en cours d'analyse."}, status=status.HTTP_202_ACCEPTED)
+        return Response(ParsedCVSerializer(parsed).data)
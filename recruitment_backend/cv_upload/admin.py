@@ -1,3 +1,5 @@
 from django.contrib import admin
+from .models import CVBlob, UploadSession
 
-# Register your models here.
+admin.site.register(CVBlob)
+admin.site.register(UploadSession)
@@ -1,3 +1,61 @@
+import uuid
+
+from django.conf import settings
 from django.db import models
 
-# Create your models here.
+
+"""
+CV stocké une seule fois, adressé par son contenu (empreinte SHA-256).
+➡️ Deux envois du même fichier (même contenu) partagent le même CVBlob :
+le fichier n'est écrit qu'une fois et l'analyse d'un CV déjà connu peut être évitée.
+    sha256 → Empreinte du contenu (nom du fichier dans le stockage : cv/sha256/ab/abcdef...)
+    size → Taille en octets
+"""
+
+class CVBlob(models.Model):
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(max_length=255)
+    size = models.BigIntegerField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"CV {self.sha256[:12]} ({self.size} octets)"
+
+
+"""
+Envoi d'un CV en plusieurs morceaux, pouvant être repris après une interruption.
+➡️ Le client déclare la taille du fichier, puis envoie les morceaux dans l'ordre
+(en-tête Upload-Offset). Les octets reçus sont écrits au fur et à mesure dans un
+fichier partiel ; à la réception du dernier octet, le fichier devient un CVBlob.
+    received → Nombre d'octets déjà reçus (position de reprise)
+    blob → CV obtenu une fois l'envoi terminé
+"""
+
+class UploadSession(models.Model):
+    STATUS_CHOICES = [
+        ('uploading', 'Uploading'),
+        ('receiving', 'Receiving'), # un morceau est en cours d'écriture
+        ('complete', 'Complete'),
+    ]
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='cv_uploads'
+    )
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    received = models.BigIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    blob = models.ForeignKey(
+        CVBlob,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='uploads'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.filename} ({self.received}/{self.size})"
@@ -0,0 +1,28 @@
+from django.conf import settings
+from rest_framework import serializers
+
+from .models import UploadSession
+from .storage import UploadError, check_filename
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    # Empreinte annoncée par le client : si ce candidat a déjà envoyé ce CV, l'envoi est terminé immédiatement
+    sha256 = serializers.RegexField(r'^[0-9a-fA-F]{64}$', required=False, write_only=True)
+    blob = serializers.CharField(source='blob_id', read_only=True)
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'filename', 'size', 'received', 'status', 'sha256', 'blob', 'created_at']
+        read_only_fields = ['id', 'received', 'status', 'blob', 'created_at']
+
+    def validate_filename(self, value):
+        try:
+            check_filename(value)
+        except UploadError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
+    def validate_size(self, value):
+        if not 0 < value <= settings.CV_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(f"La taille doit être comprise entre 1 et {settings.CV_UPLOAD_MAX_SIZE} octets.")
+        return value
@@ -0,0 +1,149 @@
+"""
+Stockage des CV par contenu (SHA-256) et écriture en flux des envois par morceaux.
+➡️ L'empreinte est calculée pendant l'écriture, morceau par morceau : le fichier
+n'est jamais relu ni chargé en mémoire. L'état du calcul est conservé en mémoire
+par processus ; après un redémarrage (ou sur un autre processus), la reprise
+recalcule une seule fois l'empreinte du fichier partiel déjà reçu.
+➡️ Un contenu déjà connu n'est pas réécrit : le fichier reçu est supprimé et le
+CVBlob existant est réutilisé.
+"""
+import hashlib
+import os
+import threading
+import uuid
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from .models import CVBlob
+
+READ_BLOCK_SIZE = 64 * 1024
+
+# Calculs d'empreinte en cours : {id de l'envoi: (octets hachés, objet sha256)}
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    """Morceau refusé (dépassement de la taille déclarée, extension interdite...)"""
+
+
+def blob_name(digest):
+    return f'cv/sha256/{digest[:2]}/{digest}'
+
+
+def partial_path(session):
+    return os.path.join(settings.MEDIA_ROOT, 'cv', 'uploads', f'{session.pk}.part')
+
+
+def check_filename(filename):
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in settings.CV_UPLOAD_EXTENSIONS:
+        raise UploadError(f"Extension non autorisée : {extension or '(aucune)'} ({', '.join(settings.CV_UPLOAD_EXTENSIONS)}).")
+
+
+def _hash_file(path, hasher=None):
+    hasher = hasher or hashlib.sha256()
+    with open(path, 'rb') as partial:
+        while block := partial.read(READ_BLOCK_SIZE):
+            hasher.update(block)
+    return hasher
+
+
+def _session_hasher(session, path):
+    """Calcul d'empreinte en cours de l'envoi ; recalculé depuis le fichier partiel en cas de reprise"""
+    with _hashers_lock:
+        state = _hashers.pop(session.pk, None)
+    if state is not None and state[0] == session.received:
+        return state[1]
+    if session.received == 0:
+        return hashlib.sha256()
+    return _hash_file(path)
+
+
+def append_chunk(session, stream, length):
+    """
+    Ajoute `length` octets lus depuis `stream` à la fin du fichier partiel de l'envoi.
+    En cas d'erreur (client déconnecté...), le fichier est ramené à sa taille précédente.
+    Retourne le nouveau nombre d'octets reçus.
+    """
+    if session.received + length > session.size:
+        raise UploadError(f"Le morceau dépasse la taille déclarée ({session.size} octets).")
+
+    path = partial_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    hasher = _session_hasher(session, path)
+    written = 0
+    with open(path, 'ab') as partial:
+        try:
+            partial.truncate(session.received)
+            while written < length:
+                block = stream.read(min(READ_BLOCK_SIZE, length - written))
+                if not block:
+                    raise UploadError("Morceau incomplet : la connexion a été interrompue.")
+                partial.write(block)
+                hasher.update(block)
+                written += len(block)
+        except BaseException:
+            partial.truncate(session.received)
+            raise
+
+    received = session.received + written
+    with _hashers_lock:
+        _hashers[session.pk] = (received, hasher)
+    return received
+
+
+def _store(path, digest, size):
+    """Déplace le fichier reçu vers son emplacement par contenu, ou le supprime si ce contenu est déjà stocké"""
+    blob = CVBlob.objects.filter(sha256=digest).first()
+    if blob is not None:
+        os.remove(path)
+        return blob
+
+    name = blob_name(digest)
+    target = default_storage.path(name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(path, target)
+    try:
+        with transaction.atomic():
+            return CVBlob.objects.create(sha256=digest, file=name, size=size)
+    except IntegrityError:
+        # Même contenu enregistré simultanément par un autre envoi : le fichier est identique
+        return CVBlob.objects.get(sha256=digest)
+
+
+def finish_upload(session):
+    """Transforme le fichier partiel complet en CVBlob (dédupliqué)"""
+    path = partial_path(session)
+    with _hashers_lock:
+        state = _hashers.pop(session.pk, None)
+    hasher = state[1] if state is not None and state[0] == session.size else _hash_file(path)
+    return _store(path, hasher.hexdigest(), session.size)
+
+
+def discard_upload(session):
+    with _hashers_lock:
+        _hashers.pop(session.pk, None)
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def store_file(uploaded_file):
+    """
+    Enregistre un fichier envoyé en une fois (multipart) dans le stockage par contenu.
+    Le fichier est lu par morceaux (UploadedFile.chunks) en calculant son empreinte.
+    """
+    check_filename(uploaded_file.name)
+    directory = os.path.join(settings.MEDIA_ROOT, 'cv', 'uploads')
+    os.makedirs(directory, exist_ok=True)
+    hasher = hashlib.sha256()
+    path = os.path.join(directory, f'{uuid.uuid4()}.part')
+    with open(path, 'wb') as partial:
+        for chunk in uploaded_file.chunks(READ_BLOCK_SIZE):
+            partial.write(chunk)
+            hasher.update(chunk)
+    return _store(path, hasher.hexdigest(), uploaded_file.size)
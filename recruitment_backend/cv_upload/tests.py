@@ -1,3 +1,104 @@
-from django.test import TestCase
+import hashlib
+import os
+import shutil
+import tempfile
 
-# Create your tests here.
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from users.models import CandidateProfile, User
+from . import storage
+from .models import CVBlob
+
+
+class ChunkedUploadTest(TestCase):
+    """
+    Envoi par morceaux avec reprise, et stockage unique d'un même contenu.
+    """
+
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.override = override_settings(MEDIA_ROOT=self.media_root)
+        self.override.enable()
+        self.user = User.objects.create_user(username='candidate', email='candidate@example.com', password='pass', role='candidate')
+        CandidateProfile.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.content = os.urandom(200 * 1024)
+
+    def tearDown(self):
+        self.override.disable()
+        shutil.rmtree(self.media_root)
+
+    def start(self, **extra):
+        response = self.client.post('/api/cv-uploads/', {'filename': 'cv.pdf', 'size': len(self.content), **extra}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data
+
+    def send(self, upload_id, offset, data):
+        return self.client.put(
+            f'/api/cv-uploads/{upload_id}/', data, content_type='application/octet-stream', HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def upload(self, chunk_size=64 * 1024):
+        upload_id = self.start()['id']
+        for offset in range(0, len(self.content), chunk_size):
+            response = self.send(upload_id, offset, self.content[offset:offset + chunk_size])
+            self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_chunked_upload_with_resume(self):
+        upload_id = self.start()['id']
+        self.send(upload_id, 0, self.content[:50000])
+        # Mauvaise position : le serveur indique où reprendre
+        response = self.send(upload_id, 70000, self.content[70000:90000])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response['Upload-Offset'], '50000')
+
+        # Reprise après redémarrage : l'empreinte du fichier partiel est recalculée
+        storage._hashers.clear()
+        self.assertEqual(self.client.get(f'/api/cv-uploads/{upload_id}/').data['received'], 50000)
+        response = self.send(upload_id, 50000, self.content[50000:])
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['status'], 'complete')
+
+        digest = hashlib.sha256(self.content).hexdigest()
+        self.assertEqual(response.data['blob'], digest)
+        profile = CandidateProfile.objects.get(user=self.user)
+        with profile.cv.open('rb') as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_same_content_is_stored_once(self):
+        first = self.upload()
+        second = self.upload(chunk_size=30000)
+        self.assertEqual(first['blob'], second['blob'])
+        self.assertEqual(CVBlob.objects.count(), 1)
+        stored = [name for _, _, names in os.walk(self.media_root) for name in names]
+        self.assertEqual(len(stored), 1)
+
+        # Empreinte déjà connue : aucun octet à envoyer
+        data = self.start(sha256=first['blob'])
+        self.assertEqual((data['status'], data['blob']), ('complete', first['blob']))
+
+    def test_known_digest_of_another_candidate_requires_bytes(self):
+        first = self.upload()
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='candidate')
+        CandidateProfile.objects.create(user=other)
+        self.client.force_authenticate(other)
+
+        # L'empreinte d'un CV d'un autre candidat ne suffit pas à se l'attribuer
+        data = self.start(sha256=first['blob'])
+        self.assertEqual((data['status'], data['blob']), ('uploading', None))
+        self.assertFalse(CandidateProfile.objects.get(user=other).cv)
+
+        # Avec les octets, le contenu est dédupliqué
+        response = self.send(data['id'], 0, self.content)
+        self.assertEqual((response.data['status'], response.data['blob']), ('complete', first['blob']))
+        self.assertEqual(CVBlob.objects.count(), 1)
+        self.assertEqual(CandidateProfile.objects.get(user=other).cv.name, storage.blob_name(first['blob']))
+
+    def test_chunk_larger_than_declared_size(self):
+        upload_id = self.start()['id']
+        response = self.send(upload_id, 0, self.content + b'x')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.client.get(f'/api/cv-uploads/{upload_id}/').data['received'], 0)
@@ -1,3 +1,109 @@
-from django.shortcuts import render
+from datetime import timedelta
 
-# Create your views here.
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework import mixins, status, viewsets
+from rest_framework.response import Response
+
+from cv_parsing.pipeline import parse_blob
+from recruitment_backend.async_utils import submit
+from users.models import CandidateProfile
+from users.permissions import IsCandidate
+from .models import CVBlob, UploadSession
+from .serializers import UploadSessionSerializer
+from .storage import UploadError, append_chunk, discard_upload, finish_upload
+
+# Un morceau en cours d'écriture depuis plus longtemps est considéré abandonné (client ou worker arrêté)
+RECEIVING_TIMEOUT = timedelta(minutes=5)
+
+
+def attach_cv(user, blob):
+    """
+    Le CV devient celui du profil candidat (le fichier stocké est partagé, pas copié).
+    Il est analysé en arrière-plan, sauf si ce contenu l'a déjà été.
+    """
+    CandidateProfile.objects.filter(user=user).update(cv=blob.file.name)
+    transaction.on_commit(lambda: submit(parse_blob, blob.sha256))
+
+
+def owned_blob(user, sha256, size):
+    """CVBlob de ce contenu, si l'utilisateur l'a déjà envoyé (envoi terminé ou CV de son profil)"""
+    return CVBlob.objects.filter(
+        Q(uploads__user=user, uploads__status='complete') | Q(file__in=CandidateProfile.objects.filter(user=user).values('cv')),
+        sha256=sha256, size=size,
+    ).distinct().first()
+
+
+# Envoi de CV par morceaux, avec reprise
+class UploadSessionViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.DestroyModelMixin,
+                           viewsets.GenericViewSet):
+    """
+    1. POST /api/cv-uploads/ {filename, size, sha256?} → id de l'envoi
+    2. PUT /api/cv-uploads/<id>/ (corps : octets du morceau, en-tête Upload-Offset) autant de fois que nécessaire
+    3. GET /api/cv-uploads/<id>/ → position de reprise (received) après une interruption
+    """
+    serializer_class = UploadSessionSerializer
+    permission_classes = [IsCandidate]
+
+    def get_queryset(self):
+        return UploadSession.objects.filter(user=self.request.user)
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        sha256 = serializer.validated_data.pop('sha256', '').lower()
+
+        # CV déjà envoyé par ce candidat : aucun octet à envoyer.
+        # L'empreinte n'est pas secrète (elle figure dans le chemin du CV) : pour un contenu envoyé
+        # par un autre candidat, les octets sont exigés, puis dédupliqués par finish_upload.
+        blob = owned_blob(request.user, sha256, serializer.validated_data['size']) if sha256 else None
+        if blob is not None:
+            serializer.save(user=request.user, blob=blob, received=blob.size, status='complete')
+            attach_cv(request.user, blob)
+        else:
+            serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+    def update(self, request, *args, **kwargs):
+        """Reçoit un morceau et l'écrit à la suite du fichier partiel, sans le charger en mémoire"""
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return Response({'detail': "En-têtes Upload-Offset et Content-Length obligatoires."}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Réservation de l'envoi : un seul morceau écrit à la fois, à la position attendue
+        now = timezone.now()
+        claimed = self.get_queryset().filter(
+            Q(status='uploading') | Q(status='receiving', updated_at__lt=now - RECEIVING_TIMEOUT),
+            pk=kwargs['pk'], received=offset,
+        ).update(status='receiving', updated_at=now)
+        session = self.get_object()
+        if not claimed:
+            return Response(
+                {'detail': "Position invalide ou envoi déjà terminé.", 'received': session.received, 'status': session.status},
+                status=status.HTTP_409_CONFLICT, headers={'Upload-Offset': str(session.received)},
+            )
+
+        try:
+            session.received = append_chunk(session, request.stream, length) if length else session.received
+            session.status = 'uploading'
+            if session.received == session.size:
+                session.blob = finish_upload(session)
+                session.status = 'complete'
+                attach_cv(request.user, session.blob)
+        except UploadError as exc:
+            UploadSession.objects.filter(pk=session.pk).update(status='uploading')
+            return Response({'detail': str(exc), 'received': session.received}, status=status.HTTP_400_BAD_REQUEST)
+        except BaseException:
+            UploadSession.objects.filter(pk=session.pk).update(status='uploading')
+            raise
+
+        session.save()
+        return Response(self.get_serializer(session).data, headers={'Upload-Offset': str(session.received)})
+
+    def perform_destroy(self, instance):
+        # Abandon de l'envoi : suppression du fichier partiel
+        discard_upload(instance)
+        instance.delete()
@@ -1,3 +1,6 @@
 from django.contrib import admin
+from .models import CandidateFeatures, Skill, SkillAlias
 
-# Register your models here.
+admin.site.register(Skill)
+admin.site.register(SkillAlias)
+admin.site.register(CandidateFeatures)
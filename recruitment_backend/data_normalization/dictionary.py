@@ -0,0 +1,30 @@
+"""
+Dictionnaire de synonymes chargé par défaut (`python manage.py load_skill_aliases`).
+➡️ Clé : nom canonique de la compétence ; valeur : formes alternatives.
+"""
+
+DEFAULT_ALIASES = {
+    'python': ['python3', 'python 3', 'py'],
+    'javascript': ['js', 'ecmascript', 'es6'],
+    'typescript': ['ts'],
+    'node.js': ['nodejs', 'node js', 'node'],
+    'react': ['reactjs', 'react.js', 'react js'],
+    'vue.js': ['vuejs', 'vue js'],
+    'angular': ['angularjs', 'angular.js'],
+    'django': ['django rest framework', 'drf'],
+    'postgresql': ['postgres', 'psql', 'pgsql'],
+    'mysql': ['mariadb'],
+    'sql': ['sgbd', 'sgbdr'],
+    'c++': ['cpp'],
+    'c#': ['csharp', 'c sharp'],
+    'java': ['java se', 'java ee', 'jee'],
+    'docker': ['docker compose'],
+    'kubernetes': ['k8s'],
+    'git': ['github', 'gitlab'],
+    'machine learning': ['apprentissage automatique', 'ml'],
+    'intelligence artificielle': ['ia', 'ai', 'artificial intelligence'],
+    'anglais': ['english'],
+    'francais': ['french'],
+    'communication': ['communicant'],
+    "travail d'equipe": ['travail en equipe', 'teamwork', 'esprit d equipe'],
+}
@@ -0,0 +1,131 @@
+"""
+Caractéristiques des candidats (CandidateFeatures), calculées à l'écriture.
+➡️ La bio, le CV analysé et le formulaire générique d'un candidat sont découpés
+une seule fois, lors de leur modification, en identifiants de compétences
+empaquetés (entiers 32 bits triés) et en indicateurs (années d'expérience).
+Les scoreurs ne lisent que ces caractéristiques, jamais les textes.
+➡️ Des caractéristiques d'un autre format (FEATURES_VERSION), ou calculées avec
+une version antérieure du vocabulaire alors que l'offre évaluée utilise une
+compétence apparue depuis, sont recalculées à la lecture.
+"""
+import re
+
+from django.db import transaction
+
+from ahp_evaluation.models import CandidateForm
+from candidate_ranking.index import indexed_terms, record_changes
+from cv_parsing.models import ParsedCV
+from cv_upload.models import CVBlob
+from .models import CandidateFeatures
+from .vocabulary import get_vocabulary, normalize, pack_terms
+
+# À incrémenter quand le calcul change : les caractéristiques seront recalculées à la lecture
+FEATURES_VERSION = 1
+SAVE_BATCH_SIZE = 500
+
+# Réponses négatives du formulaire (ex: « Mobilité géographique : Non ») : le critère n'est pas acquis
+NEGATIVE_VALUES = {'non', 'no', 'aucun', 'aucune', 'none', 'false', 'faux', '0'}
+EXPERIENCE_RE = re.compile(r'\b(\d{1,2}) (?:an|ans|annee|annees|year|years)\b')
+MAX_EXPERIENCE_YEARS = 50
+
+
+def form_text(forms):
+    """Texte du formulaire générique d'un candidat (nom + valeur de chaque critère acquis)"""
+    return "\n".join(
+        f"{form.name} {form.value}" for form in forms if normalize(form.value) not in NEGATIVE_VALUES
+    )
+
+
+def experience_years(*texts):
+    """Années d'expérience mentionnées dans les textes (ex: « 5 ans d'expérience »), None si aucune"""
+    years = [
+        int(match) for text in texts for match in EXPERIENCE_RE.findall(normalize(text))
+        if int(match) <= MAX_EXPERIENCE_YEARS
+    ]
+    return max(years, default=None)
+
+
+def _parsed_cvs(candidates):
+    """CV analysés des candidats : {id du profil: ParsedCV}"""
+    files = {candidate.pk: candidate.cv.name for candidate in candidates if candidate.cv}
+    digests = dict(CVBlob.objects.filter(file__in=set(files.values())).values_list('file', 'sha256'))
+    parsed = ParsedCV.objects.filter(sha256__in=set(digests.values())).only('sha256', 'text', 'sections').in_bulk()
+    return {
+        candidate_id: parsed[digests[name]]
+        for candidate_id, name in files.items() if digests.get(name) in parsed
+    }
+
+
+def refresh_features(candidates):
+    """
+    Recalcule et enregistre les caractéristiques des candidats (profils CandidateProfile).
+    Retourne un dictionnaire {id du profil: CandidateFeatures}.
+    """
+    candidates = list({candidate.pk: candidate for candidate in candidates}.values())
+    if not candidates:
+        return {}
+
+    vocabulary = get_vocabulary()
+    forms = {}
+    for form in CandidateForm.objects.filter(user_id__in={c.user_id for c in candidates}).order_by('id'):
+        forms.setdefault(form.user_id, []).append(form)
+    cvs = _parsed_cvs(candidates)
+    previous = CandidateFeatures.objects.only('candidate_id', 'terms').in_bulk([c.pk for c in candidates])
+
+    features = []
+    for candidate in candidates:
+        cv = cvs.get(candidate.pk)
+        cv_text = cv.text if cv is not None else ''
+        candidate_forms = forms.get(candidate.user_id, [])
+        features.append(CandidateFeatures(
+            candidate_id=candidate.pk,
+            terms=pack_terms(vocabulary.tokenize(f"{candidate.bio}\n{cv_text}")),
+            form_terms=pack_terms(vocabulary.tokenize(form_text(candidate_forms))),
+            experience_years=experience_years(
+                candidate.bio, cv.sections.get('experience', '') if cv is not None else '',
+                *(f"{form.name} {form.value}" for form in candidate_forms),
+            ),
+            cv_sha256=cv.sha256 if cv is not None else '',
+            version=FEATURES_VERSION,
+            vocabulary_version=vocabulary.version,
+        ))
+    with transaction.atomic():
+        CandidateFeatures.objects.bulk_create(
+            features,
+            batch_size=SAVE_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['candidate'],
+            update_fields=[
+                'terms', 'form_terms', 'experience_years', 'cv_sha256', 'version', 'vocabulary_version', 'updated_at',
+            ],
+        )
+        # Index inversé des candidats : seules les compétences ajoutées ou retirées sont journalisées
+        record_changes(
+            (feature.candidate_id, indexed_terms(previous.get(feature.candidate_id)), indexed_terms(feature))
+            for feature in features
+        )
+    return {feature.candidate_id: feature for feature in features}
+
+
+def refresh_user_features(user):
+    """Recalcule les caractéristiques d'un utilisateur, s'il est candidat"""
+    candidate = getattr(user, 'candidate_profile', None)
+    if candidate is not None:
+        refresh_features([candidate])
+
+
+def get_features(candidates, required_version=0):
+    """
+    Caractéristiques des candidats, {id du profil: CandidateFeatures}.
+    Les caractéristiques absentes, d'un autre format ou calculées avant `required_version` sont recalculées.
+    """
+    candidates = list(candidates)
+    features = CandidateFeatures.objects.in_bulk([candidate.pk for candidate in candidates])
+    stale = [
+        candidate for candidate in candidates
+        if candidate.pk not in features
+        or features[candidate.pk].version != FEATURES_VERSION
+        or features[candidate.pk].vocabulary_version < required_version
+    ]
+    features.update(refresh_features(stale))
+    return features
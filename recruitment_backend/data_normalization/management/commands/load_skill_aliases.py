@@ -0,0 +1,26 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from data_normalization.dictionary import DEFAULT_ALIASES
+from data_normalization.vocabulary import load_aliases
+
+
+class Command(BaseCommand):
+    help = "Charge le dictionnaire de synonymes des compétences (par défaut, puis un fichier JSON optionnel)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', help="Fichier JSON {nom canonique: [alias, ...]}")
+        parser.add_argument('--no-defaults', action='store_true', help="Ne pas charger le dictionnaire par défaut")
+
+    def handle(self, *args, **options):
+        mapping = {} if options['no_defaults'] else dict(DEFAULT_ALIASES)
+        if options['file']:
+            with open(options['file'], encoding='utf-8') as aliases_file:
+                for name, aliases in json.load(aliases_file).items():
+                    mapping[name] = [*mapping.get(name, []), *aliases]
+
+        added, conflicts = load_aliases(mapping)
+        for key in conflicts:
+            self.stdout.write(f"Alias déjà attribué à une autre compétence : {key}")
+        self.stdout.write(f"{len(added)} alias ajouté(s), {len(conflicts)} conflit(s)")
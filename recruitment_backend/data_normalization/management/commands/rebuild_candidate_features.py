@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from data_normalization.features import SAVE_BATCH_SIZE, refresh_features
+from users.models import CandidateProfile
+
+
+class Command(BaseCommand):
+    help = "Recalcule les caractéristiques de tous les candidats (après une correction du dictionnaire ou des CV)"
+
+    def handle(self, *args, **options):
+        count = 0
+        batch = []
+        for candidate in CandidateProfile.objects.only('id', 'user_id', 'bio', 'cv').iterator(SAVE_BATCH_SIZE):
+            batch.append(candidate)
+            if len(batch) == SAVE_BATCH_SIZE:
+                count += len(refresh_features(batch))
+                batch = []
+        count += len(refresh_features(batch))
+        self.stdout.write(f"{count} candidat(s) mis à jour")
@@ -1,3 +1,57 @@
 from django.db import models
+from users.models import CandidateProfile
 
-# Create your models here.
+"""
+Vocabulaire normalisé des compétences et des critères.
+Skill → Compétence (ou critère) canonique, identifiée par un entier
+SkillAlias → Forme textuelle normalisée renvoyant vers une compétence (ex: 'python3', 'py' → python)
+"""
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=255, unique=True)  # Nom canonique (normalisé)
+
+    def __str__(self):
+        return self.name
+
+
+class SkillAlias(models.Model):
+    # Les alias sont ajoutés, jamais réécrits : l'id du dernier alias sert de version au vocabulaire
+    key = models.CharField(max_length=255, unique=True)  # Texte normalisé (minuscules, sans accents)
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return f"{self.key} → {self.skill.name}"
+
+
+"""
+Caractéristiques d'un candidat, calculées à l'écriture du profil (bio, CV, formulaire générique).
+terms → Identifiants triés des compétences de la bio et du CV, empaquetés (entiers 32 bits)
+form_terms → Identifiants triés des compétences du formulaire générique (CandidateForm), empaquetés
+experience_years → Années d'expérience déclarées (la plus grande valeur trouvée)
+cv_sha256 → Empreinte du CV analysé pris en compte (vide si aucun)
+version → Version du format des caractéristiques
+vocabulary_version → Version du vocabulaire utilisée pour le calcul
+"""
+
+
+class CandidateFeatures(models.Model):
+    candidate = models.OneToOneField(
+        CandidateProfile, on_delete=models.CASCADE, primary_key=True, related_name='features'
+    )
+    terms = models.BinaryField(default=bytes)
+    form_terms = models.BinaryField(default=bytes)
+    experience_years = models.PositiveSmallIntegerField(null=True, blank=True)
+    cv_sha256 = models.CharField(max_length=64, blank=True)
+    version = models.PositiveSmallIntegerField(default=0)
+    vocabulary_version = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Candidats à réindexer après l'ajout d'alias (recherche de candidats)
+            models.Index(fields=['vocabulary_version'], name='features_vocabulary_idx'),
+        ]
+
+    def __str__(self):
+        return f"Caractéristiques de {self.candidate_id}"
@@ -1,3 +1,143 @@
 from django.test import TestCase
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from ahp_evaluation.ahp import AHP
+from ahp_evaluation.models import CandidateForm
+from cv_parsing.models import ParsedCV
+from cv_parsing.pipeline import refresh_cv_features
+from cv_upload.models import CVBlob
+from cv_upload.storage import blob_name
+from jobs.ahp import calculate_candidate_score
+from jobs.models import Constraint, Job, SkillRequirement
+from users.models import CandidateProfile, EmployerProfile, User
+from .features import FEATURES_VERSION, experience_years, get_features
+from .models import CandidateFeatures
+from .vocabulary import get_vocabulary, intern_terms, load_aliases, normalize, unpack_terms
+
+
+class VocabularyTest(TestCase):
+    """
+    Normalisation des textes et conversion des synonymes en identifiants entiers.
+    """
+
+    def setUp(self):
+        load_aliases({'python': ['Python3', 'python 3', 'py'], 'machine learning': ['apprentissage automatique']})
+
+    def test_normalize(self):
+        self.assertEqual(normalize("Node.JS / Expérience, C++ et C#"), 'node.js experience c++ et c#')
+
+    def test_aliases_share_one_id(self):
+        python, = intern_terms(['Python'])
+        vocabulary = get_vocabulary()
+        for text in ('Python3', 'python 3', 'py', 'PYTHON'):
+            self.assertEqual(vocabulary.lookup(text), python, text)
+
+    def test_tokenize_matches_words_and_phrases(self):
+        vocabulary = get_vocabulary()
+        python, learning = intern_terms(['python', 'machine learning'])
+        self.assertEqual(vocabulary.tokenize("Dév Python 3, apprentissage automatique"), sorted([python, learning]))
+        # Les alias ne sont reconnus que sur des mots entiers
+        self.assertEqual(vocabulary.tokenize("happy, machine à café"), [])
+
+    def test_unknown_terms_are_interned_once(self):
+        version = get_vocabulary().version
+        first = intern_terms(['Rust', "5 ans d'Expérience"])
+        self.assertEqual(intern_terms(['rust', "5 ans d'expérience"]), first)
+        vocabulary = get_vocabulary()
+        self.assertGreater(vocabulary.version, version)
+        self.assertEqual(vocabulary.tokenize("J'ai 5 ans d'expérience en Rust"), sorted(first))
+
+
+class CandidateFeaturesTest(TestCase):
+    """
+    Les caractéristiques des candidats sont calculées à l'écriture et le scoring compare des identifiants.
+    """
+
+    def setUp(self):
+        load_aliases({'python': ['python3', 'py']})
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        SkillRequirement.objects.create(job=self.job, name='Python', value='Expert', weight=1)
+        self.client = APIClient()
+
+    def register(self, bio):
+        response = self.client.post('/api/users/', {
+            'username': 'candidate', 'email': 'candidate@example.com', 'password': 'pass', 'role': 'candidate', 'bio': bio,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return User.objects.get(username='candidate')
+
+    def test_features_written_on_registration_and_update(self):
+        user = self.register('Développeur Python3')
+        python = get_vocabulary().lookup('python')
+        features = CandidateFeatures.objects.get(candidate__user=user)
+        self.assertEqual(unpack_terms(features.terms), [python])
+        self.assertEqual(features.version, FEATURES_VERSION)
+        self.assertEqual(calculate_candidate_score(user.candidate_profile, self.job), 100)
+
+        self.client.force_authenticate(user)
+        response = self.client.put('/api/update-profile/', {'bio': 'Développeur Java', 'name': 'Jean'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        user.refresh_from_db()
+        self.assertEqual(user.name, 'Jean')
+        self.assertEqual(unpack_terms(CandidateFeatures.objects.get(candidate__user=user).terms), [])
+        self.assertEqual(calculate_candidate_score(user.candidate_profile, self.job), 0)
+
+    def test_new_job_terms_refresh_stale_features(self):
+        user = self.register('Rust et py')
+        Constraint.objects.create(job=self.job, type='hard', value='Rust', weight=1)
+        self.job.save()
+        # « rust » est apparu après le calcul des caractéristiques : elles sont recalculées à la lecture
+        self.assertEqual(calculate_candidate_score(user.candidate_profile, self.job), 100)
+        features = CandidateFeatures.objects.get(candidate__user=user)
+        self.assertEqual(features.vocabulary_version, get_vocabulary().version)
+
+    def test_candidate_form_terms(self):
+        user = self.register('Développeur')
+        mobility, = intern_terms(['Mobilité géographique'])
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/candidate-forms/', [
+            {'name': 'Compétence', 'value': 'Py', 'weight': 1},
+            {'name': 'Expérience', 'value': '3 ans', 'weight': 1},
+            {'name': 'Mobilité géographique', 'value': 'Non', 'weight': 1},
+        ], format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(AHP.score_many(self.job, [user.candidate_profile])[0], AHP(self.job, user.candidate_profile).calculer_score_candidat())
+        self.assertEqual(AHP(self.job, user.candidate_profile).evaluer_competences(), 1)
+        features = CandidateFeatures.objects.get(candidate__user=user)
+        self.assertEqual(features.experience_years, 3)
+        # Réponse négative : le critère n'est pas acquis
+        self.assertEqual(unpack_terms(features.form_terms), [get_vocabulary().lookup('python')])
+        self.assertNotIn(mobility, unpack_terms(features.form_terms))
+
+        form = CandidateForm.objects.get(user=user, name='Compétence')
+        response = self.client.delete(f'/api/candidate-forms/{form.pk}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(AHP(self.job, user.candidate_profile).evaluer_competences(), 0)
+
+    def test_parsed_cv_terms_and_outdated_format(self):
+        user = self.register('Développeur')
+        profile = user.candidate_profile
+        digest = 'a' * 64
+        CVBlob.objects.create(sha256=digest, file=blob_name(digest), size=1)
+        ParsedCV.objects.create(
+            sha256=digest, text="EXPÉRIENCE\n7 années en Python 3", sections={'experience': '7 années en Python 3'},
+            parser_version=1,
+        )
+        CandidateProfile.objects.filter(pk=profile.pk).update(cv=blob_name(digest))
+        refresh_cv_features([digest])
+
+        features = CandidateFeatures.objects.get(candidate=profile)
+        self.assertEqual((features.cv_sha256, features.experience_years), (digest, 7))
+        self.assertEqual(calculate_candidate_score(profile, self.job), 100)
+
+        # Format des caractéristiques dépassé : recalcul à la lecture
+        CandidateFeatures.objects.filter(pk=profile.pk).update(version=0, terms=b'')
+        features = get_features([CandidateProfile.objects.get(pk=profile.pk)])[profile.pk]
+        self.assertEqual(features.version, FEATURES_VERSION)
+        self.assertEqual(unpack_terms(features.terms), [get_vocabulary().lookup('python')])
+
+    def test_experience_years(self):
+        self.assertEqual(experience_years("5 ans d'expérience", "Stage de 2 ans", "10 years in IT"), 10)
+        self.assertIsNone(experience_years("Python depuis 2015"))
@@ -0,0 +1,162 @@
+"""
+Normalisation des compétences et critères en identifiants entiers.
+➡️ Un texte (bio, formulaire, critère d'une offre) est découpé en mots normalisés
+(minuscules, sans accents). Les suites de mots connues comme alias (SkillAlias)
+sont remplacées par l'identifiant de leur compétence : « Python3 », « python 3 »
+et « py » donnent tous l'identifiant de python.
+➡️ Le vocabulaire est chargé une fois par processus, avec l'ensemble des préfixes
+d'alias : le découpage d'un texte n'essaie d'allonger une suite de mots que tant
+qu'elle peut encore former un alias.
+➡️ Les alias sont ajoutés, jamais réécrits : l'id du dernier alias sert de version.
+Après une correction manuelle du dictionnaire (admin), lancer
+`python manage.py rebuild_candidate_features`.
+"""
+import re
+import threading
+import unicodedata
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+
+from .models import Skill, SkillAlias
+
+
+WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*')
+# Identifiants de compétences stockés empaquetés : entiers 32 bits non signés, petit-boutiste
+TERMS_DTYPE = '<u4'
+
+
+def normalize(text):
+    """Minuscules, sans accents, mots séparés par une espace (ex: « Node.JS / Expérience » → 'node.js experience')"""
+    text = unicodedata.normalize('NFKD', (text or '').lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return ' '.join(WORD_RE.findall(text))
+
+
+def pack_terms(ids):
+    return np.asarray(ids, dtype=TERMS_DTYPE).tobytes()
+
+
+def unpack_terms(data):
+    return np.frombuffer(data, dtype=TERMS_DTYPE).tolist()
+
+
+class Vocabulary:
+    """
+    Dictionnaire compilé : alias normalisé → identifiant de compétence.
+    version → id du dernier alias chargé
+    """
+
+    def __init__(self, aliases, version):
+        self.version = version
+        self.aliases = {}
+        self.prefixes = set()
+        # Version à partir de laquelle une compétence est entièrement connue (id de son dernier alias)
+        self.skill_versions = {}
+        for alias_id, key, skill_id in aliases:
+            self.aliases[key] = skill_id
+            self.skill_versions[skill_id] = max(self.skill_versions.get(skill_id, 0), alias_id)
+            words = key.split(' ')
+            for length in range(1, len(words)):
+                self.prefixes.add(' '.join(words[:length]))
+
+    def lookup(self, text):
+        """Identifiant de la compétence désignée par un texte (None si inconnue)"""
+        return self.aliases.get(normalize(text))
+
+    def tokenize(self, text):
+        """Identifiants (triés, sans doublons) des compétences présentes dans un texte"""
+        words = normalize(text).split(' ')
+        found = set()
+        for start in range(len(words)):
+            key = words[start]
+            end = start + 1
+            while True:
+                skill_id = self.aliases.get(key)
+                if skill_id is not None:
+                    found.add(skill_id)
+                if end == len(words) or key not in self.prefixes:
+                    break
+                key = f'{key} {words[end]}'
+                end += 1
+        return sorted(found)
+
+    def required_version(self, skill_ids):
+        """Version minimale du vocabulaire pour que des compétences déjà calculées soient à jour"""
+        return max((self.skill_versions.get(skill_id, 0) for skill_id in skill_ids if skill_id is not None), default=0)
+
+
+_vocabulary = None
+_vocabulary_lock = threading.Lock()
+
+
+def vocabulary_version():
+    return SkillAlias.objects.aggregate(version=Max('id'))['version'] or 0
+
+
+def get_vocabulary():
+    """
+    Retourne le vocabulaire du processus, rechargé si des alias ont été ajoutés depuis.
+    """
+    global _vocabulary
+    version = vocabulary_version()
+    with _vocabulary_lock:
+        vocabulary = _vocabulary
+    if vocabulary is not None and vocabulary.version == version:
+        return vocabulary
+
+    aliases = SkillAlias.objects.filter(id__lte=version).values_list('id', 'key', 'skill_id')
+    vocabulary = Vocabulary(aliases.iterator(), version)
+    with _vocabulary_lock:
+        _vocabulary = vocabulary
+    return vocabulary
+
+
+def _add_alias(key, skill):
+    return SkillAlias.objects.get_or_create(key=key, defaults={'skill': skill})
+
+
+def intern_terms(texts):
+    """
+    Identifiants des compétences désignées par des textes (critères d'une offre, compétences).
+    Un texte inconnu devient une nouvelle compétence, avec lui-même pour alias.
+    Retourne une liste alignée sur `texts` (None pour un texte sans aucun mot).
+    """
+    keys = [normalize(text) for text in texts]
+    vocabulary = get_vocabulary()
+    missing = {key for key in keys if key and key not in vocabulary.aliases}
+    if not missing:
+        return [vocabulary.aliases[key] if key else None for key in keys]
+
+    interned = {}
+    for key in missing:
+        with transaction.atomic():
+            skill, _ = Skill.objects.get_or_create(name=key)
+            interned[key] = _add_alias(key, skill)[0].skill_id
+    return [vocabulary.aliases.get(key, interned.get(key)) if key else None for key in keys]
+
+
+def load_aliases(mapping):
+    """
+    Ajoute des synonymes au vocabulaire ({nom canonique: [alias, ...]}).
+    Un alias déjà attribué à une autre compétence n'est pas modifié.
+    Retourne (alias ajoutés, alias en conflit).
+    """
+    added = []
+    conflicts = []
+    for name, aliases in mapping.items():
+        canonical = normalize(name)
+        if not canonical:
+            continue
+        with transaction.atomic():
+            skill, _ = Skill.objects.get_or_create(name=canonical)
+            for key in dict.fromkeys([canonical, *(normalize(alias) for alias in aliases)]):
+                if not key:
+                    continue
+                alias, created = _add_alias(key, skill)
+                if created:
+                    added.append(key)
+                elif alias.skill_id != skill.id:
+                    conflicts.append(key)
+    return added, conflicts
@@ -0,0 +1,101 @@
+"""
+Vues asynchrones (ASGI) de l'optimisation par algorithme génétique.
+➡️ POST /api/ga/<job_id>/runs/ lance l'optimisation en arrière-plan et retourne
+immédiatement son identifiant (202). L'état se suit par polling
+(GET /api/ga/runs/<id>/) ou en flux SSE (GET /api/ga/runs/<id>/events/).
+Aucune vue ne bloque un worker pendant le calcul.
+"""
+import asyncio
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET, require_POST
+
+from jobs.models import CandidateApplication, Job
+from recruitment_backend.async_utils import employer_required
+from .models import OptimizationRun
+from .runs import aexpire_if_stale, start_run
+from .serializers import GAParametersSerializer, OptimizationRunSerializer
+
+
+def _run_payload(run):
+    payload = dict(OptimizationRunSerializer(run).data)
+    payload['status_url'] = reverse('ga-run-status', args=[run.pk])
+    payload['events_url'] = reverse('ga-run-events', args=[run.pk])
+    return payload
+
+
+async def _aget_run(request, run_id):
+    run = await OptimizationRun.objects.filter(pk=run_id, requested_by=request.user).afirst()
+    if run is None:
+        return None
+    return await aexpire_if_stale(run)
+
+
+@require_POST
+@employer_required
+async def start_optimization(request, job_id):
+    """Lance l'algorithme génétique sur les candidatures en attente d'une offre de l'employeur"""
+    try:
+        data = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'detail': "Corps JSON invalide."}, status=400)
+    parameters = GAParametersSerializer(data=data)
+    if not parameters.is_valid():
+        return JsonResponse(parameters.errors, status=400)
+
+    if not await Job.objects.filter(id=job_id, employer__user=request.user).aexists():
+        return JsonResponse({'detail': "Offre d'emploi inexistante."}, status=404)
+    count = await CandidateApplication.objects.filter(job_id=job_id, status='pending').acount()
+    if not count:
+        return JsonResponse({'detail': "Aucune candidature en attente pour ce poste."}, status=404)
+
+    run = await OptimizationRun.objects.acreate(
+        job_id=job_id, requested_by=request.user, parameters=parameters.validated_data, applications_count=count,
+    )
+    start_run(run)
+    return JsonResponse(_run_payload(run), status=202)
+
+
+@require_GET
+@employer_required
+async def optimization_status(request, run_id):
+    """État courant d'une optimisation (polling)"""
+    run = await _aget_run(request, run_id)
+    if run is None:
+        return JsonResponse({'detail': "Optimisation inexistante."}, status=404)
+    return JsonResponse(_run_payload(run))
+
+
+@require_GET
+@employer_required
+async def optimization_events(request, run_id):
+    """
+    Flux SSE (text/event-stream) : un évènement `status` à chaque changement d'état,
+    jusqu'à la fin de l'optimisation (done ou failed).
+    """
+    run = await _aget_run(request, run_id)
+    if run is None:
+        return JsonResponse({'detail': "Optimisation inexistante."}, status=404)
+
+    async def events(run):
+        last = None
+        while True:
+            payload = _run_payload(run)
+            if payload != last:
+                yield f"event: status\ndata: {json.dumps(payload)}\n\n"
+                last = payload
+            else:
+                yield ": ping\n\n"
+            if run.finished:
+                return
+            await asyncio.sleep(settings.GA_RUN_EVENTS_INTERVAL)
+            run = await aexpire_if_stale(await OptimizationRun.objects.aget(pk=run.pk))
+
+    response = StreamingHttpResponse(events(run), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Pas de mise en mémoire tampon par un proxy nginx
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class VectorizedGeneticAlgorithm:
+    """
+    Algorithme génétique vectorisé (NumPy).
+    ➡️ Même modèle que GeneticAlgorithm, mais la population est un tableau 2-D
+    (individus × candidatures) et les scores AHP un vecteur : le fitness de toute
+    la population est obtenu par un produit matriciel par génération, et la
+    sélection, le croisement et la mutation sont des opérations sur tableaux.
+    """
+
+    def __init__(self, applications, population_size=100, generations=50, mutation_rate=0.1,
+                 elite_size=2, patience=None, seed=None, scores=None, population=None, fitness=None):
+        """
+        elite_size: Nombre de meilleurs individus recopiés tels quels à chaque génération
+        patience: Arrêt anticipé après `patience` générations sans amélioration (None = jamais)
+        scores, population, fitness: Vecteur de scores et population existante (ex: îlots),
+        à la place des candidatures et d'une population aléatoire
+        """
+        self.applications = list(applications)
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite_size = min(elite_size, population_size)
+        self.patience = patience
+        self.rng = np.random.default_rng(seed)
+        self.evaluations = 0
+        self.generations_run = 0
+
+        if scores is None:
+            scores = [application.ahp_score or 0 for application in self.applications]
+        self.scores = np.asarray(scores, dtype=float)
+        self.population = self._initial_population() if population is None else population
+        # Fitness de chaque individu, calculé une seule fois par génération
+        self.fitness = self._fitness(self.population) if fitness is None else fitness
+        self._best_fitness = self.fitness.max()
+        self._stale_generations = 0
+
+    def _initial_population(self):
+        """
+        Population initiale : un individu = un poids aléatoire dans [0, 1) par candidature.
+        """
+        return self.rng.random((self.population_size, len(self.scores)))
+
+    def _fitness(self, population):
+        """
+        Fitness de tous les individus : somme des poids pondérés par les scores AHP.
+        """
+        self.evaluations += len(population)
+        return population @ self.scores
+
+    def _select_parents(self, fitness, count):
+        """
+        Sélection par tournoi : pour chaque parent, le meilleur de deux individus tirés au hasard.
+        """
+        contenders = self.rng.integers(0, len(fitness), size=(count, 2))
+        first, second = contenders[:, 0], contenders[:, 1]
+        winners = np.where(fitness[first] >= fitness[second], first, second)
+        return self.population[winners]
+
+    def _crossover(self, parents1, parents2):
+        """
+        Croisement en un point : chaque enfant reçoit le début du parent 1 et la fin du parent 2.
+        """
+        genes = parents1.shape[1]
+        if genes < 2:
+            return parents1.copy()
+        points = self.rng.integers(1, genes, size=len(parents1))
+        mask = np.arange(genes) < points[:, None]
+        return np.where(mask, parents1, parents2)
+
+    def _mutate(self, population):
+        """
+        Mutation : avec une probabilité `mutation_rate`, un gène de l'individu est redéfini aléatoirement.
+        """
+        mutated = np.flatnonzero(self.rng.random(len(population)) < self.mutation_rate)
+        if len(mutated) and population.shape[1]:
+            points = self.rng.integers(0, population.shape[1], size=len(mutated))
+            population[mutated, points] = self.rng.random(len(mutated))
+        return population
+
+    def evolve(self, generations):
+        """
+        Fait évoluer la population pendant au plus `generations` générations.
+        Retourne False si l'arrêt anticipé (patience) a été atteint.
+        """
+        offspring = self.population_size - self.elite_size
+        pairs = (offspring + 1) // 2
+        for generation in range(generations):
+            # Élitisme : les meilleurs individus sont conservés avec leur fitness
+            elite = np.argsort(self.fitness)[::-1][:self.elite_size]
+
+            parents1 = self._select_parents(self.fitness, pairs)
+            parents2 = self._select_parents(self.fitness, pairs)
+            children = np.concatenate([
+                self._crossover(parents1, parents2),
+                self._crossover(parents2, parents1),
+            ])[:offspring]
+            children = self._mutate(children)
+
+            # Seuls les nouveaux individus sont évalués
+            self.fitness = np.concatenate([self.fitness[elite], self._fitness(children)])
+            self.population = np.concatenate([self.population[elite], children])
+            self.generations_run += 1
+
+            # Arrêt anticipé si le meilleur fitness ne progresse plus
+            if self.fitness.max() > self._best_fitness:
+                self._best_fitness = self.fitness.max()
+                self._stale_generations = 0
+            else:
+                self._stale_generations += 1
+                if self.patience is not None and self._stale_generations >= self.patience:
+                    return False
+        return True
+
+    def run(self):
+        """
+        Exécute l'algorithme génétique puis applique les résultats aux candidatures.
+        Retourne le vecteur des scores AG.
+        """
+        self.evolve(self.generations)
+        return self._apply_results(self.population[np.argmax(self.fitness)])
+
+    def _apply_results(self, best):
+        """
+        Score AG de chaque candidature : sa contribution au fitness du meilleur individu.
+        """
+        ag_scores = best * self.scores
+        for application, ag_score in zip(self.applications, ag_scores):
+            application.ag_score = float(ag_score)
+        return ag_scores
+
+    def save(self, original=None):
+        """
+        Enregistre les scores AG en une seule transaction (écriture groupée).
+        original: Instantané des scores AG avant l'exécution (jobs.persistence.snapshot) :
+        seules les candidatures dont le score a changé sont écrites
+        """
+        # Import local : ce module est aussi chargé par les processus des îlots, sans Django
+        from jobs.persistence import persist_scores
+
+        return persist_scores(self.applications, ['ag_score'], original=original)
@@ -0,0 +1,120 @@
+import random
+import numpy as np
+from jobs.persistence import persist_scores
+
+class GeneticAlgorithm:
+    def __init__(self, applications, population_size=100, generations=50, mutation_rate=0.1,
+                 elite_size=2, patience=None):
+        """
+        Initialise l'algorithme génétique pour optimiser les candidatures.
+        elite_size: Nombre de meilleurs individus recopiés tels quels à chaque génération
+        patience: Arrêt anticipé après `patience` générations sans amélioration (None = jamais)
+        """
+        self.applications = list(applications)
+        self.population_size = population_size
+        self.generations = generations
+        self.mutation_rate = mutation_rate
+        self.elite_size = min(elite_size, population_size)
+        self.patience = patience
+        self.evaluations = 0
+        self.generations_run = 0
+        self.population = self._initial_population()
+        # Fitness de chaque individu, calculé une seule fois par génération
+        self.fitness = [self._fitness(individual) for individual in self.population]
+
+    def _initial_population(self):
+        """
+        Crée la population initiale des candidatures (c'est-à-dire une population d'individus)
+        basée sur les candidatures existantes.
+        """
+        population = []
+        for _ in range(self.population_size):
+            individual = [random.uniform(0, 1) for _ in range(len(self.applications))]
+            population.append(individual)
+        return population
+
+    def _fitness(self, individual):
+        """
+        Calcule le fitness d'un individu dans la population, basé sur les scores AHP.
+        """
+        self.evaluations += 1
+        fitness = 0
+        for idx, score in enumerate(individual):
+            fitness += score * self.applications[idx].ahp_score  # Pondération par le score AHP
+        return fitness
+
+    def _select_parents(self):
+        """
+        Sélectionne deux parents pour la reproduction en utilisant un tournoi.
+        Le fitness déjà calculé de la génération courante est réutilisé.
+        """
+        first, second = random.sample(range(len(self.population)), 2)
+        winner = first if self.fitness[first] >= self.fitness[second] else second
+        return self.population[winner]
+
+    def _crossover(self, parent1, parent2):
+        """
+        Croisement entre deux parents pour produire un enfant.
+        """
+        # Moins de deux gènes : aucun point de croisement possible, l'enfant est une copie du parent 1
+        if len(parent1) < 2:
+            return list(parent1)
+        crossover_point = random.randint(1, len(parent1) - 1)
+        child = parent1[:crossover_point] + parent2[crossover_point:]
+        return child
+
+    def _mutate(self, individual):
+        """
+        Applique une mutation sur un individu avec une certaine probabilité.
+        """
+        if random.random() < self.mutation_rate:
+            mutation_point = random.randint(0, len(individual) - 1)
+            individual[mutation_point] = random.uniform(0, 1)
+        return individual
+
+    def run(self):
+        """
+        Exécute l'algorithme génétique.
+        """
+        best_fitness = max(self.fitness)
+        stale_generations = 0
+        for generation in range(self.generations):
+            # Élitisme : les meilleurs individus sont conservés avec leur fitness
+            elite = sorted(range(len(self.population)), key=self.fitness.__getitem__, reverse=True)[:self.elite_size]
+            new_population = [self.population[idx] for idx in elite]
+            new_fitness = [self.fitness[idx] for idx in elite]
+
+            while len(new_population) < self.population_size:
+                parent1 = self._select_parents()
+                parent2 = self._select_parents()
+                for child in (self._crossover(parent1, parent2), self._crossover(parent2, parent1)):
+                    if len(new_population) < self.population_size:
+                        child = self._mutate(child)
+                        new_population.append(child)
+                        new_fitness.append(self._fitness(child))
+            self.population = new_population
+            self.fitness = new_fitness
+            self.generations_run = generation + 1
+
+            # Arrêt anticipé si le meilleur fitness ne progresse plus
+            if max(self.fitness) > best_fitness:
+                best_fitness = max(self.fitness)
+                stale_generations = 0
+            else:
+                stale_generations += 1
+                if self.patience is not None and stale_generations >= self.patience:
+                    break
+
+        # Applique les résultats de l'algorithme génétique aux candidatures :
+        # contribution de chaque candidature au fitness du meilleur individu
+        best = self.population[self.fitness.index(max(self.fitness))]
+        for idx, application in enumerate(self.applications):
+            application.ag_score = best[idx] * application.ahp_score
+
+    def save(self, original=None):
+        """
+        Enregistre les scores AG en une seule transaction (écriture groupée).
+        original: Instantané des scores AG avant l'exécution (jobs.persistence.snapshot) :
+        seules les candidatures dont le score a changé sont écrites
+        """
+        return persist_scores(self.applications, ['ag_score'], original=original)
@@ -0,0 +1,161 @@
+"""
+Algorithme génétique en îlots, exécuté en parallèle sur plusieurs cœurs.
+➡️ Chaque îlot est une sous-population qui évolue indépendamment dans un
+processus du pool. Toutes les `migration_interval` générations, les meilleurs
+individus de chaque îlot remplacent les moins bons de l'îlot suivant (anneau).
+Les scores AHP, les populations et leurs fitness sont placés en mémoire
+partagée : ils ne sont jamais sérialisés entre le processus principal et les
+workers, seuls les paramètres d'une époque transitent.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .engine import VectorizedGeneticAlgorithm
+
+
+# Tableaux partagés, attachés une seule fois par processus du pool
+_shared = {}
+
+
+def _attach(blocks):
+    """Initialisation d'un worker : ouverture des blocs de mémoire partagée"""
+    for name, (shm_name, shape) in blocks.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _shared[name] = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+
+
+def _evolve_island(island, generations, seed, parameters):
+    """
+    Fait évoluer un îlot pendant une époque, directement dans la mémoire partagée.
+    Retourne le nombre d'évaluations effectuées.
+    """
+    scores = _shared['scores'][1]
+    populations = _shared['populations'][1]
+    fitness = _shared['fitness'][1]
+
+    ga = VectorizedGeneticAlgorithm(
+        [], seed=seed, scores=scores,
+        population=populations[island].copy(), fitness=fitness[island].copy(),
+        **parameters,
+    )
+    ga.evolve(generations)
+    populations[island] = ga.population
+    fitness[island] = ga.fitness
+    return ga.evaluations
+
+
+class IslandGeneticAlgorithm:
+    """
+    Même interface que VectorizedGeneticAlgorithm (run, save, generations_run, evaluations).
+    population_size est la taille de chaque îlot.
+    """
+
+    def __init__(self, applications, islands=4, migration_interval=10, migrants=2, population_size=100,
+                 generations=50, mutation_rate=0.1, elite_size=2, patience=None, max_workers=None, seed=None):
+        self.applications = list(applications)
+        self.islands = islands
+        self.migration_interval = migration_interval
+        self.migrants = min(migrants, population_size)
+        self.population_size = population_size
+        self.generations = generations
+        self.patience = patience
+        self.max_workers = max_workers or min(islands, multiprocessing.cpu_count())
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.parameters = {
+            'population_size': population_size,
+            'mutation_rate': mutation_rate,
+            'elite_size': elite_size,
+        }
+        self.evaluations = 0
+        self.generations_run = 0
+        self.scores = np.array([application.ahp_score or 0 for application in self.applications], dtype=float)
+
+    def _allocate(self, name, shape):
+        shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 8, 1))
+        self._blocks[name] = (shm, np.ndarray(shape, dtype=float, buffer=shm.buf))
+        return self._blocks[name][1]
+
+    def _migrate(self, populations, fitness):
+        """
+        Migration en anneau : les meilleurs individus de l'îlot i remplacent les moins bons de l'îlot i + 1.
+        """
+        order = np.argsort(fitness, axis=1)
+        best = order[:, ::-1][:, :self.migrants]
+        worst = order[:, :self.migrants]
+        emigrants = np.take_along_axis(populations, best[:, :, None], axis=1)
+        emigrant_fitness = np.take_along_axis(fitness, best, axis=1)
+        for island in range(self.islands):
+            target = (island + 1) % self.islands
+            populations[target, worst[target]] = emigrants[island]
+            fitness[target, worst[target]] = emigrant_fitness[island]
+
+    def run(self):
+        """
+        Exécute l'algorithme génétique sur tous les îlots puis applique les résultats aux candidatures.
+        Retourne le vecteur des scores AG.
+        """
+        self._blocks = {}
+        try:
+            scores = self._allocate('scores', self.scores.shape)
+            scores[:] = self.scores
+            populations = self._allocate('populations', (self.islands, self.population_size, len(self.scores)))
+            populations[:] = np.random.default_rng(self.seed_sequence.spawn(1)[0]).random(populations.shape)
+            fitness = self._allocate('fitness', (self.islands, self.population_size))
+            fitness[:] = populations @ self.scores
+            self.evaluations += fitness.size
+
+            blocks = {name: (shm.name, array.shape) for name, (shm, array) in self._blocks.items()}
+            best_fitness = fitness.max()
+            stale_epochs = 0
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_attach,
+                initargs=(blocks,),
+            ) as executor:
+                while self.generations_run < self.generations:
+                    epoch = min(self.migration_interval, self.generations - self.generations_run)
+                    seeds = self.seed_sequence.spawn(self.islands)
+                    futures = [
+                        executor.submit(_evolve_island, island, epoch, seeds[island], self.parameters)
+                        for island in range(self.islands)
+                    ]
+                    self.evaluations += sum(future.result() for future in futures)
+                    self.generations_run += epoch
+                    self._migrate(populations, fitness)
+
+                    # Arrêt anticipé (en générations) si le meilleur fitness global ne progresse plus
+                    if fitness.max() > best_fitness:
+                        best_fitness = fitness.max()
+                        stale_epochs = 0
+                    else:
+                        stale_epochs += 1
+                        if self.patience is not None and stale_epochs * self.migration_interval >= self.patience:
+                            break
+
+            island, individual = np.unravel_index(np.argmax(fitness), fitness.shape)
+            best = populations[island, individual].copy()
+        finally:
+            for shm, _ in self._blocks.values():
+                shm.close()
+                shm.unlink()
+            self._blocks = {}
+
+        ag_scores = best * self.scores
+        for application, ag_score in zip(self.applications, ag_scores):
+            application.ag_score = float(ag_score)
+        return ag_scores
+
+    def save(self, original=None):
+        """
+        Enregistre les scores AG en une seule transaction (écriture groupée).
+        original: Instantané des scores AG avant l'exécution (jobs.persistence.snapshot) :
+        seules les candidatures dont le score a changé sont écrites
+        """
+        # Import local : ce module est aussi chargé par les processus des îlots, sans Django
+        from jobs.persistence import persist_scores
+
+        return persist_scores(self.applications, ['ag_score'], original=original)
@@ -0,0 +1,61 @@
+import random
+import time
+from types import SimpleNamespace
+
+from django.core.management.base import BaseCommand
+
+from ga_optimization.engine import VectorizedGeneticAlgorithm
+from ga_optimization.genetic_algorithm import GeneticAlgorithm
+from ga_optimization.islands import IslandGeneticAlgorithm
+
+
+class Command(BaseCommand):
+    help = "Compare GeneticAlgorithm (listes Python) et VectorizedGeneticAlgorithm (NumPy) sans accès à la base"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000], help="Nombres de candidatures")
+        parser.add_argument('--population-size', type=int, default=100)
+        parser.add_argument('--generations', type=int, default=50)
+        parser.add_argument('--skip-legacy-above', type=int, default=None,
+                            help="Ne pas exécuter GeneticAlgorithm au-delà de ce nombre de candidatures")
+        parser.add_argument('--islands', type=int, default=0,
+                            help="Mesure aussi le mode îlots (N îlots de --population-size individus, un processus par îlot)")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        params = {
+            'population_size': options['population_size'],
+            'generations': options['generations'],
+        }
+
+        self.stdout.write(f"{'candidatures':>12} {'listes (s)':>11} {'numpy (s)':>10} {'gain':>8}")
+        for size in options['sizes']:
+            applications = [
+                # Candidatures factices : la sauvegarde n'est pas mesurée
+                SimpleNamespace(ahp_score=rng.uniform(0, 100), ag_score=None)
+                for _ in range(size)
+            ]
+
+            start = time.perf_counter()
+            VectorizedGeneticAlgorithm(applications, seed=options['seed'], **params).run()
+            vectorized = time.perf_counter() - start
+
+            if options['islands']:
+                start = time.perf_counter()
+                IslandGeneticAlgorithm(applications, islands=options['islands'], seed=options['seed'], **params).run()
+                self.stdout.write(
+                    f"{size:>12} îlots x{options['islands']} : {time.perf_counter() - start:.3f} s "
+                    f"({options['islands']}x plus d'individus évalués)"
+                )
+
+            if options['skip_legacy_above'] is not None and size > options['skip_legacy_above']:
+                self.stdout.write(f"{size:>12} {'-':>11} {vectorized:>10.3f} {'-':>8}")
+                continue
+
+            random.seed(options['seed'])
+            start = time.perf_counter()
+            GeneticAlgorithm(applications, **params).run()
+            legacy = time.perf_counter() - start
+
+            self.stdout.write(f"{size:>12} {legacy:>11.3f} {vectorized:>10.3f} {legacy / vectorized:>7.1f}x")
@@ -1,3 +1,51 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from jobs.models import Job
+
+
+"""
+Exécution en arrière-plan de l'algorithme génétique sur les candidatures d'une offre.
+➡️ Créée par l'API asynchrone (POST /api/ga/<job_id>/runs/), suivie par
+GET /api/ga/runs/<id>/ (polling) ou /api/ga/runs/<id>/events/ (SSE).
+    status → queued, running, done ou failed
+    parameters → Paramètres validés de l'algorithme (GAParametersSerializer)
+    generations_run, evaluations → Résultats de l'exécution
+    heartbeat_at → Dernier signe de vie du processus qui exécute l'optimisation
+"""
+
+class OptimizationRun(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='optimization_runs'
+    )
+    requested_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='optimization_runs'
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    parameters = models.JSONField(default=dict)
+    applications_count = models.IntegerField(default=0)
+    generations_run = models.IntegerField(default=0)
+    evaluations = models.IntegerField(default=0)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+
+    @property
+    def finished(self):
+        return self.status in ('done', 'failed')
+
+    def __str__(self):
+        return f"Optimisation {self.pk} - {self.job.title} ({self.status})"
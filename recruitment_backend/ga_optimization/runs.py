@@ -0,0 +1,105 @@
+"""
+Exécution en arrière-plan des optimisations (OptimizationRun).
+➡️ La vue asynchrone crée l'exécution puis rend la main immédiatement (202) ;
+l'algorithme génétique tourne dans le pool de recruitment_backend.async_utils
+et enregistre son état (running, done, failed) au fil de l'exécution.
+➡️ Le pool n'existe que dans le processus qui a lancé l'optimisation : ce processus
+met à jour heartbeat_at de ses optimisations toutes les GA_RUN_HEARTBEAT_INTERVAL
+secondes. Une optimisation non terminée sans signe de vie depuis GA_RUN_STALE_TIMEOUT
+(processus arrêté ou redémarré) est marquée failed à sa lecture.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from jobs.models import CandidateApplication
+from recruitment_backend.async_utils import submit
+from .models import OptimizationRun
+from .views import run_genetic_algorithm
+
+logger = logging.getLogger(__name__)
+
+STALE_ERROR = "Optimisation interrompue : le processus qui l'exécutait s'est arrêté."
+
+# Optimisations en attente ou en cours dans ce processus
+_owned = set()
+_owned_lock = threading.Lock()
+_heartbeat_thread = None
+
+
+def execute_run(run_id):
+    """Exécute une optimisation (code synchrone, appelé dans un thread du pool)"""
+    runs = OptimizationRun.objects.filter(pk=run_id)
+    try:
+        run = runs.get()
+        runs.update(status='running', started_at=timezone.now(), heartbeat_at=timezone.now())
+        applications = CandidateApplication.objects.filter(job_id=run.job_id, status='pending').select_related('candidate__user')
+        ga = run_genetic_algorithm(applications, run.parameters)
+        runs.update(
+            status='done', applications_count=len(ga.applications), generations_run=ga.generations_run,
+            evaluations=ga.evaluations, finished_at=timezone.now(),
+        )
+    except Exception as exc:
+        logger.exception("Échec de l'optimisation %s", run_id)
+        runs.update(status='failed', error=str(exc), finished_at=timezone.now())
+    finally:
+        with _owned_lock:
+            _owned.discard(run_id)
+
+
+def heartbeat():
+    """Signe de vie des optimisations de ce processus. Retourne le nombre d'optimisations mises à jour."""
+    with _owned_lock:
+        run_ids = list(_owned)
+    if not run_ids:
+        return 0
+    return OptimizationRun.objects.filter(pk__in=run_ids, status__in=('queued', 'running')).update(
+        heartbeat_at=timezone.now()
+    )
+
+
+def _heartbeat_loop():
+    while True:
+        time.sleep(settings.GA_RUN_HEARTBEAT_INTERVAL)
+        try:
+            heartbeat()
+        except Exception:
+            logger.exception("Échec de la mise à jour des optimisations en cours")
+        finally:
+            connections.close_all()
+
+
+def _ensure_heartbeat():
+    global _heartbeat_thread
+    with _owned_lock:
+        if _heartbeat_thread is None or not _heartbeat_thread.is_alive():
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name='ga-run-heartbeat', daemon=True)
+            _heartbeat_thread.start()
+
+
+def start_run(run):
+    """Lance l'optimisation en arrière-plan"""
+    with _owned_lock:
+        _owned.add(run.pk)
+    _ensure_heartbeat()
+    return submit(execute_run, run.pk)
+
+
+def stale_runs():
+    """Optimisations non terminées dont le processus ne donne plus signe de vie"""
+    limit = timezone.now() - timedelta(seconds=settings.GA_RUN_STALE_TIMEOUT)
+    return OptimizationRun.objects.filter(status__in=('queued', 'running'), heartbeat_at__lt=limit)
+
+
+async def aexpire_if_stale(run):
+    """Marque failed une optimisation interrompue ; retourne l'optimisation à jour"""
+    if run.finished or not await stale_runs().filter(pk=run.pk).aupdate(
+        status='failed', error=STALE_ERROR, finished_at=timezone.now(),
+    ):
+        return run
+    return await OptimizationRun.objects.aget(pk=run.pk)
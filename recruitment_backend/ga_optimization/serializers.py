@@ -1,7 +1,34 @@
 from rest_framework import serializers
 from jobs.models import CandidateApplication
+from .models import OptimizationRun
 
 class CandidateApplicationSerializer(serializers.ModelSerializer):
     class Meta:
         model = CandidateApplication
-        fields = ['candidate', 'score_ahp', 'score_ga', 'rank', 'status']
+        fields = ['candidate', 'ahp_score', 'ag_score', 'rank', 'status']
+
+class GAParametersSerializer(serializers.Serializer):
+    """Paramètres optionnels de l'algorithme génétique (corps de la requête POST)"""
+    population_size = serializers.IntegerField(min_value=2, max_value=10000, default=100)
+    generations = serializers.IntegerField(min_value=1, max_value=10000, default=50)
+    mutation_rate = serializers.FloatField(min_value=0, max_value=1, default=0.1)
+    elite_size = serializers.IntegerField(min_value=0, default=2)
+    patience = serializers.IntegerField(min_value=1, required=False, allow_null=True, default=10)
+    # Mode îlots : plusieurs sous-populations évoluent en parallèle (1 = un seul processus)
+    islands = serializers.IntegerField(min_value=1, max_value=64, default=1)
+    migration_interval = serializers.IntegerField(min_value=1, default=10)
+    migrants = serializers.IntegerField(min_value=0, default=2)
+
+    def validate(self, attrs):
+        if attrs['elite_size'] >= attrs['population_size']:
+            raise serializers.ValidationError({'elite_size': "Doit être inférieur à la taille de la population."})
+        return attrs
+
+
+class OptimizationRunSerializer(serializers.ModelSerializer):
+    """État d'une optimisation en arrière-plan (aucune requête : utilisable dans une vue async)"""
+    class Meta:
+        model = OptimizationRun
+        fields = ['id', 'job', 'status', 'parameters', 'applications_count', 'generations_run',
+                  'evaluations', 'error', 'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
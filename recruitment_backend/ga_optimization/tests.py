@@ -0,0 +1,106 @@
+import random
+from multiprocessing import shared_memory
+from types import SimpleNamespace
+
+from django.test import SimpleTestCase
+
+from .engine import VectorizedGeneticAlgorithm
+from .genetic_algorithm import GeneticAlgorithm
+from .islands import IslandGeneticAlgorithm
+
+
+def fake_applications(scores):
+    # Candidatures factices : seuls ahp_score et ag_score sont utilisés par l'algorithme
+    return [SimpleNamespace(ahp_score=score, ag_score=None) for score in scores]
+
+
+class TrackedIslandGeneticAlgorithm(IslandGeneticAlgorithm):
+    """Retient le nom des blocs de mémoire partagée alloués"""
+
+    def _allocate(self, name, shape):
+        array = super()._allocate(name, shape)
+        self.allocated.append(self._blocks[name][0].name)
+        return array
+
+
+class IslandGeneticAlgorithmTest(SimpleTestCase):
+    """
+    Îlots parallèles : scores AG appliqués, compteurs tenus, mémoire partagée toujours libérée.
+    """
+
+    SCORES = [10, 80, 35, 60, 95]
+
+    def build(self):
+        ga = TrackedIslandGeneticAlgorithm(
+            fake_applications(self.SCORES), islands=2, migration_interval=2, migrants=1,
+            population_size=6, generations=5, max_workers=2, seed=7,
+        )
+        ga.allocated = []
+        return ga
+
+    def assertReleased(self, names):
+        self.assertEqual(len(names), 3)
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+    def test_run(self):
+        ga = self.build()
+        ag_scores = ga.run()
+
+        self.assertEqual([application.ag_score for application in ga.applications], ag_scores.tolist())
+        for application in ga.applications:
+            self.assertTrue(0 <= application.ag_score <= application.ahp_score)
+        # Époques de 2, 2 puis 1 génération
+        self.assertEqual(ga.generations_run, 5)
+        # Populations initiales, puis 4 enfants évalués par îlot et par génération (2 élites conservées)
+        self.assertEqual(ga.evaluations, 2 * 6 + 2 * 5 * 4)
+        self.assertReleased(ga.allocated)
+
+    def test_shared_memory_is_released_when_a_worker_fails(self):
+        ga = self.build()
+        # Paramètre inconnu : VectorizedGeneticAlgorithm lève TypeError dans le worker
+        ga.parameters['unknown'] = True
+        with self.assertRaises(TypeError):
+            ga.run()
+        self.assertReleased(ga.allocated)
+        self.assertEqual([application.ag_score for application in ga.applications], [None] * len(self.SCORES))
+
+
+class VectorizedGeneticAlgorithmTest(SimpleTestCase):
+    """
+    Version vectorisée : élitisme, arrêt anticipé et offres à une seule candidature.
+    """
+
+    SCORES = [10, 80, 35, 60, 95, 20, 45]
+
+    def test_best_fitness_never_decreases(self):
+        ga = VectorizedGeneticAlgorithm(fake_applications(self.SCORES), population_size=20, seed=3)
+        best = [ga.fitness.max()]
+        for _ in range(30):
+            ga.evolve(1)
+            best.append(ga.fitness.max())
+        self.assertEqual(best, sorted(best))
+        self.assertEqual(ga.generations_run, 30)
+
+    def test_patience_stops_early(self):
+        # Scores nuls : le fitness ne progresse jamais
+        ga = VectorizedGeneticAlgorithm(fake_applications([0] * 5), population_size=10, generations=50, patience=3, seed=3)
+        self.assertFalse(ga.evolve(ga.generations))
+        self.assertEqual(ga.generations_run, 3)
+        # Population initiale, puis 8 enfants évalués par génération
+        self.assertEqual(ga.evaluations, 10 + 3 * 8)
+
+    def test_single_application(self):
+        applications = fake_applications([42])
+        ga = VectorizedGeneticAlgorithm(applications, population_size=6, generations=5, seed=3)
+        ag_scores = ga.run()
+        self.assertEqual(ag_scores.shape, (1,))
+        self.assertTrue(0 <= applications[0].ag_score <= 42)
+        self.assertEqual(ga.generations_run, 5)
+
+    def test_legacy_single_application(self):
+        applications = fake_applications([42])
+        random.seed(3)
+        GeneticAlgorithm(applications, population_size=6, generations=5).run()
+        self.assertTrue(0 <= applications[0].ag_score <= 42)
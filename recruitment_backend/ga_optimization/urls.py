@@ -0,0 +1,13 @@
+from django.urls import path
+from .views import GAOptimizationView, OptimizeApplicationsView, GetOptimizedApplicationsView
+from . import async_views
+
+urlpatterns = [
+    path('ga/<int:job_id>/run/', GAOptimizationView.as_view(), name='ga-optimization'),
+    path('ga/<int:job_id>/optimize/', OptimizeApplicationsView.as_view(), name='ga-optimize'),
+    path('ga/<int:job_id>/applications/', GetOptimizedApplicationsView.as_view(), name='ga-applications'),
+    # Optimisation en arrière-plan (vues asynchrones, ASGI)
+    path('ga/<int:job_id>/runs/', async_views.start_optimization, name='ga-run-start'),
+    path('ga/runs/<int:run_id>/', async_views.optimization_status, name='ga-run-status'),
+    path('ga/runs/<int:run_id>/events/', async_views.optimization_events, name='ga-run-events'),
+]
@@ -1,55 +1,109 @@
+from django.shortcuts import get_object_or_404
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from .models import CandidateApplication
-from .genetic_algorithm import GeneticAlgorithm
+from rest_framework.permissions import IsAuthenticated
+from jobs.models import CandidateApplication, Job
+from jobs.persistence import snapshot
+from users.permissions import IsEmployer
+from .engine import VectorizedGeneticAlgorithm
+from .islands import IslandGeneticAlgorithm
+from .serializers import CandidateApplicationSerializer, GAParametersSerializer
+
+def build_genetic_algorithm(applications, parameters):
+    """
+    Crée l'algorithme génétique demandé : îlots parallèles si `islands` > 1, sinon version vectorisée.
+    """
+    parameters = dict(parameters)
+    islands = parameters.pop('islands')
+    migration_interval = parameters.pop('migration_interval')
+    migrants = parameters.pop('migrants')
+    if islands > 1:
+        return IslandGeneticAlgorithm(
+            applications, islands=islands, migration_interval=migration_interval, migrants=migrants, **parameters
+        )
+    return VectorizedGeneticAlgorithm(applications, **parameters)
+
+
+def run_genetic_algorithm(applications, parameters):
+    """
+    Exécute l'algorithme génétique puis enregistre les scores AG.
+    Seules les candidatures dont le score AG a changé sont réécrites.
+    """
+    applications = list(applications)
+    original = snapshot(applications, ['ag_score'])
+    ga = build_genetic_algorithm(applications, parameters)
+    ga.run()
+    ga.save(original=original)
+    return ga
+
 
 class GAOptimizationView(APIView):
     """
     Vue API pour appliquer l'optimisation des candidatures via l'algorithme génétique.
     """
+    permission_classes = [IsAuthenticated, IsEmployer]
+
     def post(self, request, job_id):
+        parameters = GAParametersSerializer(data=request.data)
+        parameters.is_valid(raise_exception=True)
+
+        # Seul l'employeur propriétaire de l'offre peut l'optimiser
+        job = get_object_or_404(Job, id=job_id, employer__user=request.user)
+
         # Récupère toutes les candidatures pour un job donné
-        applications = CandidateApplication.objects.filter(job_id=job_id, status='pending')
+        applications = CandidateApplication.objects.filter(job=job, status='pending').select_related('candidate__user')
         
         if not applications:
             return Response({"detail": "Aucune candidature en attente pour ce poste."}, status=status.HTTP_404_NOT_FOUND)
         
         # Exécute l'algorithme génétique pour optimiser les candidatures
-        ga = GeneticAlgorithm(applications)
-        ga.run()
+        ga = run_genetic_algorithm(applications, parameters.validated_data)
 
         # Retourne les candidatures optimisées avec leur score AG mis à jour
         optimized_applications = [
             {
                 "candidate": app.candidate.user.username,
-                "score_ahp": app.score_ahp,
-                "score_ga": app.score_ga,
+                "ahp_score": app.ahp_score,
+                "ag_score": app.ag_score,
                 "rank": app.rank,
                 "status": app.status,
             }
-            for app in applications
+            for app in ga.applications
         ]
 
-        return Response(optimized_applications, status=status.HTTP_200_OK)
-
+        return Response({
+            "generations": ga.generations_run,
+            "evaluations": ga.evaluations,
+            "applications": optimized_applications,
+        }, status=status.HTTP_200_OK)
 
-from .genetic_algorithm import GeneticAlgorithm
-from rest_framework import status
 
 class OptimizeApplicationsView(APIView):
+    permission_classes = [IsAuthenticated, IsEmployer]
+
     def post(self, request, job_id):
-        applications = CandidateApplication.objects.filter(job_id=job_id, status='pending')
+        parameters = GAParametersSerializer(data=request.data)
+        parameters.is_valid(raise_exception=True)
+
+        job = get_object_or_404(Job, id=job_id, employer__user=request.user)
+        applications = CandidateApplication.objects.filter(job=job, status='pending')
         if not applications:
             return Response({"detail": "Aucune candidature en attente."}, status=status.HTTP_404_NOT_FOUND)
 
-        ga = GeneticAlgorithm(applications)
-        ga.run()
+        ga = run_genetic_algorithm(applications, parameters.validated_data)
 
-        return Response({"detail": "Optimisation effectuée."}, status=status.HTTP_200_OK)
+        return Response({
+            "detail": "Optimisation effectuée.",
+            "generations": ga.generations_run,
+            "evaluations": ga.evaluations,
+        }, status=status.HTTP_200_OK)
 
 class GetOptimizedApplicationsView(APIView):
+    permission_classes = [IsAuthenticated, IsEmployer]
+
     def get(self, request, job_id):
-        applications = CandidateApplication.objects.filter(job_id=job_id)
+        job = get_object_or_404(Job, id=job_id, employer__user=request.user)
+        applications = CandidateApplication.objects.filter(job=job)
         serializer = CandidateApplicationSerializer(applications, many=True)
         return Response(serializer.data)
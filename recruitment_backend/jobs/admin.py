@@ -1,7 +1,8 @@
 from django.contrib import admin
-from .models import  CandidateApplication, Constraint, SkillRequirement, Job 
+from .models import  CandidateApplication, Constraint, SkillRequirement, Job, ScoringTask, JobStats
 admin.site.register(CandidateApplication)
 admin.site.register(Constraint)
 admin.site.register(SkillRequirement)
 admin.site.register(Job)
-
+admin.site.register(ScoringTask)
+admin.site.register(JobStats)
@@ -1,44 +1,135 @@
-def calculate_candidate_score(candidate, job):
-    total_score = 0
-    weight_sum = 0
+import threading
+
+from data_normalization.features import get_features
+from data_normalization.vocabulary import get_vocabulary, intern_terms, unpack_terms
+
+
+# Valeurs attribuées (trouvé, absent) pour chaque type de critère
+HARD_VALUES = (1, 0)
+SOFT_VALUES = (0.8, 0.2)
+SKILL_VALUES = (1, 0)
+
+
+class JobScoringPlan:
+    """
+    Plan de scoring compilé pour une offre d'emploi.
+    ➡️ Les contraintes et compétences sont lues une seule fois puis stockées
+    dans des tableaux plats (identifiants de compétences normalisées, poids,
+    valeurs) : le score d'un candidat est une intersection entre ces identifiants
+    et les compétences calculées à l'écriture de son profil (CandidateFeatures).
+    """
+
+    def __init__(self, job):
+        self.job_id = job.pk
+        self.updated_at = job.updated_at
+        self.needles = []
+        self.weights = []
+        self.hit_values = []
+        self.miss_values = []
+        # Indices des contraintes hard (filtres de la recherche de candidats)
+        self.hard = []
+
+        # Contraintes (Hard + Soft)
+        for constraint in job.constraints.all():
+            hit, miss = HARD_VALUES if constraint.type == 'hard' else SOFT_VALUES
+            if constraint.type == 'hard':
+                self.hard.append(len(self.needles))
+            self._add(constraint.value, constraint.weight, hit, miss)
+
+        # Compétences techniques
+        for skill in job.skill_requirements.all():
+            hit, miss = SKILL_VALUES
+            self._add(skill.name, skill.weight, hit, miss)
+
+        self.weight_sum = sum(self.weights)
+        # Critères convertis une seule fois en identifiants (None : critère sans aucun mot)
+        self.terms = intern_terms(self.needles)
+        vocabulary = get_vocabulary()
+        self.vocabulary_version = vocabulary.version
+        # Les caractéristiques des candidats doivent connaître tous les alias de ces critères
+        self.required_version = vocabulary.required_version(self.terms)
+
+    def _add(self, needle, weight, hit, miss):
+        self.needles.append(needle)
+        self.weights.append(weight)
+        self.hit_values.append(hit)
+        self.miss_values.append(miss)
+
+    def score_terms(self, terms):
+        """Calcule le score (0-100) à partir des identifiants de compétences d'un candidat"""
+        if self.weight_sum == 0:
+            return 0
+
+        terms = set(terms)
+        total_score = 0
+        for idx, weight in enumerate(self.weights):
+            found = self.terms[idx] is None or self.terms[idx] in terms
+            total_score += (self.hit_values[idx] if found else self.miss_values[idx]) * weight
 
-    # Évaluation des contraintes (Hard + Soft)
-    for constraint in job.constraints.all():
-        if constraint.type == 'hard':
-            # Les hard skills doivent être obligatoires → Si manquante, score très faible
-            value = 1 if meets_hard_criteria(candidate, constraint) else 0
-        else:
-            # Soft skills → Calcul en fonction du poids
-            value = evaluate_soft_criteria(candidate, constraint)
+        return round((total_score / self.weight_sum) * 100, 2)
 
-        total_score += value * constraint.weight
-        weight_sum += constraint.weight
+    def score(self, text):
+        """Calcule le score (0-100) d'un texte (ex: bio du candidat)"""
+        return self.score_terms(get_vocabulary().tokenize(text))
 
-    # Évaluation des compétences techniques
-    for skill in job.skill_requirements.all():
-        value = evaluate_skill_match(candidate, skill)
-        total_score += value * skill.weight
-        weight_sum += skill.weight
+    def score_candidates(self, candidates):
+        """Scores des candidats (profils), à partir de leurs caractéristiques précalculées : {id du profil: score}"""
+        features = get_features(candidates, self.required_version)
+        return {candidate_id: self.score_terms(unpack_terms(feature.terms)) for candidate_id, feature in features.items()}
 
-    if weight_sum == 0:
-        return 0
 
-    return round((total_score / weight_sum) * 100, 2)
+# Cache des plans compilés par offre (clé : id du job)
+_plans = {}
+_plans_lock = threading.Lock()
+
+
+def get_scoring_plan(job):
+    """
+    Retourne le plan de scoring de l'offre, en le compilant si nécessaire.
+    Le plan est reconstruit si l'offre a été modifiée depuis (updated_at),
+    ou si des alias ont été ajoutés au vocabulaire.
+    """
+    with _plans_lock:
+        plan = _plans.get(job.pk)
+    if plan is not None and plan.updated_at == job.updated_at and plan.vocabulary_version == get_vocabulary().version:
+        return plan
+
+    plan = JobScoringPlan(job)
+    with _plans_lock:
+        _plans[job.pk] = plan
+    return plan
+
+
+def invalidate_scoring_plan(job):
+    """Supprime le plan compilé d'une offre (après modification de ses critères)"""
+    with _plans_lock:
+        _plans.pop(job.pk, None)
+
+
+def calculate_candidate_score(candidate, job):
+    return get_scoring_plan(job).score_candidates([candidate])[candidate.pk]
+
+
+def _has_term(candidate, text):
+    """Vrai si le candidat possède la compétence désignée par `text`"""
+    term = intern_terms([text])[0]
+    if term is None:
+        return True
+    required_version = get_vocabulary().required_version([term])
+    return term in unpack_terms(get_features([candidate], required_version)[candidate.pk].terms)
 
 def meets_hard_criteria(candidate, constraint):
     # Exemple : Vérification de l'expérience professionnelle dans le CV
-    if constraint.value.lower() in candidate.bio.lower():
-        return True
-    return False
+    return _has_term(candidate, constraint.value)
 
 def evaluate_soft_criteria(candidate, constraint):
     # Exemple : Vérification des compétences douces (adaptabilité, communication)
-    if constraint.value.lower() in candidate.bio.lower():
-        return 0.8
-    return 0.2
+    if _has_term(candidate, constraint.value):
+        return SOFT_VALUES[0]
+    return SOFT_VALUES[1]
 
 def evaluate_skill_match(candidate, skill):
     # Exemple : Vérification des compétences techniques dans le CV
-    if skill.name.lower() in candidate.bio.lower():
+    if _has_term(candidate, skill.name):
         return 1
     return 0
@@ -0,0 +1,39 @@
+"""
+Vues asynchrones (ASGI) du scoring et du classement des candidatures d'une offre.
+➡️ Les lectures de contrôle passent par l'ORM asynchrone ; le scoring et le
+classement (calcul + écritures groupées) sont exécutés dans le pool de
+recruitment_backend.async_utils sans bloquer la boucle d'événements.
+"""
+from django.http import JsonResponse
+from django.views.decorators.http import require_POST
+
+from recruitment_backend.async_utils import employer_required, offload
+from .models import Job
+from .ranking import rerank_job
+from .scoring_queue import score_pending_applications
+
+
+async def _aget_job(request, job_id):
+    return await Job.objects.filter(id=job_id, employer__user=request.user).afirst()
+
+
+@require_POST
+@employer_required
+async def score_job(request, job_id):
+    """Calcule immédiatement le score des candidatures 'pending-score' de l'offre puis son classement"""
+    job = await _aget_job(request, job_id)
+    if job is None:
+        return JsonResponse({'detail': "Offre d'emploi inexistante."}, status=404)
+    scored = await offload(score_pending_applications, job)
+    return JsonResponse({'scored': scored})
+
+
+@require_POST
+@employer_required
+async def rerank(request, job_id):
+    """Recalcule le classement complet des candidatures de l'offre"""
+    job = await _aget_job(request, job_id)
+    if job is None:
+        return JsonResponse({'detail': "Offre d'emploi inexistante."}, status=404)
+    updated = await offload(rerank_job, job)
+    return JsonResponse({'updated': updated})
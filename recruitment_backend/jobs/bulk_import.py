@@ -0,0 +1,198 @@
+"""
+Import en masse d'offres et de candidatures depuis un fichier CSV ou JSONL.
+➡️ Le fichier est lu ligne par ligne (jamais chargé en entier) et traité par lots
+de IMPORT_BATCH_SIZE lignes : validation de chaque ligne, puis insertion groupée
+(bulk_create) du lot dans une transaction. Une ligne invalide est signalée avec
+son numéro de ligne sans bloquer les autres.
+➡️ Seuls les identifiants des candidatures importées sont conservés : elles sont
+relues et scorées par lots à la fin de l'import, puis le classement de chaque
+offre concernée est recalculé une seule fois.
+➡️ CSV : les colonnes constraints, skill_requirements et comparison_matrix
+contiennent du JSON (ex: [{"type": "hard", "name": "Langue", "value": "Français"}]).
+"""
+import csv
+import json
+from itertools import islice
+
+from django.conf import settings
+from django.db import transaction
+
+from users.models import CandidateProfile
+from .cache import invalidate_job_payload
+from .models import CandidateApplication, Constraint, Job, SkillRequirement
+from .scoring_queue import score_applications
+from .serializers import ApplicationImportSerializer, JobSerializer, unique_by_name
+from .stats import record_applications
+
+FORMATS = ('csv', 'jsonl')
+# Nombre maximal d'erreurs détaillées dans le rapport (le total est toujours compté)
+MAX_REPORTED_ERRORS = 1000
+JSON_COLUMNS = ('constraints', 'skill_requirements', 'comparison_matrix')
+
+
+class ImportReport:
+    def __init__(self):
+        self.created = 0
+        self.scored = 0
+        self.error_count = 0
+        self.errors = []
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'scored': self.scored,
+            'error_count': self.error_count,
+            'errors': self.errors,
+        }
+
+
+def detect_format(filename, import_format=None):
+    """Format explicite, sinon déduit de l'extension du fichier"""
+    import_format = (import_format or filename.rsplit('.', 1)[-1]).lower()
+    if import_format == 'json':
+        import_format = 'jsonl'
+    if import_format not in FORMATS:
+        raise ValueError(f"Format d'import non supporté : {import_format} (csv ou jsonl).")
+    return import_format
+
+
+def _decode(lines):
+    for line in lines:
+        yield line.decode('utf-8-sig') if isinstance(line, bytes) else line
+
+
+def read_rows(lines, import_format):
+    """
+    Parcourt les lignes d'un fichier (texte ou binaire) et produit des couples (numéro de ligne, ligne).
+    Une ligne illisible est produite sous forme de ValueError.
+    """
+    lines = _decode(lines)
+    if import_format == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            # Les cellules vides sont considérées comme absentes (valeurs par défaut)
+            row = {key: value for key, value in row.items() if key and value not in ('', None)}
+            try:
+                for column in JSON_COLUMNS:
+                    if column in row:
+                        row[column] = json.loads(row[column])
+            except ValueError:
+                row = ValueError(f"Colonne {column} : JSON invalide.")
+            yield reader.line_num, row
+        return
+
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError
+        except ValueError:
+            row = ValueError("Ligne JSON invalide (un objet par ligne attendu).")
+        yield number, row
+
+
+def _batches(rows, batch_size):
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def _validate(batch, serializer_class, report):
+    """Valide les lignes d'un lot ; retourne les couples (numéro de ligne, données validées)"""
+    valid = []
+    for line, row in batch:
+        if isinstance(row, Exception):
+            report.add_error(line, str(row))
+            continue
+        serializer = serializer_class(data=row)
+        if serializer.is_valid():
+            valid.append((line, serializer.validated_data))
+        else:
+            report.add_error(line, serializer.errors)
+    return valid
+
+
+def import_jobs(rows, employer, batch_size=None):
+    """Importe des offres (avec leurs contraintes et compétences) pour un employeur"""
+    report = ImportReport()
+    for batch in _batches(rows, batch_size or settings.IMPORT_BATCH_SIZE):
+        valid = [data for _, data in _validate(batch, JobSerializer, report)]
+        if not valid:
+            continue
+
+        with transaction.atomic():
+            jobs = Job.objects.bulk_create([
+                Job(employer=employer, **{field: value for field, value in data.items()
+                                          if field not in ('constraints', 'skill_requirements')})
+                for data in valid
+            ])
+            Constraint.objects.bulk_create([
+                Constraint(job=job, **criterion)
+                for job, data in zip(jobs, valid)
+                for criterion in unique_by_name(data.get('constraints', []))
+            ])
+            SkillRequirement.objects.bulk_create([
+                SkillRequirement(job=job, **criterion)
+                for job, data in zip(jobs, valid)
+                for criterion in unique_by_name(data.get('skill_requirements', []))
+            ])
+        for job in jobs:
+            invalidate_job_payload(job)
+        report.created += len(jobs)
+    return report
+
+
+def import_applications(rows, jobs, batch_size=None):
+    """
+    Importe des candidatures (job : id de l'offre, candidate : nom d'utilisateur du candidat).
+    jobs: Offres autorisées (queryset), ex: celles de l'employeur connecté
+    Les candidatures sont scorées à la fin de l'import, relues en base par lots.
+    """
+    report = ImportReport()
+    imported = []  # identifiants des candidatures créées
+    for batch in _batches(rows, batch_size or settings.IMPORT_BATCH_SIZE):
+        valid = _validate(batch, ApplicationImportSerializer, report)
+        if not valid:
+            continue
+
+        # Résolution groupée des candidats, des offres et des candidatures existantes du lot
+        candidates = {
+            candidate.user.username: candidate
+            for candidate in CandidateProfile.objects.filter(
+                user__username__in={data['candidate'] for _, data in valid}
+            ).select_related('user')
+        }
+        allowed_jobs = set(jobs.filter(id__in={data['job'] for _, data in valid}).values_list('id', flat=True))
+        taken = set(CandidateApplication.objects.filter(
+            job_id__in=allowed_jobs, candidate__in=candidates.values()
+        ).values_list('candidate_id', 'job_id'))
+
+        applications = []
+        for line, data in valid:
+            candidate = candidates.get(data['candidate'])
+            if candidate is None:
+                report.add_error(line, {'candidate': [f"Candidat inconnu : {data['candidate']}."]})
+            elif data['job'] not in allowed_jobs:
+                report.add_error(line, {'job': [f"Offre inexistante ou non autorisée : {data['job']}."]})
+            elif (candidate.pk, data['job']) in taken:
+                report.add_error(line, {'non_field_errors': ["Ce candidat a déjà postulé à cette offre."]})
+            else:
+                taken.add((candidate.pk, data['job']))
+                applications.append(CandidateApplication(candidate=candidate, job_id=data['job'], status=data['status']))
+
+        with transaction.atomic():
+            created = CandidateApplication.objects.bulk_create(applications)
+            record_applications(created)
+        imported.extend(application.pk for application in created)
+        report.created += len(created)
+
+    if imported:
+        report.scored = score_applications(imported, batch_size)
+    return report
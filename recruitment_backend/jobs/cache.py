@@ -0,0 +1,103 @@
+"""
+Cache des offres sérialisées (JobSerializer, avec contraintes et compétences).
+➡️ Chaque offre est stockée sous sa propre clé avec sa version (updated_at) :
+une entrée dont la version ne correspond plus est ignorée. Les écritures sur une
+offre suppriment en plus son entrée (invalidate_job_payload).
+➡️ Une page de liste coûte une requête sur les offres et une lecture groupée du
+cache ; seules les offres absentes du cache sont sérialisées (2 requêtes pour
+toutes leurs contraintes et compétences).
+➡️ Les réponses portent un ETag dérivé des versions des offres : un client qui
+renvoie If-None-Match reçoit un 304 sans sérialisation.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def _cache_key(job_id):
+    return f'jobs:payload:{job_id}'
+
+
+def _version(job):
+    return job.updated_at.isoformat()
+
+
+def invalidate_job_payload(job):
+    """Supprime l'offre sérialisée du cache (à appeler après toute modification de l'offre ou de ses critères)"""
+    cache.delete(_cache_key(job.pk))
+
+
+def job_payloads(jobs, serializer_class):
+    """Retourne les offres sérialisées (dans l'ordre de `jobs`), en passant par le cache"""
+    keys = {job.pk: _cache_key(job.pk) for job in jobs}
+    cached = cache.get_many(list(keys.values()))
+
+    payloads = {}
+    missing = []
+    for job in jobs:
+        entry = cached.get(keys[job.pk])
+        if entry is not None and entry[0] == _version(job):
+            payloads[job.pk] = entry[1]
+        else:
+            missing.append(job)
+
+    if missing:
+        prefetch_related_objects(missing, 'constraints', 'skill_requirements')
+        fresh = {}
+        for job, payload in zip(missing, serializer_class(missing, many=True).data):
+            payloads[job.pk] = payload
+            fresh[keys[job.pk]] = (_version(job), payload)
+        cache.set_many(fresh, settings.JOB_CACHE_TIMEOUT)
+
+    return [payloads[job.pk] for job in jobs]
+
+
+def jobs_etag(request, jobs):
+    """ETag d'une réponse : URL demandée + (id, version) de chaque offre"""
+    signature = request.get_full_path() + ''.join(f'|{job.pk}:{_version(job)}' for job in jobs)
+    return quote_etag(hashlib.md5(signature.encode()).hexdigest())
+
+
+def not_modified(request, etag):
+    """Réponse 304 si le client possède déjà cette version, sinon None"""
+    etags = parse_etags(request.headers.get('If-None-Match', ''))
+    if etag in etags or '*' in etags:
+        return Response(status=status.HTTP_304_NOT_MODIFIED, headers={'ETag': etag})
+    return None
+
+
+class CachedJobPayloadMixin:
+    """
+    list et retrieve servis depuis le cache des offres sérialisées, avec ETag / If-None-Match.
+    À placer avant la classe de viewset (get_queryset et la pagination restent ceux du viewset).
+    """
+
+    def list(self, request, *args, **kwargs):
+        jobs = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+        if jobs is None:
+            jobs = list(self.filter_queryset(self.get_queryset()))
+
+        etag = jobs_etag(request, jobs)
+        response = not_modified(request, etag)
+        if response is None:
+            data = job_payloads(jobs, self.get_serializer_class())
+            if self.paginator is not None:
+                response = self.get_paginated_response(data)
+            else:
+                response = Response(data)
+            response['ETag'] = etag
+        return response
+
+    def retrieve(self, request, *args, **kwargs):
+        job = self.get_object()
+        etag = jobs_etag(request, [job])
+        response = not_modified(request, etag)
+        if response is None:
+            response = Response(job_payloads([job], self.get_serializer_class())[0])
+            response['ETag'] = etag
+        return response
@@ -0,0 +1,42 @@
+"""
+Filtres (paramètres de requête) des listes d'offres et de candidatures.
+"""
+from rest_framework import serializers
+
+
+def _float_param(params, name):
+    value = params.get(name)
+    if value in (None, ''):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise serializers.ValidationError({name: "Doit être un nombre."})
+
+
+def filter_jobs(queryset, params):
+    """
+    status → statut de l'offre (open, closed)
+    location → lieu de travail (contient, insensible à la casse)
+    """
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    if params.get('location'):
+        queryset = queryset.filter(location__icontains=params['location'])
+    return queryset
+
+
+def filter_applications(queryset, params):
+    """
+    status → statut de la candidature
+    min_score / max_score → bornes du score AHP
+    """
+    if params.get('status'):
+        queryset = queryset.filter(status=params['status'])
+    min_score = _float_param(params, 'min_score')
+    if min_score is not None:
+        queryset = queryset.filter(ahp_score__gte=min_score)
+    max_score = _float_param(params, 'max_score')
+    if max_score is not None:
+        queryset = queryset.filter(ahp_score__lte=max_score)
+    return queryset
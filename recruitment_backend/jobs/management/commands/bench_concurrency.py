@@ -0,0 +1,78 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test import override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from jobs.models import Job
+from jobs.views import CandateApplicationViewSet
+from users.models import CandidateProfile, EmployerProfile, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Soumet des candidatures en parallèle (threads) sur la base configurée (DB_ENGINE) et mesure le débit. "
+        "Les données créées sont supprimées à la fin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=1000, help="Candidatures soumises par mesure")
+        parser.add_argument('--threads', default='1,4,8', help="Nombres de threads (séparés par des virgules)")
+        parser.add_argument('--scoring', choices=['async', 'sync'], default='sync',
+                            help="sync : score et classement calculés à la soumission (écritures les plus lourdes)")
+
+    def handle(self, *args, **options):
+        database = settings.DATABASES['default']
+        self.stdout.write(f"Base : {connection.vendor} ({database['NAME']}), scoring {options['scoring']}")
+
+        self.create_view = CandateApplicationViewSet.as_view({'post': 'create'})
+        self.factory = APIRequestFactory()
+        users = User.objects.bulk_create(
+            (User(username=f"bench-concurrency-{i}", email=f"bench-concurrency-{i}@example.com", role='candidate')
+             for i in range(options['applications'] + 1)),
+            batch_size=1000,
+        )
+        try:
+            employer = EmployerProfile.objects.create(user=users[0], company_name='Benchmark', sector='Benchmark')
+            candidates = CandidateProfile.objects.bulk_create(
+                (CandidateProfile(user=user, bio='python django') for user in users[1:]), batch_size=1000
+            )
+            for user, candidate in zip(users[1:], candidates):
+                user.candidate_profile = candidate
+
+            with override_settings(SCORING_ASYNC=options['scoring'] == 'async'):
+                for threads in (int(value) for value in options['threads'].split(',')):
+                    job = Job.objects.create(
+                        employer=employer, title='Benchmark', description='', salary=0, location='', deadline=date.today(),
+                    )
+                    elapsed, errors = self._run(job, users[1:], threads)
+                    submitted = len(users) - 1
+                    self.stdout.write(
+                        f"{threads:>3} thread(s) : {submitted} candidatures en {elapsed:.2f} s "
+                        f"({submitted / elapsed:.0f} / s), {errors} échec(s)"
+                    )
+        finally:
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def _run(self, job, users, threads):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            statuses = list(executor.map(lambda user: self._submit(job, user), users))
+        elapsed = time.perf_counter() - start
+        return elapsed, sum(status != 201 for status in statuses)
+
+    def _submit(self, job, user):
+        request = self.factory.post('/api/applications/', {'job': job.pk}, format='json')
+        force_authenticate(request, user)
+        try:
+            return self.create_view(request).status_code
+        except Exception:
+            return None
+        finally:
+            # Chaque thread utilise sa propre connexion (comme un worker du serveur)
+            if not settings.DATABASES['default'].get('CONN_MAX_AGE'):
+                connections.close_all()
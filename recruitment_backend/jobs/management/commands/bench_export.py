@@ -0,0 +1,73 @@
+import random
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+
+from jobs.export import streaming_export
+from jobs.models import CandidateApplication, Job
+from users.models import CandidateProfile, EmployerProfile, User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Mesure la mémoire et la durée de l'export en flux des candidatures d'une offre. Aucune donnée n'est conservée."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='10000,100000', help="Nombres de candidatures (séparés par des virgules)")
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        sizes = sorted(int(size) for size in options['sizes'].split(','))
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING='gzip' if options['gzip'] else '')
+        results = []
+        try:
+            with transaction.atomic():
+                job = self._create_applications(sizes[-1], rng)
+                for size in sizes:
+                    applications = CandidateApplication.objects.filter(job=job, id__lte=self.first_id + size - 1)
+                    results.append((size, *self._measure(request, applications)))
+                raise Rollback()
+        except Rollback:
+            pass
+
+        for size, elapsed, peak, written in results:
+            self.stdout.write(
+                f"{size:>8} candidatures : {elapsed:.2f} s, pic mémoire {peak / 1024:.0f} Kio, "
+                f"{written / 1024 / 1024:.1f} Mio écrits"
+            )
+
+    def _create_applications(self, count, rng):
+        users = User.objects.bulk_create(
+            (User(username=f"bench-export-{i}", email=f"bench-export-{i}@example.com", role='candidate')
+             for i in range(count + 1)),
+            batch_size=5000,
+        )
+        employer = EmployerProfile.objects.create(user=users[0], company_name='Benchmark', sector='Benchmark')
+        candidates = CandidateProfile.objects.bulk_create((CandidateProfile(user=user) for user in users[1:]), batch_size=5000)
+        job = Job.objects.create(employer=employer, title='Benchmark', description='', salary=0, location='', deadline=date.today())
+        applications = CandidateApplication.objects.bulk_create(
+            (CandidateApplication(candidate=candidate, job=job, ahp_score=round(rng.uniform(0, 100), 2)) for candidate in candidates),
+            batch_size=5000,
+        )
+        self.first_id = applications[0].pk
+        return job
+
+    def _measure(self, request, applications):
+        tracemalloc.start()
+        start = time.perf_counter()
+        written = 0
+        for block in streaming_export(request, applications, 'csv', 'benchmark').streaming_content:
+            written += len(block)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return elapsed, peak, written
@@ -0,0 +1,72 @@
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.models import CandidateApplication, Job
+from jobs.ranking import insert_application_rank
+from users.models import CandidateProfile, EmployerProfile, User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Mesure le coût du classement pour N candidatures successives (incrémental vs recalcul complet). Aucune donnée n'est conservée."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--applications', type=int, default=10000)
+        parser.add_argument('--legacy-applications', type=int, default=500,
+                            help="Nombre de candidatures pour l'ancien recalcul complet (coût quadratique)")
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        try:
+            with transaction.atomic():
+                candidates = self._create_candidates(max(options['applications'], options['legacy_applications']))
+                incremental = self._run(candidates[:options['applications']], rng, self._insert_incremental)
+                legacy = self._run(candidates[:options['legacy_applications']], rng, self._insert_legacy)
+                raise Rollback()
+        except Rollback:
+            pass
+
+        for label, (count, elapsed) in (('incrémental', incremental), ('recalcul complet', legacy)):
+            self.stdout.write(
+                f"{label:>17} : {count} candidatures en {elapsed:.2f} s "
+                f"({elapsed / max(count, 1) * 1000:.3f} ms / candidature)"
+            )
+
+    def _create_candidates(self, count):
+        users = User.objects.bulk_create(
+            User(username=f"bench-ranking-{i}", email=f"bench-ranking-{i}@example.com", role='candidate')
+            for i in range(count + 1)
+        )
+        self.employer = EmployerProfile.objects.create(user=users[0], company_name='Benchmark', sector='Benchmark')
+        return CandidateProfile.objects.bulk_create(CandidateProfile(user=user) for user in users[1:])
+
+    def _run(self, candidates, rng, insert):
+        job = Job.objects.create(
+            employer=self.employer, title='Benchmark', description='', salary=0,
+            location='', deadline=date.today(),
+        )
+        start = time.perf_counter()
+        for candidate in candidates:
+            application = CandidateApplication.objects.create(
+                candidate=candidate, job=job, ahp_score=round(rng.uniform(0, 100), 2)
+            )
+            insert(application)
+        return len(candidates), time.perf_counter() - start
+
+    def _insert_incremental(self, application):
+        insert_application_rank(application)
+
+    def _insert_legacy(self, application):
+        # Ancien comportement : réenregistrement de toutes les candidatures de l'offre
+        applications = CandidateApplication.objects.filter(job_id=application.job_id).order_by('-ahp_score')
+        for rank, other in enumerate(applications, start=1):
+            other.rank = rank
+            other.save()
@@ -0,0 +1,47 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from jobs.bulk_import import detect_format, import_applications, import_jobs, read_rows
+from jobs.models import Job
+from users.models import EmployerProfile
+
+
+class Command(BaseCommand):
+    help = "Import en masse d'offres ou de candidatures depuis un fichier CSV ou JSONL"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=['jobs', 'applications'])
+        parser.add_argument('path')
+        parser.add_argument('--employer', help="Nom d'utilisateur de l'employeur (obligatoire pour les offres)")
+        parser.add_argument('--format', dest='import_format', choices=['csv', 'jsonl'],
+                            help="Format du fichier (par défaut : d'après l'extension)")
+        parser.add_argument('--batch-size', type=int, default=None)
+
+    def handle(self, *args, **options):
+        try:
+            import_format = detect_format(options['path'], options['import_format'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        with open(options['path'], 'rb') as lines:
+            rows = read_rows(lines, import_format)
+            if options['kind'] == 'jobs':
+                report = import_jobs(rows, self._employer(options['employer']), options['batch_size'])
+            else:
+                report = import_applications(rows, Job.objects.all(), options['batch_size'])
+
+        for error in report.errors:
+            self.stderr.write(f"Ligne {error['line']} : {json.dumps(error['errors'], ensure_ascii=False)}")
+        self.stdout.write(
+            f"{report.created} ligne(s) importée(s), {report.scored} candidature(s) scorée(s), "
+            f"{report.error_count} erreur(s)"
+        )
+
+    def _employer(self, username):
+        if not username:
+            raise CommandError("--employer est obligatoire pour importer des offres.")
+        try:
+            return EmployerProfile.objects.get(user__username=username)
+        except EmployerProfile.DoesNotExist:
+            raise CommandError(f"Employeur inconnu : {username}")
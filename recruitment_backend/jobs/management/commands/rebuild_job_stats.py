@@ -0,0 +1,49 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.models import Job, JobStats
+from jobs.stats import compute_job_stats
+
+FIELDS = ['application_count', 'pending_count', 'scored_count', 'score_sum', 'score_sum_sq', 'min_score', 'max_score']
+
+
+class Command(BaseCommand):
+    help = "Recalcule les statistiques des offres (JobStats) depuis les candidatures et signale les écarts"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help="Signaler les écarts sans rien modifier")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            expected = compute_job_stats()
+            current = {stats.job_id: stats for stats in JobStats.objects.all()}
+
+            rebuilt = []
+            for job_id in Job.objects.values_list('id', flat=True):
+                stats = expected.get(job_id) or JobStats(job_id=job_id)
+                differences = self._differences(current.get(job_id), stats)
+                if differences:
+                    self.stdout.write(f"Offre {job_id} : {', '.join(differences)}")
+                    rebuilt.append(stats)
+
+            if not options['check'] and rebuilt:
+                JobStats.objects.filter(job_id__in=[stats.job_id for stats in rebuilt]).delete()
+                JobStats.objects.bulk_create(rebuilt, batch_size=1000)
+
+        action = "à corriger" if options['check'] else "corrigée(s)"
+        self.stdout.write(f"{len(rebuilt)} offre(s) {action}")
+
+    def _differences(self, current, expected):
+        if current is None:
+            return ['statistiques absentes'] if expected.application_count else []
+        differences = []
+        for field in FIELDS:
+            before, after = getattr(current, field), getattr(expected, field)
+            # Les sommes de scores sont des flottants : on tolère les erreurs d'arrondi
+            if isinstance(before, float) and isinstance(after, float):
+                same = abs(before - after) <= 1e-6 * max(1.0, abs(after))
+            else:
+                same = before == after
+            if not same:
+                differences.append(f"{field} {before} → {after}")
+        return differences
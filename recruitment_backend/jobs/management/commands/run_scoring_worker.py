@@ -0,0 +1,43 @@
+import os
+import socket
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from jobs.scoring_queue import claim_tasks, process_task
+
+
+class Command(BaseCommand):
+    help = "Worker de scoring : calcule les scores et classements des candidatures en attente ('pending-score')"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=4, help="Nombre d'offres traitées en parallèle")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Attente (s) lorsque la file est vide")
+        parser.add_argument('--once', action='store_true', help="Vider la file puis s'arrêter")
+
+    def handle(self, *args, **options):
+        worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Worker de scoring {worker_id} démarré ({options['threads']} threads)")
+
+        with ThreadPoolExecutor(max_workers=options['threads']) as executor:
+            while True:
+                tasks = claim_tasks(worker_id, limit=options['threads'])
+                if not tasks:
+                    if options['once']:
+                        break
+                    time.sleep(options['poll_interval'])
+                    continue
+
+                for task, count in zip(tasks, executor.map(self._process, tasks)):
+                    self.stdout.write(f"Offre {task.job_id} : {count} candidature(s) scorée(s)")
+
+    def _process(self, task):
+        try:
+            return process_task(task)
+        except Exception as exc:
+            return f"erreur ({exc})"
+        finally:
+            # Chaque thread possède sa propre connexion à la base
+            connections.close_all()
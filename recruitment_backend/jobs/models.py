@@ -22,7 +22,15 @@ class Job(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateField() # Date limite pour postuler
     published_at = models.DateTimeField(auto_now_add=True)
+    # Matrice AHP de comparaison par paires des critères (hard, soft, compétences)
+    # Si vide, la matrice par défaut de ahp_evaluation.AHP est utilisée
+    comparison_matrix = models.JSONField(null=True, blank=True)
     
+    class Meta:
+        indexes = [
+            # Offres d'un employeur, les plus récentes d'abord
+            models.Index(fields=['employer', '-created_at'], name='job_employer_created_idx'),
+        ]
     
     def __str__(self):
         return self.title 
@@ -51,6 +59,11 @@ class Constraint(models.Model):
     name = models.CharField(max_length=255) # Nom de la contrainte (ex: "Mobilité géographique", "Langue")
     weight = models.FloatField(default=1.0) #Poids de la contrainte dans le calcul du score (pour AHP)
     
+    class Meta:
+        indexes = [
+            models.Index(fields=['job', 'type'], name='constraint_job_type_idx'),
+        ]
+    
     def __str__(self):
         return f"{self.name} - ({self.get_type_display()})"
     
@@ -76,11 +89,12 @@ Ce modèle représente une candidature à une offre d'emploi.
     job → Lien avec l'offre d'emploi
     score → Score généré par l'AHP
     rank → Classement du candidat
-    status → Statut de la candidature (pending, accepted, rejected)
+    status → Statut de la candidature (pending-score, pending, accepted, rejected)
 """
 
 class CandidateApplication(models.Model):
     STATUS_CHOICES = [
+        ('pending-score', 'Pending score'), # en attente du calcul du score (file de scoring)
         ('pending', 'Pending'),
         ('accepted', 'Accepted'),
         ('rejected', 'Rejected'),
@@ -103,5 +117,84 @@ class CandidateApplication(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     created_at = models.DateTimeField(auto_now_add=True)    
     
+    class Meta:
+        constraints = [
+            # Un candidat ne peut postuler qu'une fois à une offre
+            models.UniqueConstraint(fields=['candidate', 'job'], name='unique_application_per_job'),
+        ]
+        indexes = [
+            # Candidatures d'une offre par statut (ex: GA sur les candidatures 'pending')
+            models.Index(fields=['job', 'status'], name='application_job_status_idx'),
+            # Classement d'une offre : score décroissant puis id croissant (pagination par curseur, calcul du rang)
+            models.Index(fields=['job', '-ahp_score', 'id'], name='application_job_score_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.candidate.user.username} - {self.job.title}"
+
+
+"""
+File d'attente (en base) du scoring asynchrone des candidatures.
+➡️ Une seule tâche par offre : une rafale de candidatures sur la même offre
+est regroupée en une seule tâche, donc un seul recalcul du classement.
+    requested_at → Date de la dernière demande de scoring
+    claimed_at → Date de prise en charge par un worker (null si en attente)
+    claimed_by → Identifiant du worker
+"""
+
+class ScoringTask(models.Model):
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='scoring_task'
+    )
+    requested_at = models.DateTimeField()
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.CharField(max_length=100, blank=True)
+    attempts = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Scoring - {self.job.title}"
+
+
+"""
+Statistiques dénormalisées d'une offre, tenues à jour à chaque candidature et à chaque scoring.
+➡️ Le nombre de candidatures et le résumé des scores AHP se lisent sur une seule ligne,
+sans COUNT ni agrégation sur les candidatures.
+    application_count → Nombre total de candidatures
+    pending_count → Candidatures en attente de score ('pending-score')
+    scored_count → Candidatures ayant un score AHP
+    score_sum, score_sum_sq → Somme et somme des carrés des scores (moyenne, écart-type)
+    min_score, max_score → Score AHP minimal et maximal
+"""
+
+class JobStats(models.Model):
+    job = models.OneToOneField(
+        Job,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats'
+    )
+    application_count = models.IntegerField(default=0)
+    pending_count = models.IntegerField(default=0)
+    scored_count = models.IntegerField(default=0)
+    score_sum = models.FloatField(default=0)
+    score_sum_sq = models.FloatField(default=0)
+    min_score = models.FloatField(null=True, blank=True)
+    max_score = models.FloatField(null=True, blank=True)
+
+    @property
+    def mean_score(self):
+        if not self.scored_count:
+            return None
+        return self.score_sum / self.scored_count
+
+    @property
+    def score_stddev(self):
+        if not self.scored_count:
+            return None
+        variance = self.score_sum_sq / self.scored_count - self.mean_score ** 2
+        return max(variance, 0) ** 0.5
+
     def __str__(self):
-        return f"{self.candidate.user.username} - {self.job.title}"
\ No newline at end of file
+        return f"Statistiques - {self.job.title}"
@@ -0,0 +1,16 @@
+from recruitment_backend.pagination import KeysetPagination
+
+
+# Offres : les plus récentes d'abord
+class JobPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+# Candidatures d'une offre : ordre du classement (jobs.ranking.RANK_ORDERING), meilleurs scores AHP d'abord
+class ApplicationScorePagination(KeysetPagination):
+    ordering = ('-ahp_score', 'id')
+
+
+# Candidatures d'un candidat : les plus récentes d'abord
+class ApplicationDatePagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
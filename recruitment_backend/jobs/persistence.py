@@ -0,0 +1,65 @@
+"""
+Écriture groupée des résultats de scoring (ahp_score, ag_score, rank, status).
+➡️ Toutes les candidatures sont écrites dans une seule transaction avec
+bulk_update, par lots de taille configurable (SCORE_PERSIST_BATCH_SIZE),
+et uniquement sur les champs demandés. Si un instantané des valeurs d'origine
+est fourni, seules les lignes et colonnes réellement modifiées sont écrites.
+"""
+import logging
+import time
+from collections import namedtuple
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import CandidateApplication
+
+logger = logging.getLogger(__name__)
+
+PersistResult = namedtuple('PersistResult', ['rows', 'batches', 'elapsed'])
+
+
+def snapshot(applications, fields):
+    """Valeurs actuelles des champs, à passer à persist_scores(original=...) après modification"""
+    return {application.pk: tuple(getattr(application, field) for field in fields) for application in applications}
+
+
+def persist_scores(applications, fields, original=None, batch_size=None):
+    """
+    Enregistre les champs `fields` des candidatures en une transaction.
+    original: Instantané (voir snapshot) pour n'écrire que les lignes et champs modifiés
+    Retourne le nombre de lignes écrites, le nombre de lots et la durée (s).
+    """
+    start = time.perf_counter()
+    batch_size = batch_size or settings.SCORE_PERSIST_BATCH_SIZE
+    fields = list(fields)
+    applications = [application for application in applications if application.pk is not None]
+
+    if original is not None:
+        changed_fields = set()
+        changed = []
+        for application in applications:
+            before = original.get(application.pk)
+            after = tuple(getattr(application, field) for field in fields)
+            if before is None:
+                changed_fields.update(fields)
+                changed.append(application)
+            elif before != after:
+                changed_fields.update(field for field, old, new in zip(fields, before, after) if old != new)
+                changed.append(application)
+        applications = changed
+        fields = [field for field in fields if field in changed_fields]
+
+    batches = 0
+    if applications and fields:
+        with transaction.atomic():
+            for offset in range(0, len(applications), batch_size):
+                CandidateApplication.objects.bulk_update(applications[offset:offset + batch_size], fields)
+                batches += 1
+
+    result = PersistResult(len(applications) if fields else 0, batches, time.perf_counter() - start)
+    logger.info(
+        "Scores enregistrés : %s ligne(s), %s lot(s), champs %s, %.3f s",
+        result.rows, result.batches, fields, result.elapsed,
+    )
+    return result
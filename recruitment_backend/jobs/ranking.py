@@ -0,0 +1,73 @@
+"""
+Maintenance incrémentale du classement des candidatures d'une offre.
+➡️ Ordre du classement : score AHP décroissant, puis ancienneté (id croissant).
+Lors de l'arrivée d'une nouvelle candidature, sa position est trouvée par une
+requête COUNT puis seules les candidatures classées après elle sont décalées
+par un unique UPDATE, au lieu de réenregistrer toutes les candidatures.
+"""
+from django.db import transaction
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+
+from .models import CandidateApplication, Job
+from .persistence import persist_scores
+
+
+RANK_ORDERING = [F('ahp_score').desc(nulls_last=True), F('id').asc()]
+
+
+def insert_application_rank(application):
+    """
+    Insère une candidature (déjà enregistrée et scorée) dans le classement de son offre.
+    À appeler dans la transaction qui crée la candidature.
+    Retourne le rang attribué.
+    """
+    if application.ahp_score is None:
+        return None
+
+    with transaction.atomic():
+        # Insertions sérialisées par offre : verrou sur la ligne de l'offre jusqu'à la fin de la transaction
+        Job.objects.select_for_update().filter(pk=application.job_id).exists()
+        # Seules les candidatures déjà classées comptent : une candidature scorée mais pas
+        # encore insérée (rang nul) prendra sa place lors de sa propre insertion
+        ranked = CandidateApplication.objects.filter(
+            job_id=application.job_id, ahp_score__isnull=False, rank__isnull=False
+        ).exclude(pk=application.pk)
+
+        # Nombre de candidatures classées devant (meilleur score, ou même score et plus ancienne)
+        rank = ranked.filter(
+            Q(ahp_score__gt=application.ahp_score) | Q(ahp_score=application.ahp_score, id__lt=application.pk)
+        ).count() + 1
+
+        # Décalage des candidatures classées derrière
+        ranked.filter(rank__gte=rank).update(rank=F('rank') + 1)
+        CandidateApplication.objects.filter(pk=application.pk).update(rank=rank)
+
+    application.rank = rank
+    return rank
+
+
+def annotate_ranks(queryset):
+    """
+    Calcule le classement à la lecture (fonction de fenêtrage), sans rien écrire en base.
+    Le rang calculé est disponible dans l'attribut `computed_rank`.
+    """
+    return queryset.filter(ahp_score__isnull=False).annotate(
+        computed_rank=Window(RowNumber(), partition_by=[F('job_id')], order_by=RANK_ORDERING)
+    )
+
+
+def rerank_job(job):
+    """
+    Recalcule entièrement le classement d'une offre (ex: après un rescoring groupé).
+    Seules les candidatures dont le rang change sont réécrites.
+    Retourne le nombre de candidatures mises à jour.
+    """
+    applications = annotate_ranks(CandidateApplication.objects.filter(job=job)).only('id', 'rank')
+    changed = []
+    for application in applications:
+        if application.rank != application.computed_rank:
+            application.rank = application.computed_rank
+            changed.append(application)
+
+    return persist_scores(changed, ['rank']).rows
@@ -0,0 +1,126 @@
+"""
+Scoring asynchrone des candidatures.
+➡️ La soumission d'une candidature l'enregistre avec le statut 'pending-score'
+puis ajoute son offre à la file (table ScoringTask). Le worker
+(`python manage.py run_scoring_worker`) calcule les scores de toutes les
+candidatures en attente de l'offre, puis recalcule le classement une seule fois.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .ahp import get_scoring_plan
+from .models import CandidateApplication, Job, ScoringTask
+from .persistence import persist_scores, snapshot
+from .ranking import rerank_job
+from .stats import record_scored
+
+logger = logging.getLogger(__name__)
+
+# Une tâche prise en charge depuis plus longtemps est considérée abandonnée (worker arrêté)
+CLAIM_TIMEOUT = timedelta(minutes=10)
+
+
+def enqueue_scoring(job):
+    """Demande le scoring des candidatures en attente d'une offre (une seule tâche par offre)"""
+    ScoringTask.objects.update_or_create(job=job, defaults={'requested_at': timezone.now()})
+
+
+def claim_tasks(worker_id, limit):
+    """
+    Réserve jusqu'à `limit` tâches pour ce worker.
+    La réservation est atomique : une tâche n'est jamais traitée par deux workers à la fois.
+    """
+    now = timezone.now()
+    available = ScoringTask.objects.filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=now - CLAIM_TIMEOUT))
+    claimed = []
+    for task in available.select_related('job').order_by('requested_at')[:limit]:
+        won = ScoringTask.objects.filter(pk=task.pk, claimed_at=task.claimed_at).update(
+            claimed_at=now, claimed_by=worker_id, attempts=task.attempts + 1
+        )
+        if won:
+            task.claimed_at = now
+            task.claimed_by = worker_id
+            claimed.append(task)
+    return claimed
+
+
+def score_pending_applications(job):
+    """
+    Calcule le score de toutes les candidatures 'pending-score' d'une offre puis met à jour le classement.
+    Retourne le nombre de candidatures scorées.
+    """
+    plan = get_scoring_plan(job)
+    applications = list(
+        CandidateApplication.objects.filter(job=job, status='pending-score').select_related('candidate')
+    )
+    scores = plan.score_candidates(application.candidate for application in applications)
+    for application in applications:
+        application.ahp_score = scores[application.candidate_id]
+        application.status = 'pending'
+
+    with transaction.atomic():
+        persist_scores(applications, ['ahp_score', 'status'])
+        record_scored(job.id, [application.ahp_score for application in applications])
+    if applications:
+        rerank_job(job)
+    return len(applications)
+
+
+def score_applications(application_ids, batch_size=None):
+    """
+    Calcule le score des candidatures données (ex: import en masse), relues en base
+    par lots de `batch_size`, puis recalcule une seule fois le classement de chaque offre concernée.
+    Retourne le nombre de candidatures scorées.
+    """
+    application_ids = list(application_ids)
+    batch_size = batch_size or settings.SCORE_PERSIST_BATCH_SIZE
+    plans = {}
+    scored = 0
+    for offset in range(0, len(application_ids), batch_size):
+        applications = list(
+            CandidateApplication.objects.filter(pk__in=application_ids[offset:offset + batch_size]).select_related('candidate')
+        )
+        original = snapshot(applications, ['ahp_score'])
+        by_job = {}
+        for application in applications:
+            by_job.setdefault(application.job_id, []).append(application)
+
+        missing = [job_id for job_id in by_job if job_id not in plans]
+        plans.update((job.id, get_scoring_plan(job)) for job in Job.objects.filter(id__in=missing))
+        with transaction.atomic():
+            for job_id, group in by_job.items():
+                scores = plans[job_id].score_candidates(application.candidate for application in group)
+                for application in group:
+                    application.ahp_score = scores[application.candidate_id]
+            # Seuls les scores modifiés sont réécrits
+            persist_scores(applications, ['ahp_score'], original=original)
+            for job_id, group in by_job.items():
+                record_scored(job_id, [application.ahp_score for application in group], pending=False)
+        scored += len(applications)
+
+    for job in Job.objects.filter(id__in=list(plans)):
+        rerank_job(job)
+    return scored
+
+
+def process_task(task):
+    """
+    Traite une tâche réservée. Si de nouvelles candidatures sont arrivées pendant le traitement,
+    la tâche est remise dans la file au lieu d'être supprimée.
+    """
+    try:
+        count = score_pending_applications(task.job)
+    except Exception:
+        logger.exception("Échec du scoring de l'offre %s", task.job_id)
+        ScoringTask.objects.filter(pk=task.pk, claimed_by=task.claimed_by).update(claimed_at=None, claimed_by='')
+        raise
+
+    finished = ScoringTask.objects.filter(pk=task.pk, claimed_by=task.claimed_by)
+    if not finished.filter(requested_at__lte=task.claimed_at).delete()[0]:
+        finished.update(claimed_at=None, claimed_by='')
+    return count
@@ -1,5 +1,9 @@
+from django.db import transaction
 from rest_framework import serializers 
-from .models import Job, Constraint, SkillRequirement, CandidateApplication 
+from .models import Job, Constraint, SkillRequirement, CandidateApplication, JobStats 
+from .ahp import invalidate_scoring_plan
+from .cache import invalidate_job_payload
+from ahp_evaluation.priorities import CONSISTENCY_THRESHOLD, compute_priorities, validate_comparison_matrix
 
 # Serializer pour les contraintes
 class ConstraintSerializer(serializers.ModelSerializer):
@@ -25,46 +29,129 @@ class JobSerializer(serializers.ModelSerializer):
         fields = '__all__'
         read_only_fields = ['employer', 'created_at', 'updated_at', 'published_at']
 
+    def validate_comparison_matrix(self, value):
+        # La matrice compare les 3 critères AHP : contraintes hard, contraintes soft, compétences
+        if value is None:
+            return value
+        try:
+            matrix = validate_comparison_matrix(value)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+        if matrix.shape != (3, 3):
+            raise serializers.ValidationError("La matrice de comparaison doit être de taille 3 × 3 (hard, soft, compétences).")
+
+        consistency_ratio = compute_priorities(matrix).consistency_ratio
+        if consistency_ratio > CONSISTENCY_THRESHOLD:
+            raise serializers.ValidationError(
+                f"La matrice de comparaison est incohérente (CR = {consistency_ratio:.3f} > {CONSISTENCY_THRESHOLD})."
+            )
+        return matrix.tolist()
+
+    def validate(self, attrs):
+        # Mise à jour partielle : les critères imbriqués échappent aux champs obligatoires.
+        # Le nom est toujours exigé ; les autres champs seulement pour un nouveau critère.
+        if self.partial:
+            errors = {}
+            for key, model in (('constraints', Constraint), ('skill_requirements', SkillRequirement)):
+                if attrs.get(key) is not None:
+                    item_errors = self._missing_criteria_fields(model, self.fields[key].child, attrs[key])
+                    if any(item_errors):
+                        errors[key] = item_errors
+            if errors:
+                raise serializers.ValidationError(errors)
+        return attrs
+
+    def _missing_criteria_fields(self, model, child, items):
+        existing = set(model.objects.filter(job=self.instance).values_list('name', flat=True)) if self.instance else set()
+        required = [name for name, field in child.fields.items() if field.required and not field.read_only]
+        errors = []
+        for data in items:
+            missing = [
+                name for name in required
+                if name not in data and (name == 'name' or data.get('name') not in existing)
+            ]
+            errors.append({name: [child.fields[name].error_messages['required']] for name in missing})
+        return errors
+
     def create(self, validated_data):
         # Extraire les contraintes et compétences
         constraints_data = validated_data.pop('constraints', [])
         skill_requirements_data = validated_data.pop('skill_requirements', [])
         
-        # Créer le job
-        job = Job.objects.create(**validated_data)
-        
-        # Créer les contraintes si elles n'existent pas déjà
-        for constraint_data in constraints_data:
-            if not Constraint.objects.filter(job=job, name=constraint_data['name']).exists():
-                Constraint.objects.create(job=job, **constraint_data)
-        
-        # Créer les compétences si elles n'existent pas déjà
-        for skill_data in skill_requirements_data:
-            if not SkillRequirement.objects.filter(job=job, name=skill_data['name']).exists():
-                SkillRequirement.objects.create(job=job, **skill_data)
+        # Créer le job et ses critères en une transaction (une insertion groupée par type de critère)
+        with transaction.atomic():
+            job = Job.objects.create(**validated_data)
+            Constraint.objects.bulk_create(
+                Constraint(job=job, **data) for data in unique_by_name(constraints_data)
+            )
+            SkillRequirement.objects.bulk_create(
+                SkillRequirement(job=job, **data) for data in unique_by_name(skill_requirements_data)
+            )
         
+        invalidate_job_payload(job)
         return job
 
     
     def update(self, instance, validated_data):
-        # Extraire les données des contraintes et compétences
-        constraints_data = validated_data.pop('constraints', [])
-        skill_requirements_data = validated_data.pop('skill_requirements', [])
+        # Extraire les données des contraintes et compétences (None : critères inchangés)
+        constraints_data = validated_data.pop('constraints', None)
+        skill_requirements_data = validated_data.pop('skill_requirements', None)
         
-        # ✅ Mettre à jour les champs de l'offre
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
+        with transaction.atomic():
+            # ✅ Mettre à jour les champs de l'offre
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
+            
+            # ✅ Seuls les critères ajoutés, modifiés ou retirés (comparés par nom) sont écrits
+            if constraints_data is not None:
+                _sync_criteria(Constraint, instance, constraints_data, ['type', 'value', 'weight'])
+            if skill_requirements_data is not None:
+                _sync_criteria(SkillRequirement, instance, skill_requirements_data, ['value', 'weight'])
         
-        # ✅ Supprimer et recréer les contraintes et compétences
-        instance.constraints.all().delete()
-        instance.skill_requirements.all().delete()
-        for constraint_data in constraints_data:
-            Constraint.objects.create(job=instance, **constraint_data)
-        for skill_data in skill_requirements_data:
-            SkillRequirement.objects.create(job=instance, **skill_data)
+        # Les critères ont changé : le plan de scoring compilé n'est plus valide
+        invalidate_scoring_plan(instance)
+        invalidate_job_payload(instance)
         
         return instance
+
+
+def unique_by_name(items):
+    """Critères dédoublonnés par nom (le premier est conservé)"""
+    unique = {}
+    for data in items:
+        unique.setdefault(data['name'], data)
+    return list(unique.values())
+
+
+def _sync_criteria(model, job, items, fields):
+    """
+    Aligne les critères (Constraint ou SkillRequirement) d'une offre sur `items`, par nom :
+    création groupée des nouveaux, mise à jour groupée des modifiés, suppression des absents.
+    """
+    wanted = {data['name']: data for data in unique_by_name(items)}
+    existing = {}
+    obsolete = []
+    for criterion in model.objects.filter(job=job):
+        if criterion.name in wanted and criterion.name not in existing:
+            existing[criterion.name] = criterion
+        else:
+            obsolete.append(criterion.pk)
+
+    changed = []
+    for name, criterion in existing.items():
+        data = wanted[name]
+        if any(field in data and getattr(criterion, field) != data[field] for field in fields):
+            for field in fields:
+                if field in data:
+                    setattr(criterion, field, data[field])
+            changed.append(criterion)
+
+    if obsolete:
+        model.objects.filter(pk__in=obsolete).delete()
+    if changed:
+        model.objects.bulk_update(changed, fields)
+    model.objects.bulk_create(model(job=job, **data) for name, data in wanted.items() if name not in existing)
     
 
 # Serializer pour une candidature 
@@ -73,3 +160,41 @@ class CandidateApplicationSerializer(serializers.ModelSerializer):
         model = CandidateApplication 
         fields = '__all__'
         read_only_fields = ['ahp_score', 'ag_score', 'rank', 'created_at']
+
+
+# Serializer de lecture (listes) : informations du candidat et de l'offre à plat
+# ⚠️ Le queryset doit charger candidate__user et job (select_related)
+class CandidateApplicationListSerializer(serializers.ModelSerializer):
+    candidate_username = serializers.CharField(source='candidate.user.username', read_only=True)
+    candidate_email = serializers.EmailField(source='candidate.user.email', read_only=True)
+    job_title = serializers.CharField(source='job.title', read_only=True)
+
+    class Meta:
+        model = CandidateApplication
+        fields = ['id', 'candidate', 'candidate_username', 'candidate_email', 'job', 'job_title',
+                  'ahp_score', 'ag_score', 'rank', 'status', 'created_at']
+        read_only_fields = fields
+
+
+# Serializer pour le résumé des candidatures d'une offre
+class JobStatsSerializer(serializers.ModelSerializer):
+    mean_score = serializers.FloatField(read_only=True)
+    score_stddev = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = JobStats
+        fields = [
+            'job', 'application_count', 'pending_count', 'scored_count',
+            'min_score', 'max_score', 'mean_score', 'score_stddev',
+        ]
+        read_only_fields = fields
+
+
+# Serializer d'une ligne d'import de candidature (voir bulk_import)
+class ApplicationImportSerializer(serializers.Serializer):
+    job = serializers.IntegerField()
+    candidate = serializers.CharField() # nom d'utilisateur du candidat
+    status = serializers.ChoiceField(
+        choices=[choice for choice in CandidateApplication.STATUS_CHOICES if choice[0] != 'pending-score'],
+        default='pending',
+    )
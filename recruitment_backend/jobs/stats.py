@@ -0,0 +1,118 @@
+"""
+Mise à jour des statistiques dénormalisées des offres (table JobStats).
+➡️ Chaque modification est un UPDATE atomique à base d'expressions F : deux
+candidatures simultanées sur la même offre ne peuvent pas perdre un incrément.
+La commande `python manage.py rebuild_job_stats` recalcule tout depuis les
+candidatures (contrôle de cohérence).
+"""
+from django.db.models import Count, F, FloatField, Max, Min, Q, Sum, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+
+from .models import CandidateApplication, JobStats
+
+
+def _apply(job_id, **changes):
+    """Applique un UPDATE atomique sur la ligne de statistiques de l'offre (créée si besoin)"""
+    if not JobStats.objects.filter(job_id=job_id).update(**changes):
+        JobStats.objects.get_or_create(job_id=job_id)
+        JobStats.objects.filter(job_id=job_id).update(**changes)
+
+
+def _score_changes(scores):
+    """Expressions F ajoutant les scores à la somme, la somme des carrés, au minimum et au maximum"""
+    lowest, highest = Value(min(scores)), Value(max(scores))
+    return {
+        'scored_count': F('scored_count') + len(scores),
+        'score_sum': F('score_sum') + sum(scores),
+        'score_sum_sq': F('score_sum_sq') + sum(score * score for score in scores),
+        # Coalesce : les extrema sont nuls tant qu'aucune candidature n'est scorée
+        'min_score': Least(Coalesce(F('min_score'), lowest), lowest),
+        'max_score': Greatest(Coalesce(F('max_score'), highest), highest),
+    }
+
+
+def record_application(application):
+    """Comptabilise une nouvelle candidature (scorée ou en attente de score)"""
+    changes = {'application_count': F('application_count') + 1}
+    if application.status == 'pending-score':
+        changes['pending_count'] = F('pending_count') + 1
+    if application.ahp_score is not None:
+        changes.update(_score_changes([application.ahp_score]))
+    _apply(application.job_id, **changes)
+
+
+def record_applications(applications):
+    """Comptabilise un lot de nouvelles candidatures (un UPDATE par offre)"""
+    by_job = {}
+    for application in applications:
+        by_job.setdefault(application.job_id, []).append(application)
+
+    for job_id, group in by_job.items():
+        changes = {'application_count': F('application_count') + len(group)}
+        pending = sum(application.status == 'pending-score' for application in group)
+        if pending:
+            changes['pending_count'] = F('pending_count') + pending
+        scores = [application.ahp_score for application in group if application.ahp_score is not None]
+        if scores:
+            changes.update(_score_changes(scores))
+        _apply(job_id, **changes)
+
+
+def record_scored(job_id, scores, pending=True):
+    """
+    Comptabilise des candidatures qui viennent d'être scorées.
+    pending: Les candidatures étaient en attente de score ('pending-score')
+    """
+    scores = [score for score in scores if score is not None]
+    if not scores:
+        return
+    changes = _score_changes(scores)
+    if pending:
+        changes['pending_count'] = F('pending_count') - len(scores)
+    _apply(job_id, **changes)
+
+
+def record_removal(application):
+    """
+    Retire des statistiques une candidature (déjà supprimée de la base).
+    Si elle détenait le score minimal ou maximal, les extrema sont relus sur l'index (offre, score).
+    """
+    changes = {'application_count': F('application_count') - 1}
+    if application.status == 'pending-score':
+        changes['pending_count'] = F('pending_count') - 1
+    score = application.ahp_score
+    if score is not None:
+        changes.update(
+            scored_count=F('scored_count') - 1,
+            score_sum=F('score_sum') - score,
+            score_sum_sq=F('score_sum_sq') - score * score,
+        )
+    _apply(application.job_id, **changes)
+
+    if score is not None and JobStats.objects.filter(Q(min_score=score) | Q(max_score=score), job_id=application.job_id).exists():
+        extrema = CandidateApplication.objects.filter(job_id=application.job_id).aggregate(
+            min_score=Min('ahp_score'), max_score=Max('ahp_score')
+        )
+        JobStats.objects.filter(job_id=application.job_id).update(**extrema)
+
+
+def get_job_stats(job):
+    """Statistiques de l'offre (ligne vide si l'offre n'a encore reçu aucune candidature)"""
+    return JobStats.objects.filter(job=job).first() or JobStats(job=job)
+
+
+def compute_job_stats():
+    """
+    Recalcule les statistiques de toutes les offres en une seule requête groupée.
+    Retourne un dictionnaire {job_id: JobStats non enregistré}.
+    """
+    rows = CandidateApplication.objects.values('job_id').annotate(
+        application_count=Count('id'),
+        pending_count=Count('id', filter=Q(status='pending-score')),
+        scored_count=Count('ahp_score'),
+        score_sum=Coalesce(Sum('ahp_score'), Value(0.0)),
+        score_sum_sq=Coalesce(Sum(F('ahp_score') * F('ahp_score'), output_field=FloatField()), Value(0.0)),
+        min_score=Min('ahp_score'),
+        max_score=Max('ahp_score'),
+    ).order_by()
+    return {row['job_id']: JobStats(**row) for row in rows}
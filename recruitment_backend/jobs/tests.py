@@ -1,3 +1,876 @@
-from django.test import TestCase
+import asyncio
+import csv
+import gzip
+import io
+import json
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from ga_optimization import runs
+from ga_optimization.models import OptimizationRun
+from ga_optimization.runs import STALE_ERROR
+from users.models import User, CandidateProfile, EmployerProfile
+from .ahp import get_scoring_plan, invalidate_scoring_plan
+from .bulk_import import import_applications
+from .models import Job, Constraint, SkillRequirement, CandidateApplication, ScoringTask
+from .persistence import persist_scores, snapshot
+from .ranking import RANK_ORDERING, annotate_ranks, insert_application_rank, rerank_job
+from .scoring_queue import CLAIM_TIMEOUT, claim_tasks, enqueue_scoring, process_task, score_pending_applications
+from .serializers import JobSerializer
+from .stats import compute_job_stats, get_job_stats
+
+
+class ApplicationListingQueriesTest(TestCase):
+    """
+    Le nombre de requêtes des listes de candidatures ne doit pas dépendre du nombre de résultats.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Développeur', description='Python', salary=1000,
+            location='Yaoundé', deadline='2030-01-01',
+        )
+        self.client = APIClient()
+
+    def add_applications(self, count):
+        for _ in range(count):
+            index = CandidateProfile.objects.count()
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user, bio='python')
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=index, status='pending')
+
+    def count_queries(self, method, url):
+        self.client.force_authenticate(self.employer.user)
+        with CaptureQueriesContext(connection) as context:
+            response = getattr(self.client, method)(url, format='json')
+        self.assertLess(response.status_code, 300, response.content)
+        return len(context.captured_queries), response
+
+    def test_list_for_job_queries_are_constant(self):
+        self.add_applications(2)
+        few, _ = self.count_queries('get', f'/api/applications/{self.job.pk}/list_for_job/')
+        self.add_applications(10)
+        many, response = self.count_queries('get', f'/api/applications/{self.job.pk}/list_for_job/')
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data['results']), 12)
+        self.assertIn('candidate_username', response.data['results'][0])
+
+    def test_my_applications_queries_are_constant(self):
+        user = User.objects.create_user(username='me', email='me@example.com', password='pass', role='candidate')
+        candidate = CandidateProfile.objects.create(user=user)
+        jobs = [
+            Job.objects.create(employer=self.employer, title=f'Offre {i}', description='', salary=1, location='', deadline='2030-01-01')
+            for i in range(6)
+        ]
+        self.client.force_authenticate(user)
+        CandidateApplication.objects.create(candidate=candidate, job=jobs[0])
+        with self.assertNumQueries(1):
+            self.client.get('/api/applications/my_applications/')
+        for job in jobs[1:]:
+            CandidateApplication.objects.create(candidate=candidate, job=job)
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/applications/my_applications/')
+        self.assertEqual(len(response.data['results']), 6)
+
+    def test_ga_optimization_queries_are_constant(self):
+        self.add_applications(2)
+        few, _ = self.count_queries('post', f'/api/ga/{self.job.pk}/run/')
+        self.add_applications(10)
+        many, response = self.count_queries('post', f'/api/ga/{self.job.pk}/run/')
+        self.assertEqual(few, many)
+        self.assertEqual(len(response.data['applications']), 12)
+
+
+class GAOptimizationAccessTest(TestCase):
+    """
+    Les vues de l'algorithme génétique sont réservées à l'employeur propriétaire de l'offre.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Développeur', description='', salary=1000, location='Douala', deadline='2030-01-01',
+        )
+        for index in range(2):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user)
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=10 * (index + 1), status='pending')
+        self.client = APIClient()
+
+    def urls(self, job_id):
+        return [
+            ('post', f'/api/ga/{job_id}/run/'),
+            ('post', f'/api/ga/{job_id}/optimize/'),
+            ('get', f'/api/ga/{job_id}/applications/'),
+        ]
+
+    def test_anonymous_is_rejected(self):
+        for method, url in self.urls(self.job.pk):
+            response = getattr(self.client, method)(url, format='json')
+            self.assertEqual(response.status_code, 401, url)
+
+    def test_candidate_is_forbidden(self):
+        self.client.force_authenticate(User.objects.get(username='candidate0'))
+        for method, url in self.urls(self.job.pk):
+            response = getattr(self.client, method)(url, format='json')
+            self.assertEqual(response.status_code, 403, url)
+
+    def test_other_employer_gets_404(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='employer')
+        EmployerProfile.objects.create(user=other, company_name='Autre', sector='IT')
+        self.client.force_authenticate(other)
+        for method, url in self.urls(self.job.pk):
+            response = getattr(self.client, method)(url, format='json')
+            self.assertEqual(response.status_code, 404, url)
+        self.assertFalse(CandidateApplication.objects.filter(ag_score__isnull=False).exists())
+
+    def test_owner_reads_applications(self):
+        self.client.force_authenticate(self.employer.user)
+        response = self.client.get(f'/api/ga/{self.job.pk}/applications/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(len(response.data), 2)
+
+
+class KeysetPaginationTest(TestCase):
+    """
+    Parcours complet des pages de candidatures (scores égaux et scores nuls compris).
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(
+            employer=employer, title='Développeur', description='', salary=1000, location='Douala', deadline='2030-01-01',
+        )
+        scores = [50, 80, 80, 80, None, 10, 95, None, 80, 30, 60]
+        for index, score in enumerate(scores):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user)
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=score, status='pending')
+        self.client = APIClient()
+        self.client.force_authenticate(employer_user)
+
+    def collect(self, url):
+        ids = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200, response.content)
+            self.assertLessEqual(len(response.data['results']), 3)
+            ids.extend(row['id'] for row in response.data['results'])
+            url = response.data['next']
+        return ids
+
+    def test_pages_follow_score_order(self):
+        ids = self.collect(f'/api/applications/{self.job.pk}/list_for_job/?page_size=3')
+        expected = sorted(
+            CandidateApplication.objects.all(),
+            key=lambda application: (application.ahp_score is None, -(application.ahp_score or 0), application.id),
+        )
+        self.assertEqual(ids, [application.id for application in expected])
+
+    def test_listing_export_and_ranks_agree(self):
+        rerank_job(self.job)
+        listed = self.collect(f'/api/applications/{self.job.pk}/list_for_job/?page_size=3')
+        ranked = CandidateApplication.objects.filter(rank__isnull=False).order_by('rank').values_list('id', flat=True)
+        self.assertEqual(listed[:len(ranked)], list(ranked))
+
+        response = self.client.get(f'/api/applications/{self.job.pk}/export/?export_format=jsonl')
+        exported = [json.loads(line)['id'] for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(exported, listed)
+
+    def test_score_range_filter(self):
+        ids = self.collect(f'/api/applications/{self.job.pk}/list_for_job/?page_size=3&min_score=50&max_score=80')
+        self.assertEqual(len(ids), 6)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(f'/api/applications/{self.job.pk}/list_for_job/?cursor=invalide')
+        self.assertEqual(response.status_code, 404)
+
+
+class HotQueryIndexTest(TestCase):
+    """
+    Les requêtes les plus fréquentes doivent être servies par un index (plan EXPLAIN).
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Développeur', description='', salary=1000, location='Douala', deadline='2030-01-01',
+        )
+        user = User.objects.create_user(username='candidate', email='candidate@example.com', password='pass', role='candidate')
+        self.candidate = CandidateProfile.objects.create(user=user)
+
+    def assertUsesIndex(self, queryset, *index_names):
+        plan = queryset.explain()
+        pattern = '|'.join(index_names)
+        if connection.vendor == 'sqlite':
+            pattern = rf'USING (COVERING )?INDEX ({pattern})'
+        self.assertRegex(plan, pattern)
+
+    def test_pending_applications_of_job(self):
+        queryset = CandidateApplication.objects.filter(job=self.job, status='pending')
+        self.assertUsesIndex(queryset, 'application_job_status_idx')
+
+    def test_applications_of_job_by_score(self):
+        queryset = CandidateApplication.objects.filter(job=self.job).order_by(*RANK_ORDERING)
+        self.assertUsesIndex(queryset, 'application_job_score_idx')
+
+    def test_duplicate_application_check(self):
+        queryset = CandidateApplication.objects.filter(candidate=self.candidate, job=self.job)
+        # SQLite crée la contrainte d'unicité dans la table, avec un index automatique
+        self.assertUsesIndex(queryset, 'unique_application_per_job', 'sqlite_autoindex_jobs_candidateapplication')
+
+    def test_jobs_of_employer(self):
+        queryset = Job.objects.filter(employer=self.employer).order_by('-created_at')
+        self.assertUsesIndex(queryset, 'job_employer_created_idx')
+
+    def test_constraints_of_job_by_type(self):
+        queryset = Constraint.objects.filter(job=self.job, type='hard')
+        self.assertUsesIndex(queryset, 'constraint_job_type_idx')
+
+    def test_duplicate_application_is_rejected(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.candidate.user)
+        first = self.client.post('/api/applications/', {'job': self.job.pk}, format='json')
+        second = self.client.post('/api/applications/', {'job': self.job.pk}, format='json')
+        self.assertEqual(first.status_code, 201, first.content)
+        self.assertEqual(second.status_code, 400)
+        self.assertEqual(CandidateApplication.objects.filter(candidate=self.candidate, job=self.job).count(), 1)
+
+
+class JobStatsTest(TestCase):
+    """
+    Les statistiques tenues à jour incrémentalement doivent égaler un recalcul complet.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(
+            employer=self.employer, title='Développeur', description='', salary=1000, location='Douala', deadline='2030-01-01',
+        )
+        SkillRequirement.objects.create(job=self.job, name='python', value='Expert', weight=2)
+        SkillRequirement.objects.create(job=self.job, name='django', value='Expert', weight=1)
+        self.client = APIClient()
+
+    def apply(self, bio):
+        index = CandidateProfile.objects.count()
+        user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+        CandidateProfile.objects.create(user=user, bio=bio)
+        self.client.force_authenticate(user)
+        response = self.client.post('/api/applications/', {'job': self.job.pk}, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.data['id']
+
+    def assertStatsConsistent(self):
+        stats = get_job_stats(self.job)
+        expected = compute_job_stats()[self.job.pk]
+        for field in ('application_count', 'pending_count', 'scored_count', 'min_score', 'max_score'):
+            self.assertEqual(getattr(stats, field), getattr(expected, field), field)
+        self.assertAlmostEqual(stats.score_sum, expected.score_sum)
+        self.assertAlmostEqual(stats.score_sum_sq, expected.score_sum_sq)
+        return stats
+
+    @override_settings(SCORING_ASYNC=False)
+    def test_synchronous_scoring(self):
+        for bio in ('python django', 'python', 'django', 'java'):
+            self.apply(bio)
+        stats = self.assertStatsConsistent()
+        self.assertEqual((stats.application_count, stats.scored_count), (4, 4))
+
+        self.client.force_authenticate(self.employer.user)
+        response = self.client.get(f'/api/jobs/{self.job.pk}/summary/')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['max_score'], 100)
+        self.assertEqual(response.data['min_score'], 0)
+        self.assertAlmostEqual(response.data['mean_score'], 50)
+        response = self.client.get(f'/api/jobs/{self.job.pk}/applications_count/')
+        self.assertEqual(response.data['count'], 4)
+
+    @override_settings(SCORING_ASYNC=True)
+    def test_asynchronous_scoring_and_removal(self):
+        ids = [self.apply(bio) for bio in ('python django', 'python', 'java')]
+        stats = self.assertStatsConsistent()
+        self.assertEqual((stats.pending_count, stats.scored_count), (3, 0))
+
+        score_pending_applications(self.job)
+        stats = self.assertStatsConsistent()
+        self.assertEqual((stats.pending_count, stats.scored_count, stats.max_score), (0, 3, 100))
+
+        # Suppression de la meilleure candidature : le maximum est relu
+        self.client.delete(f'/api/applications/{ids[0]}/')
+        stats = self.assertStatsConsistent()
+        self.assertEqual(stats.application_count, 2)
+
+
+class JobPayloadCacheTest(TestCase):
+    """
+    Liste publique des offres servie depuis le cache, invalidée à la modification, avec ETag.
+    """
+
+    def setUp(self):
+        cache.clear()
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.jobs = []
+        for index in range(5):
+            job = Job.objects.create(
+                employer=self.employer, title=f'Offre {index}', description='', salary=1000, location='Douala', deadline='2030-01-01',
+            )
+            Constraint.objects.create(job=job, type='hard', name='Langue', value='Français')
+            SkillRequirement.objects.create(job=job, name='python', value='Expert', weight=1)
+            self.jobs.append(job)
+        self.client = APIClient()
+
+    def test_cached_list_skips_serialization_queries(self):
+        with CaptureQueriesContext(connection) as cold:
+            first = self.client.get('/api/job_list/')
+        with self.assertNumQueries(1):
+            second = self.client.get('/api/job_list/')
+        self.assertGreater(len(cold.captured_queries), 1)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(second.data['results'][0]['constraints']), 1)
+
+    def test_update_invalidates_payload(self):
+        self.client.get(f'/api/job_list/{self.jobs[0].pk}/')
+        self.client.force_authenticate(self.employer.user)
+        response = self.client.patch(
+            f'/api/jobs/{self.jobs[0].pk}/',
+            {'title': 'Nouveau titre'},
+            format='json',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        response = self.client.get(f'/api/job_list/{self.jobs[0].pk}/')
+        self.assertEqual(response.data['title'], 'Nouveau titre')
+
+    def test_if_none_match_returns_304(self):
+        response = self.client.get('/api/job_list/')
+        etag = response['ETag']
+        response = self.client.get('/api/job_list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Job.objects.filter(pk=self.jobs[-1].pk).update(title='Modifiée', updated_at=self.jobs[-1].updated_at.replace(year=2031))
+        response = self.client.get('/api/job_list/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class JobNestedWritesTest(TestCase):
+    """
+    Écriture groupée des critères : nombre de requêtes constant, mise à jour par différence.
+    """
+
+    def setUp(self):
+        cache.clear()
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.client = APIClient()
+        self.client.force_authenticate(employer_user)
+
+    def job_data(self, criteria):
+        return {
+            'title': 'Développeur', 'description': 'Python', 'salary': 1000, 'location': 'Douala', 'deadline': '2030-01-01',
+            'constraints': [{'type': 'hard', 'name': f'Contrainte {i}', 'value': 'Oui', 'weight': 1} for i in range(criteria)],
+            'skill_requirements': [{'name': f'skill{i}', 'value': 'Expert', 'weight': 1} for i in range(criteria)],
+        }
+
+    def create_job(self, criteria):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post('/api/jobs/', self.job_data(criteria), format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return len(context.captured_queries), response.data
+
+    def test_create_queries_are_constant(self):
+        few, _ = self.create_job(2)
+        # 200 critères : 100 contraintes et 100 compétences (un seul lot d'insertion chacun, même sous SQLite)
+        many, data = self.create_job(100)
+        self.assertEqual(few, many)
+        self.assertEqual(len(data['constraints']) + len(data['skill_requirements']), 200)
+
+    def test_duplicate_names_are_ignored(self):
+        data = self.job_data(2)
+        data['skill_requirements'].append({'name': 'skill0', 'value': 'Débutant', 'weight': 5})
+        response = self.client.post('/api/jobs/', data, format='json')
+        skills = SkillRequirement.objects.filter(job_id=response.data['id'])
+        self.assertEqual(sorted(skills.values_list('name', 'value')), [('skill0', 'Expert'), ('skill1', 'Expert')])
+
+    def test_update_touches_only_changed_criteria(self):
+        _, data = self.create_job(3)
+        job_id = data['id']
+        kept = SkillRequirement.objects.get(job_id=job_id, name='skill0')
+        response = self.client.patch(f'/api/jobs/{job_id}/', {
+            'skill_requirements': [
+                {'name': 'skill0', 'value': 'Expert', 'weight': 1},
+                {'name': 'skill1', 'value': 'Débutant', 'weight': 1},
+                {'name': 'skill9', 'value': 'Expert', 'weight': 2},
+            ],
+        }, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+
+        skills = {skill.name: skill for skill in SkillRequirement.objects.filter(job_id=job_id)}
+        self.assertEqual(sorted(skills), ['skill0', 'skill1', 'skill9'])
+        self.assertEqual(skills['skill0'].pk, kept.pk)
+        self.assertEqual(skills['skill1'].value, 'Débutant')
+        # Les contraintes non envoyées restent inchangées
+        self.assertEqual(Constraint.objects.filter(job_id=job_id).count(), 3)
+        self.assertEqual(len(response.data['skill_requirements']), 3)
+
+    def test_partial_update_requires_criteria_fields(self):
+        _, data = self.create_job(1)
+        job_id = data['id']
+        # Critère sans nom
+        response = self.client.patch(f'/api/jobs/{job_id}/', {'constraints': [{'type': 'hard', 'value': 'x'}]}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertIn('name', response.data['constraints'][0])
+        # Nouveau critère incomplet
+        response = self.client.patch(f'/api/jobs/{job_id}/', {'skill_requirements': [{'name': 'new'}]}, format='json')
+        self.assertEqual(response.status_code, 400, response.content)
+        self.assertEqual(sorted(response.data['skill_requirements'][0]), ['value', 'weight'])
+        self.assertEqual(SkillRequirement.objects.filter(job_id=job_id).count(), 1)
+        # Un critère existant peut être modifié champ par champ
+        response = self.client.patch(f'/api/jobs/{job_id}/', {'skill_requirements': [{'name': 'skill0', 'weight': 3}]}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(SkillRequirement.objects.get(job_id=job_id, name='skill0').weight, 3)
+
+
+class BulkImportTest(TestCase):
+    """
+    Import en masse CSV / JSONL : insertion par lots, erreurs par ligne, scoring final.
+    """
+
+    def setUp(self):
+        cache.clear()
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        self.employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.client = APIClient()
+        self.client.force_authenticate(employer_user)
+
+    def upload(self, url, name, content):
+        response = self.client.post(url, {'file': SimpleUploadedFile(name, content.encode())}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def test_import_jobs_csv(self):
+        content = (
+            'title,description,salary,location,deadline,skill_requirements\n'
+            'Développeur,Python,1000,Douala,2030-01-01,"[{""name"": ""python"", ""value"": ""Expert"", ""weight"": 1}]"\n'
+            'Sans salaire,Java,,Yaoundé,2030-01-01,\n'
+            'Analyste,SQL,900,Yaoundé,2030-01-01,\n'
+        )
+        report = self.upload('/api/jobs/import/', 'offres.csv', content)
+        self.assertEqual((report['created'], report['error_count']), (2, 1))
+        self.assertEqual(report['errors'][0]['line'], 3)
+        self.assertIn('salary', report['errors'][0]['errors'])
+        self.assertEqual(SkillRequirement.objects.filter(job__title='Développeur').count(), 1)
+
+    def test_import_applications_jsonl_scores_once(self):
+        job = Job.objects.create(employer=self.employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        SkillRequirement.objects.create(job=job, name='python', value='Expert', weight=1)
+        for index, bio in enumerate(['python', 'java', 'python django']):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            CandidateProfile.objects.create(user=user, bio=bio)
+
+        lines = [
+            {'job': job.pk, 'candidate': 'candidate0'},
+            {'job': job.pk, 'candidate': 'candidate1', 'status': 'accepted'},
+            {'job': job.pk, 'candidate': 'candidate0'},
+            {'job': job.pk, 'candidate': 'inconnu'},
+            {'job': job.pk + 1, 'candidate': 'candidate2'},
+            {'job': job.pk, 'candidate': 'candidate2'},
+        ]
+        content = '\n'.join(json.dumps(line) for line in lines) + '\nnot json\n'
+        report = self.upload('/api/jobs/import_applications/', 'candidatures.jsonl', content)
+        self.assertEqual((report['created'], report['scored'], report['error_count']), (3, 3, 4))
+        self.assertEqual(sorted(error['line'] for error in report['errors']), [3, 4, 5, 7])
+
+        scores = dict(CandidateApplication.objects.values_list('candidate__user__username', 'ahp_score'))
+        self.assertEqual(scores, {'candidate0': 100, 'candidate1': 0, 'candidate2': 100})
+        self.assertEqual(sorted(CandidateApplication.objects.values_list('rank', flat=True)), [1, 2, 3])
+        self.assertEqual(get_job_stats(job).scored_count, 3)
+
+    def test_applications_are_scored_by_batches(self):
+        jobs = [
+            Job.objects.create(employer=self.employer, title=f'Offre {index}', description='', salary=1, location='', deadline='2030-01-01')
+            for index in range(2)
+        ]
+        for job in jobs:
+            SkillRequirement.objects.create(job=job, name='python', value='Expert', weight=1)
+        rows = []
+        for index, bio in enumerate(['python', 'java', 'python', 'java', 'python']):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            CandidateProfile.objects.create(user=user, bio=bio)
+            rows.extend((len(rows) + 1, {'job': job.pk, 'candidate': user.username}) for job in jobs)
+
+        with mock.patch('jobs.scoring_queue.rerank_job', wraps=rerank_job) as rerank:
+            report = import_applications(iter(rows), Job.objects.filter(employer=self.employer), batch_size=3)
+        self.assertEqual((report.created, report.scored, report.error_count), (10, 10, 0))
+        # Un seul recalcul du classement par offre, quel que soit le nombre de lots
+        self.assertEqual(sorted(call.args[0].pk for call in rerank.call_args_list), [job.pk for job in jobs])
+        for job in jobs:
+            scores = list(CandidateApplication.objects.filter(job=job).order_by('rank').values_list('ahp_score', flat=True))
+            self.assertEqual(scores, [100, 100, 100, 0, 0])
+            self.assertEqual(get_job_stats(job).scored_count, 5)
+
+
+class ApplicationExportTest(TestCase):
+    """
+    Export en flux du classement : ordre, formats CSV / JSONL et compression gzip.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        for index, score in enumerate([40, None, 90, 65]):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user)
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=score)
+        self.client = APIClient()
+        self.client.force_authenticate(employer_user)
+
+    def export(self, query='', **headers):
+        response = self.client.get(f'/api/applications/{self.job.pk}/export/{query}', **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_export_follows_ranking(self):
+        _, content = self.export()
+        rows = list(csv.DictReader(io.StringIO(content.decode())))
+        self.assertEqual([row['candidate_username'] for row in rows], ['candidate2', 'candidate3', 'candidate0', 'candidate1'])
+        self.assertEqual(rows[0]['candidate_email'], 'candidate2@example.com')
+        self.assertEqual(rows[-1]['ahp_score'], '')
+
+    def test_gzip_jsonl_export(self):
+        response, content = self.export('?export_format=jsonl&min_score=50', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        rows = [json.loads(line) for line in gzip.decompress(content).decode().splitlines()]
+        self.assertEqual([row['ahp_score'] for row in rows], [90, 65])
+
+    def test_other_employer_cannot_export(self):
+        other = User.objects.create_user(username='other', email='other@example.com', password='pass', role='employer')
+        self.client.force_authenticate(other)
+        response = self.client.get(f'/api/applications/{self.job.pk}/export/')
+        self.assertEqual(response.status_code, 404)
+
+
+class AsyncEndpointsTest(TransactionTestCase):
+    """
+    Vues asynchrones : optimisation en arrière-plan (polling, SSE), scoring et classement.
+    """
+
+    def setUp(self):
+        self.employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=self.employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        SkillRequirement.objects.create(job=self.job, name='python', value='Expert', weight=1)
+        for index, (bio, status) in enumerate([('python', 'pending'), ('java', 'pending'), ('python', 'pending-score')]):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user, bio=bio)
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=10 * (index + 1), status=status)
+
+    async def test_optimization_run_lifecycle(self):
+        await self.async_client.aforce_login(self.employer_user)
+        response = await self.async_client.post(
+            f'/api/ga/{self.job.pk}/runs/', {'population_size': 10, 'generations': 5}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 202, response.content)
+        run = response.json()
+        self.assertEqual(run['applications_count'], 2)
+
+        for _ in range(100):
+            run = (await self.async_client.get(run['status_url'])).json()
+            if run['status'] in ('done', 'failed'):
+                break
+            await asyncio.sleep(0.05)
+        self.assertEqual(run['status'], 'done', run)
+        self.assertEqual(await CandidateApplication.objects.filter(status='pending', ag_score__isnull=False).acount(), 2)
+
+        response = await self.async_client.get(run['events_url'])
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn('event: status', content)
+        self.assertIn('"status": "done"', content)
+
+    async def test_score_and_rerank(self):
+        await self.async_client.aforce_login(self.employer_user)
+        response = await self.async_client.post(f'/api/jobs/{self.job.pk}/score/')
+        self.assertEqual(response.json(), {'scored': 1})
+        response = await self.async_client.post(f'/api/jobs/{self.job.pk}/rerank/')
+        self.assertEqual(response.status_code, 200)
+        ranks = [rank async for rank in CandidateApplication.objects.order_by('rank').values_list('rank', flat=True)]
+        self.assertEqual(ranks, [1, 2, 3])
+
+    async def test_interrupted_run_is_marked_failed(self):
+        await self.async_client.aforce_login(self.employer_user)
+        # Optimisation d'un processus arrêté : plus aucun signe de vie
+        interrupted = await OptimizationRun.objects.acreate(
+            job=self.job, requested_by=self.employer_user, status='running',
+            heartbeat_at=timezone.now() - timedelta(seconds=settings.GA_RUN_STALE_TIMEOUT + 1),
+        )
+        alive = await OptimizationRun.objects.acreate(job=self.job, requested_by=self.employer_user, status='running')
+
+        run = (await self.async_client.get(f'/api/ga/runs/{interrupted.pk}/')).json()
+        self.assertEqual(run['status'], 'failed')
+        self.assertEqual(run['error'], STALE_ERROR)
+        run = (await self.async_client.get(f'/api/ga/runs/{alive.pk}/')).json()
+        self.assertEqual(run['status'], 'running')
+
+        # Le flux SSE se termine au lieu d'attendre indéfiniment
+        response = await self.async_client.get(f'/api/ga/runs/{interrupted.pk}/events/')
+        content = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn('"status": "failed"', content)
+
+    async def test_heartbeat_keeps_owned_runs_alive(self):
+        stale = timezone.now() - timedelta(seconds=settings.GA_RUN_STALE_TIMEOUT + 1)
+        owned = await OptimizationRun.objects.acreate(job=self.job, requested_by=self.employer_user, status='running', heartbeat_at=stale)
+        other = await OptimizationRun.objects.acreate(job=self.job, requested_by=self.employer_user, status='running', heartbeat_at=stale)
+        with mock.patch.object(runs, '_owned', {owned.pk}):
+            self.assertEqual(await sync_to_async(runs.heartbeat)(), 1)
+        self.assertFalse(await runs.stale_runs().filter(pk=owned.pk).aexists())
+        self.assertTrue(await runs.stale_runs().filter(pk=other.pk).aexists())
+
+    async def test_requires_employer(self):
+        response = await self.async_client.post(f'/api/ga/{self.job.pk}/runs/', {}, content_type='application/json')
+        self.assertEqual(response.status_code, 401)
+
+
+class PersistScoresTest(TestCase):
+    """
+    Écriture groupée des scores : avec un instantané, seules les lignes et colonnes modifiées sont écrites.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        for index in range(4):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user)
+            CandidateApplication.objects.create(candidate=candidate, job=self.job, ahp_score=10 * index, ag_score=1, status='pending')
+        self.applications = list(CandidateApplication.objects.order_by('id'))
+
+    def test_only_changed_rows_and_columns_are_written(self):
+        fields = ['ahp_score', 'ag_score', 'status']
+        original = snapshot(self.applications, fields)
+        self.applications[1].ahp_score = 99
+        self.applications[3].ahp_score = 42
+        # Valeur réaffectée à l'identique : pas une modification
+        self.applications[2].status = 'pending'
+
+        with CaptureQueriesContext(connection) as context:
+            result = persist_scores(self.applications, fields, original=original, batch_size=1)
+        self.assertEqual((result.rows, result.batches), (2, 2))
+        updates = [query['sql'] for query in context.captured_queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        for sql in updates:
+            self.assertIn('"ahp_score"', sql)
+            self.assertNotIn('"ag_score"', sql)
+            self.assertNotIn('"status"', sql)
+        scores = list(CandidateApplication.objects.order_by('id').values_list('ahp_score', flat=True))
+        self.assertEqual(scores, [0, 99, 20, 42])
+
+    def test_unchanged_applications_write_nothing(self):
+        original = snapshot(self.applications, ['ahp_score'])
+        with self.assertNumQueries(0):
+            result = persist_scores(self.applications, ['ahp_score'], original=original)
+        self.assertEqual(result.rows, 0)
+
+    def test_without_snapshot_every_row_is_written(self):
+        result = persist_scores(self.applications, ['ahp_score', 'status'], batch_size=3)
+        self.assertEqual((result.rows, result.batches), (4, 2))
+
+    def test_ga_rewrites_only_changed_ag_scores(self):
+        # Score AHP nul : le score AG reste 0 quelle que soit la sélection, la ligne n'est pas réécrite
+        unchanged = self.applications[0]
+        CandidateApplication.objects.filter(pk=unchanged.pk).update(ag_score=0)
+        self.client = APIClient()
+        self.client.force_authenticate(self.job.employer.user)
+        with mock.patch.object(CandidateApplication.objects, 'bulk_update') as bulk_update:
+            response = self.client.post(f'/api/ga/{self.job.pk}/optimize/', {'population_size': 10, 'generations': 3}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        written = [application.pk for call in bulk_update.call_args_list for application in call.args[0]]
+        self.assertEqual(sorted(written), [application.pk for application in self.applications[1:]])
+
+
+class IncrementalRankingTest(TestCase):
+    """
+    Le classement tenu à jour à chaque insertion doit égaler le classement recalculé (annotate_ranks).
+    """
+
+    SCORES = [50, 80, None, 80, 95, 50, None, 10, 80, 95]
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        self.applications = []
+        for index in range(len(self.SCORES)):
+            user = User.objects.create_user(username=f'candidate{index}', email=f'candidate{index}@example.com', password='pass', role='candidate')
+            candidate = CandidateProfile.objects.create(user=user)
+            self.applications.append(CandidateApplication.objects.create(candidate=candidate, job=self.job))
+
+    def assertRanksMatchWindow(self):
+        expected = dict(annotate_ranks(CandidateApplication.objects.filter(job=self.job)).values_list('id', 'computed_rank'))
+        stored = dict(CandidateApplication.objects.filter(job=self.job).values_list('id', 'rank'))
+        # Les candidatures sans score ne sont pas classées
+        self.assertEqual(stored, {pk: expected.get(pk) for pk in stored})
+        self.assertEqual(sorted(expected.values()), list(range(1, len(expected) + 1)))
+
+    def insert(self, order):
+        for index in order:
+            application = self.applications[index]
+            application.ahp_score = self.SCORES[index]
+            application.save(update_fields=['ahp_score'])
+            rank = insert_application_rank(application)
+            self.assertEqual(rank, application.rank)
+            self.assertRanksMatchWindow()
+
+    def test_insertion_in_arrival_order(self):
+        self.insert(range(len(self.SCORES)))
+
+    def test_insertion_out_of_arrival_order(self):
+        # Une candidature plus ancienne, à score égal, passe devant les plus récentes déjà classées
+        self.insert(reversed(range(len(self.SCORES))))
+
+    def test_ties_are_ordered_by_age(self):
+        self.insert(range(len(self.SCORES)))
+        ranked = CandidateApplication.objects.filter(job=self.job, rank__isnull=False).order_by('rank')
+        self.assertEqual(
+            [(application.ahp_score, application.pk) for application in ranked],
+            sorted(((score, application.pk) for score, application in zip(self.SCORES, self.applications) if score is not None),
+                   key=lambda item: (-item[0], item[1])),
+        )
+
+    def test_interleaved_creations(self):
+        # C=40 déjà classée ; A=50 et B=60 sont créées avant que l'une ou l'autre ne soit insérée
+        c, a, b = self.applications[:3]
+        for application, score in ((c, 40), (a, 50), (b, 60)):
+            application.ahp_score = score
+            application.save(update_fields=['ahp_score'])
+        insert_application_rank(c)
+        self.assertEqual(insert_application_rank(a), 1)
+        self.assertEqual(insert_application_rank(b), 1)
+        ranks = dict(CandidateApplication.objects.filter(pk__in=[a.pk, b.pk, c.pk]).values_list('pk', 'rank'))
+        self.assertEqual(ranks, {b.pk: 1, a.pk: 2, c.pk: 3})
+        self.assertRanksMatchWindow()
+
+    def test_rerank_rewrites_only_wrong_ranks(self):
+        self.insert(range(len(self.SCORES)))
+        first = CandidateApplication.objects.get(rank=1)
+        CandidateApplication.objects.filter(pk=first.pk).update(rank=99)
+        self.assertEqual(rerank_job(self.job), 1)
+        self.assertRanksMatchWindow()
+
+
+class ScoringQueueTest(TestCase):
+    """
+    File de scoring : réservation exclusive des tâches, reprise des tâches abandonnées, regroupement.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.jobs = [
+            Job.objects.create(employer=employer, title=f'Offre {index}', description='', salary=1, location='', deadline='2030-01-01')
+            for index in range(3)
+        ]
+        for job in self.jobs:
+            enqueue_scoring(job)
+
+    def test_task_is_never_claimed_twice(self):
+        real_filter = ScoringTask.objects.filter
+        raced = {}
+
+        def racing_filter(*args, **kwargs):
+            # Un autre worker réserve toutes les tâches entre la lecture et la réservation de ce worker
+            if 'claimed_at' in kwargs and 'tasks' not in raced:
+                raced['tasks'] = []
+                raced['tasks'] = claim_tasks('worker-a', 10)
+            return real_filter(*args, **kwargs)
+
+        with mock.patch.object(ScoringTask.objects, 'filter', side_effect=racing_filter):
+            claimed = claim_tasks('worker-b', 10)
+        self.assertEqual(claimed, [])
+        self.assertEqual(len(raced['tasks']), 3)
+        self.assertEqual(set(ScoringTask.objects.values_list('claimed_by', flat=True)), {'worker-a'})
+        self.assertEqual(claim_tasks('worker-c', 10), [])
+
+    def test_stale_claim_is_taken_over(self):
+        claim_tasks('worker-a', 10)
+        stale = ScoringTask.objects.get(job=self.jobs[0])
+        ScoringTask.objects.filter(pk=stale.pk).update(claimed_at=timezone.now() - CLAIM_TIMEOUT - timedelta(minutes=1))
+
+        claimed = claim_tasks('worker-b', 10)
+        self.assertEqual([task.pk for task in claimed], [stale.pk])
+        stale.refresh_from_db()
+        self.assertEqual((stale.claimed_by, stale.attempts), ('worker-b', 2))
+
+    def test_finished_task_is_deleted(self):
+        task = claim_tasks('worker-a', 1)[0]
+        process_task(task)
+        self.assertFalse(ScoringTask.objects.filter(pk=task.pk).exists())
+
+    def test_task_requested_again_is_released(self):
+        task = claim_tasks('worker-a', 1)[0]
+        # Nouvelle candidature pendant le traitement
+        ScoringTask.objects.filter(pk=task.pk).update(requested_at=task.claimed_at + timedelta(seconds=1))
+        process_task(task)
+
+        task = ScoringTask.objects.get(pk=task.pk)
+        self.assertEqual((task.claimed_at, task.claimed_by), (None, ''))
+        self.assertIn(task.pk, [claimed.pk for claimed in claim_tasks('worker-b', 10)])
+
+    def test_failed_task_is_released(self):
+        task = claim_tasks('worker-a', 1)[0]
+        with mock.patch('jobs.scoring_queue.score_pending_applications', side_effect=RuntimeError), \
+                self.assertLogs('jobs.scoring_queue', 'ERROR'), self.assertRaises(RuntimeError):
+            process_task(task)
+        task = ScoringTask.objects.get(pk=task.pk)
+        self.assertEqual((task.claimed_at, task.claimed_by), (None, ''))
+
+
+class ScoringPlanCacheTest(TestCase):
+    """
+    Plan de scoring compilé : réutilisé d'un appel à l'autre, reconstruit après modification des critères.
+    """
+
+    def setUp(self):
+        employer_user = User.objects.create_user(username='employer', email='employer@example.com', password='pass', role='employer')
+        employer = EmployerProfile.objects.create(user=employer_user, company_name='SBSE', sector='IT')
+        self.job = Job.objects.create(employer=employer, title='Développeur', description='', salary=1, location='', deadline='2030-01-01')
+        SkillRequirement.objects.create(job=self.job, name='python', value='Expert', weight=1)
+        invalidate_scoring_plan(self.job)
+
+    def test_plan_is_reused(self):
+        plan = get_scoring_plan(self.job)
+        # Seule la version du vocabulaire est relue (MAX(id) des alias)
+        with self.assertNumQueries(1):
+            self.assertIs(get_scoring_plan(self.job), plan)
+
+    def test_plan_is_rebuilt_after_criteria_update(self):
+        plan = get_scoring_plan(self.job)
+        serializer = JobSerializer(self.job, data={
+            'skill_requirements': [{'name': 'django', 'value': 'Expert', 'weight': 2}],
+        }, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        rebuilt = get_scoring_plan(Job.objects.get(pk=self.job.pk))
+        self.assertIsNot(rebuilt, plan)
+        self.assertEqual((rebuilt.needles, rebuilt.weights), (['django'], [2]))
+        self.assertIs(get_scoring_plan(self.job), rebuilt)
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import JobViewSet, CandateApplicationViewSet, JobListViewSet
+from . import async_views
 
 
 router = DefaultRouter()
@@ -10,5 +11,8 @@ router.register('job_list', JobListViewSet, basename='job-list')
 
 
 urlpatterns = [
+    # Vues asynchrones (ASGI)
+    path('jobs/<int:job_id>/score/', async_views.score_job, name='job-score'),
+    path('jobs/<int:job_id>/rerank/', async_views.rerank, name='job-rerank'),
     path('', include(router.urls)),
 ]
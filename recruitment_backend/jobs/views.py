@@ -2,19 +2,31 @@ from rest_framework import viewsets, status
 from rest_framework.permissions import IsAuthenticated, AllowAny 
 from rest_framework.response import Response 
 from rest_framework.decorators import action 
+from rest_framework.parsers import MultiPartParser
 from rest_framework import serializers
 from .models import Job, Constraint, SkillRequirement, CandidateApplication 
-from .serializers import JobSerializer, ConstraintSerializer, SkillRequirementSerializer, CandidateApplicationSerializer
+from .serializers import JobSerializer, ConstraintSerializer, SkillRequirementSerializer, CandidateApplicationSerializer, CandidateApplicationListSerializer, JobStatsSerializer
 from .ahp import calculate_candidate_score
+from .ranking import insert_application_rank, rerank_job
+from .scoring_queue import enqueue_scoring
+from .pagination import JobPagination, ApplicationScorePagination, ApplicationDatePagination
+from .filters import filter_jobs, filter_applications
+from .stats import get_job_stats, record_application, record_removal
+from .cache import CachedJobPayloadMixin, invalidate_job_payload
+from .bulk_import import detect_format, read_rows, import_jobs, import_applications
+from .export import EXPORT_FORMATS, streaming_export
 from users.permissions import IsEmployer, IsCandidate
 from users.models import CandidateProfile, EmployerProfile, User
 from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import IntegrityError, transaction
 
 # Gestion des annonces par l'employer
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(CachedJobPayloadMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer 
     permission_classes = [IsAuthenticated, IsEmployer]
+    pagination_class = JobPagination
     # Filtrage des offres par employeur
     
     def get_queryset(self):
@@ -31,8 +43,8 @@ class JobViewSet(viewsets.ModelViewSet):
             return Job.objects.none() # Retourne un queryset vide si pas de profil employer
         employer = user.employer_profile
         
-        # Filtre les offres par cet employeur
-        return Job.objects.filter(employer=employer).order_by('-created_at')    
+        # Filtre les offres par cet employeur (+ filtres ?status=&location=)
+        return filter_jobs(Job.objects.filter(employer=employer), self.request.query_params).order_by('-created_at')    
         
     def perform_create(self, serializer):
         user = self.request.user
@@ -52,42 +64,54 @@ class JobViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def active_jobs(self, request):
-        """Liste des offres actives"""
-        jobs = self.get_queryset().filter(is_active=True)
+        """Liste des offres actives (ouvertes), paginée"""
+        jobs = self.paginate_queryset(self.get_queryset().filter(status='open'))
         serializer = self.get_serializer(jobs, many=True)
-        return Response(serializer.data)
+        return self.get_paginated_response(serializer.data)
     
     def update(self, request, *args, **kwargs):
         """
-        Mise à jour d'une offre d'emploi avec suppression des anciennes contraintes et compétences
+        Mise à jour (partielle) d'une offre d'emploi. Les contraintes et compétences envoyées
+        remplacent les anciennes ; seules celles qui changent sont écrites (voir JobSerializer.update)
         """
-        instance = self.get_object()
-        
-        # Suppression des anciennes contraintes et compétences avant mise à jour
-        instance.constraints.all().delete()
-        instance.skill_requirements.all().delete()
-        
-        serializer = self.get_serializer(instance, data=request.data, partial=True)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        kwargs['partial'] = True
+        return super().update(request, *args, **kwargs)
+    
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_jobs(self, request):
+        """
+        Import en masse d'offres depuis un fichier CSV ou JSONL (champ `file`, ?import_format=csv|jsonl)
+        """
+        return self._import(request, lambda rows: import_jobs(rows, request.user.employer_profile))
 
-        # Ajouter les nouvelles contraintes et compétences
-        constraints_data = request.data.get('constraints', [])
-        skills_data = request.data.get('skill_requirements', [])
-        
-        for constraint_data in constraints_data:
-            Constraint.objects.create(job=instance, **constraint_data)
-        
-        for skill_data in skills_data:
-            SkillRequirement.objects.create(job=instance, **skill_data)
-        
-        return Response(serializer.data)
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def import_applications(self, request):
+        """
+        Import en masse de candidatures sur les offres de l'employeur (champ `file`, CSV ou JSONL).
+        Colonnes : job (id de l'offre), candidate (nom d'utilisateur), status (optionnel)
+        """
+        return self._import(request, lambda rows: import_applications(rows, self.get_queryset()))
+
+    def _import(self, request, run):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'detail': "Aucun fichier fourni (champ 'file')."}, status=status.HTTP_400_BAD_REQUEST)
+        if not hasattr(request.user, 'employer_profile'):
+            return Response({'detail': "L'utilisateur n'a pas de profil employeur associé."}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            import_format = detect_format(upload.name, request.query_params.get('import_format'))
+        except ValueError as exc:
+            return Response({'detail': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+        report = run(read_rows(upload, import_format))
+        return Response(report.as_dict(), status=status.HTTP_200_OK)
     
     def destroy(self, request, *args, **kwargs):
         """
         Suppression d'une offre d'emploi
         """
         instance = self.get_object()
+        invalidate_job_payload(instance)
         instance.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
     
@@ -111,18 +135,31 @@ class JobViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
     def applications_count(self, request, pk=None):
         """
-        Retourne le nombre de candidatures pour cette offre
+        Retourne le nombre de candidatures pour cette offre (lu dans les statistiques de l'offre)
+        """
+        job = self.get_object()
+        return Response({'count': get_job_stats(job).application_count}, status=status.HTTP_200_OK)
+    
+    @action(detail=True, methods=['get'], permission_classes=[IsAuthenticated])
+    def summary(self, request, pk=None):
+        """
+        Résumé des candidatures de l'offre : nombres, score AHP minimal, maximal, moyen et écart-type
         """
         job = self.get_object()
-        count = CandidateApplication.objects.filter(job=job).count()
-        return Response({'count': count}, status=status.HTTP_200_OK)
+        serializer = JobStatsSerializer(get_job_stats(job))
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 # Affichage des différents d'emplois postés par les candidats
-class JobListViewSet(viewsets.ReadOnlyModelViewSet):
+class JobListViewSet(CachedJobPayloadMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [AllowAny]
+    pagination_class = JobPagination
+
+    def get_queryset(self):
+        # Filtres optionnels : ?status=open&location=Douala
+        return filter_jobs(Job.objects.all(), self.request.query_params)
     
 
 # Candidation à une offre par l'utilisateur
@@ -140,35 +177,50 @@ class CandateApplicationViewSet(viewsets.ModelViewSet):
         except Job.DoesNotExist:
             return Response({"details": "Offre d'emploi non fermée ou inexistante."}, status=status.HTTP_404_NOT_FOUND)
         
-        # Verifier si le candidat a déjà ce job
-        if CandidateApplication.objects.filter(candidate=candidate, job=job).exists():
+        try:
+            if settings.SCORING_ASYNC:
+                # Le score et le classement sont calculés par le worker de scoring
+                application = self._create_application(candidate=candidate, job=job, status='pending-score')
+                enqueue_scoring(job)
+            else:
+                # Calcul du score avec AHP puis création de la candidature
+                ahp_score = calculate_candidate_score(candidate, job)
+                application = self._create_application(candidate=candidate, job=job, ahp_score=ahp_score, ranked=True)
+        except IntegrityError:
+            # Contrainte d'unicité (candidat, offre) : le candidat a déjà postulé
             return Response({"detail": "Vous avez déjà postulé à cette offre."}, status=status.HTTP_400_BAD_REQUEST)
         
-        # Calcul du score avec AHP 
-        ahp_score = calculate_candidate_score(candidate, job)
-        
-        # Créer la candidature
-        application = CandidateApplication.objects.create(
-            candidate=candidate,
-            job=job,
-            ahp_score=ahp_score
-        )
-        
-        # Mettre à jour le classement après l'ajout de la nouvelle candidature 
-        self.update_rankings(job)
-        
         serializer = self.get_serializer(application)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
     
+    def _create_application(self, ranked=False, **fields):
+        with transaction.atomic():
+            application = CandidateApplication.objects.create(**fields)
+            record_application(application)
+            if ranked:
+                # Insérer la nouvelle candidature dans le classement (seuls les rangs suivants sont décalés),
+                # dans la même transaction que sa création
+                insert_application_rank(application)
+        return application
+    
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            instance.delete()
+            record_removal(instance)
+    
     @action(detail=False, methods=['get'], permission_classes=[IsCandidate])    
     def my_applications(self, request):
         """
         Lister les candidature du candidat connecté
         """
         candidate = request.user.candidate_profile
-        applications = CandidateApplication.objects.filter(candidate=candidate)
-        serializer = self.get_serializer(applications, many=True)
-        return Response(serializer.data)
+        applications = CandidateApplication.objects.filter(candidate=candidate).select_related('candidate__user', 'job')
+        applications = filter_applications(applications, request.query_params)
+
+        paginator = ApplicationDatePagination()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = CandidateApplicationListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['get'], permission_classes=[IsEmployer])
     def list_for_job(self, request, pk=None):
@@ -176,14 +228,31 @@ class CandateApplicationViewSet(viewsets.ModelViewSet):
         Lister toutes les candidatures pour une offre spécifique
         """
         job = get_object_or_404(Job, id=pk)
-        applications = CandidateApplication.objects.filter(job=job).order_by('-ahp_score')
-        serializer = self.get_serializer(applications, many=True)
-        return Response(serializer.data)
+        applications = CandidateApplication.objects.filter(job=job).select_related('candidate__user', 'job')
+        # Filtres optionnels : ?status=pending&min_score=50&max_score=90
+        applications = filter_applications(applications, request.query_params)
+
+        # Pagination par curseur, meilleurs scores d'abord
+        paginator = ApplicationScorePagination()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = CandidateApplicationListSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
+    
     
+    @action(detail=True, methods=['get'], permission_classes=[IsEmployer])
+    def export(self, request, pk=None):
+        """
+        Export en flux du classement des candidatures d'une offre de l'employeur connecté.
+        ?export_format=csv|jsonl (csv par défaut), mêmes filtres que list_for_job, gzip si accepté par le client
+        """
+        job = get_object_or_404(Job, id=pk, employer__user=request.user)
+        export_format = request.query_params.get('export_format', 'csv')
+        if export_format not in EXPORT_FORMATS:
+            return Response({'detail': "Format d'export non supporté (csv ou jsonl)."}, status=status.HTTP_400_BAD_REQUEST)
+
+        applications = filter_applications(CandidateApplication.objects.filter(job=job), request.query_params)
+        return streaming_export(request, applications, export_format, f'candidatures-offre-{job.pk}')
     
     def update_rankings(self, job):
-        """Mise à jour du classement des candidatures après une nouvelle soumission"""
-        applications = CandidateApplication.objects.filter(job=job).order_by('-ahp_score')
-        for rank, application in enumerate(applications, start=1):
-            application.rank = rank
-            application.save()   
\ No newline at end of file
+        """Recalcul complet du classement des candidatures d'une offre"""
+        rerank_job(job)   
\ No newline at end of file
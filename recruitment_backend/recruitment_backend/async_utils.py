@@ -0,0 +1,70 @@
+"""
+Outils des vues Django asynchrones (DRF ne gère pas les vues async).
+➡️ Authentification : même règle que les vues DRF, jeton JWT (en-tête
+Authorization), sinon session Django.
+➡️ Les calculs longs (scoring, classement, algorithme génétique) sont exécutés
+dans un pool de threads dédié (ASYNC_OFFLOAD_WORKERS) : la boucle d'événements
+reste libre pour les autres requêtes.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from users.permissions import IsEmployer
+
+_jwt_authentication = JWTAuthentication()
+
+executor = ThreadPoolExecutor(max_workers=settings.ASYNC_OFFLOAD_WORKERS, thread_name_prefix='offload')
+
+
+def _run_and_close(func, *args):
+    try:
+        return func(*args)
+    finally:
+        # Connexions ouvertes par ce thread du pool
+        connections.close_all()
+
+
+def submit(func, *args):
+    """Lance func(*args) dans le pool sans attendre le résultat (tâche de fond)"""
+    return executor.submit(_run_and_close, func, *args)
+
+
+async def offload(func, *args):
+    """Exécute func(*args) (code synchrone : ORM, calcul) dans le pool et attend son résultat"""
+    return await asyncio.get_running_loop().run_in_executor(executor, partial(_run_and_close, func, *args))
+
+
+async def aget_user(request):
+    """Utilisateur authentifié de la requête, ou None"""
+    try:
+        authenticated = await sync_to_async(_jwt_authentication.authenticate)(request)
+    except AuthenticationFailed:
+        return None
+    if authenticated is not None:
+        return authenticated[0]
+    user = await request.auser()
+    return user if user.is_authenticated else None
+
+
+def employer_required(view):
+    """Vue async réservée aux employeurs ; l'utilisateur est disponible dans request.user"""
+    @csrf_exempt
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        user = await aget_user(request)
+        if user is None:
+            return JsonResponse({'detail': "Informations d'authentification non fournies."}, status=401)
+        if user.role != 'employer':
+            return JsonResponse({'detail': IsEmployer.message}, status=403)
+        request.user = user
+        return await view(request, *args, **kwargs)
+    return wrapper
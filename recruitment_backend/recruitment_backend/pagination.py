@@ -0,0 +1,131 @@
+"""
+Pagination par curseur (keyset) commune aux différentes API.
+➡️ Le curseur encode la position du dernier élément de la page (valeur du champ
+de tri + id). La page suivante est obtenue par un filtre sur (champ, id) au-delà du
+curseur, au lieu d'un OFFSET : le coût d'une page reste proportionnel à sa taille, quelle
+que soit sa profondeur.
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    ordering: (champ, 'id') ou ('id',), chaque champ avec son propre sens.
+    Exemple : ('-ahp_score', 'id') → meilleurs scores d'abord, puis les plus anciennes.
+    Les valeurs nulles sont placées en dernier.
+    """
+    ordering = ('-id',)
+    page_size = 50
+    max_page_size = 500
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    invalid_cursor_message = 'Curseur invalide.'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def _fields(self):
+        """[(champ, décroissant)] dans l'ordre du tri"""
+        return [(name.lstrip('-'), name.startswith('-')) for name in self.ordering]
+
+    def _order_by(self, fields):
+        return [
+            F(name).desc(nulls_last=True) if descending else F(name).asc(nulls_last=True)
+            for name, descending in fields
+        ]
+
+    def _after(self, fields, position):
+        """Condition « après la position du curseur » dans l'ordre du tri"""
+        lookups = ['lt' if descending else 'gt' for _, descending in fields]
+        if len(fields) == 1:
+            return Q(**{f'{fields[0][0]}__{lookups[0]}': position[0]})
+
+        (field, _), (tiebreaker, _) = fields
+        value, last_id = position
+        if value is None:
+            return Q(**{f'{field}__isnull': True, f'{tiebreaker}__{lookups[1]}': last_id})
+        return (
+            Q(**{f'{field}__{lookups[0]}': value})
+            | Q(**{field: value, f'{tiebreaker}__{lookups[1]}': last_id})
+            | Q(**{f'{field}__isnull': True})
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        fields = self._fields()
+
+        queryset = queryset.order_by(*self._order_by(fields))
+        position = self.decode_cursor(request, queryset.model, [name for name, _ in fields])
+        if position is not None:
+            queryset = queryset.filter(self._after(fields, position))
+
+        results = list(queryset[:page_size + 1])
+        self.next_position = None
+        if len(results) > page_size:
+            results = results[:page_size]
+            self.next_position = [getattr(results[-1], name) for name, _ in fields]
+        return results
+
+    def encode_cursor(self, position):
+        def default(value):
+            if isinstance(value, (datetime, date)):
+                return value.isoformat()
+            if isinstance(value, Decimal):
+                return str(value)
+            raise TypeError(type(value))
+
+        raw = json.dumps(position, default=default).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model, fields):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4))
+            position = json.loads(raw)
+            if not isinstance(position, list) or len(position) != len(fields):
+                raise ValueError
+            return [
+                None if value is None else model._meta.get_field(name).to_python(value)
+                for name, value in zip(fields, position)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
@@ -106,17 +106,81 @@ WSGI_APPLICATION = 'recruitment_backend.wsgi.application'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Envoi des CV (cv_upload) : taille maximale (octets) et extensions acceptées
+CV_UPLOAD_MAX_SIZE = 10 * 1024 * 1024
+CV_UPLOAD_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
+# DB_ENGINE : 'sqlite' (par défaut, développement) ou 'postgresql' (production, nécessite
+# psycopg : pip install "psycopg[binary,pool]")
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'sbse'),
+            'USER': os.environ.get('DB_USER', 'sbse'),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', 'localhost'),
+            'PORT': os.environ.get('DB_PORT', '5432'),
+            # Connexions persistantes : réutilisées d'une requête à l'autre pendant CONN_MAX_AGE secondes
+            'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {},
+        }
+    }
+    # DB_POOL_MAX_SIZE > 0 : pool de connexions psycopg (incompatible avec les connexions persistantes)
+    DB_POOL_MAX_SIZE = int(os.environ.get('DB_POOL_MAX_SIZE', 0))
+    if DB_POOL_MAX_SIZE:
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', 2)),
+            'max_size': DB_POOL_MAX_SIZE,
+            'timeout': 10,
+        }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Attente (s) d'un verrou d'écriture avant l'erreur « database is locked »
+                'timeout': int(os.environ.get('DB_TIMEOUT', 20)),
+                # WAL : les lectures ne sont plus bloquées par l'écriture en cours ;
+                # synchronous=NORMAL suffit en WAL (pas de risque de corruption)
+                'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+                # Les transactions prennent le verrou d'écriture dès le début : pas d'échec
+                # lors du passage d'une transaction de lecture à l'écriture
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+
+
+# Cache
+# CACHE_BACKEND : 'locmem' (par défaut, propre à chaque processus), 'file' (partagé entre
+# les processus d'une machine) ou 'redis' (partagé entre machines, nécessite le paquet redis)
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'sbse'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', str(BASE_DIR / 'cache')),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+}
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': CACHE_BACKENDS[CACHE_BACKEND][0],
+        'LOCATION': os.environ.get('CACHE_LOCATION', CACHE_BACKENDS[CACHE_BACKEND][1]),
+        'TIMEOUT': int(os.environ.get('CACHE_TIMEOUT', 300)),
     }
 }
 
+# Durée (s) de conservation des offres sérialisées (invalidées à chaque modification)
+JOB_CACHE_TIMEOUT = 3600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -163,3 +227,23 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # Lieu de stockage après collectstatic
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
+
+# Scoring des candidatures
+# Si activé, les candidatures sont enregistrées avec le statut 'pending-score' et scorées
+# en arrière-plan par le worker : python manage.py run_scoring_worker
+SCORING_ASYNC = True
+
+# Taille des lots pour l'écriture groupée des scores (ahp_score, ag_score, rank)
+SCORE_PERSIST_BATCH_SIZE = 1000
+
+# Vues asynchrones (ASGI) : threads dédiés aux calculs longs (scoring, classement, AG)
+ASYNC_OFFLOAD_WORKERS = 4
+# Intervalle (s) de lecture de l'état d'une optimisation pour le flux SSE
+GA_RUN_EVENTS_INTERVAL = 0.5
+# Intervalle (s) des signes de vie d'une optimisation en cours ; sans signe de vie depuis
+# GA_RUN_STALE_TIMEOUT (s), l'optimisation est considérée interrompue (redémarrage du serveur)
+GA_RUN_HEARTBEAT_INTERVAL = 10
+GA_RUN_STALE_TIMEOUT = 60
+
+# Taille des lots de validation et d'insertion de l'import en masse (CSV / JSONL)
+IMPORT_BATCH_SIZE = 500
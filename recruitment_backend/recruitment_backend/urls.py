@@ -31,6 +31,10 @@ urlpatterns = [
     path('api/', include('users.urls')),
     path('api/', include('jobs.urls')),
     path('api/', include('ahp_evaluation.urls')),
+    path('api/', include('ga_optimization.urls')),
+    path('api/', include('cv_upload.urls')),
+    path('api/', include('cv_parsing.urls')),
+    path('api/', include('candidate_ranking.urls')),
     
     # Documentation Swagger
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
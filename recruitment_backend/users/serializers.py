@@ -1,9 +1,24 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from users.models import CandidateProfile, EmployerProfile
+from cv_parsing.pipeline import parse_blob
+from cv_upload.storage import UploadError, check_filename, store_file
+from data_normalization.features import refresh_features
+from recruitment_backend.async_utils import submit
 
 User = get_user_model()
 
+
+def store_cv(cv):
+    """
+    Stocke le CV par contenu (un fichier déjà envoyé n'est pas réécrit) et l'analyse en arrière-plan.
+    Retourne le nom du fichier stocké.
+    """
+    blob = store_file(cv)
+    transaction.on_commit(lambda: submit(parse_blob, blob.sha256))
+    return blob.file.name
+
 class UserSerializer(serializers.ModelSerializer):
     # Champs supplémentaires pour le profil candidat
     cv = serializers.FileField(required=False)
@@ -19,6 +34,13 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ['id', 'username','name', 'email', 'password', 'role', 'phone_number', 'cv', 'bio', 'company_name', 'sector', 'description']
         extra_kwargs = {'password': {'write_only': True}}
 
+    def validate_cv(self, value):
+        try:
+            check_filename(value.name)
+        except UploadError as exc:
+            raise serializers.ValidationError(str(exc))
+        return value
+
     def create(self, validated_data):
         # Extraire les données spécifiques au profil
         cv = validated_data.pop('cv', None)
@@ -38,11 +60,15 @@ class UserSerializer(serializers.ModelSerializer):
 
         # Si le rôle est candidat, création du profil candidat
         if user.role == 'candidate':
-            CandidateProfile.objects.create(
+            if cv:
+                cv = store_cv(cv)
+            profile = CandidateProfile.objects.create(
                 user=user,
                 cv=cv,
                 bio=bio
             )
+            # Caractéristiques du candidat calculées une seule fois, à l'écriture
+            refresh_features([profile])
 
         # Si le rôle est employeur, création du profil employeur
         elif user.role == 'employer':
@@ -95,25 +121,40 @@ class UserUpdateSerializer(serializers.ModelSerializer):
             'email' : {'read_only': True},
             'role' : {'read_only': True}
         }
+
+    def validate_cv(self, value):
+        if value:
+            try:
+                check_filename(value.name)
+            except UploadError as exc:
+                raise serializers.ValidationError(str(exc))
+        return value
+
+    def update(self, instance, validated_data):
+        # Mise à jour des champs du modèle User
+        instance.username = validated_data.get('username', instance.username)
+        instance.name = validated_data.get('name', instance.name)
+        instance.phone_number = validated_data.get('phone_number', instance.phone_number)
+        instance.save()
         
-        def update(self, instance, validated_data):
-            # Mise à jour des champs du modèle User
-            instance.username = validated_data.get('username', instance.username)
-            instance.phone_number = validated_data.get('phone_number', instance.phone_number)
-            instance.save()
+        # Mise à jour des chmps en fonction du rôle 
+        if instance.role == 'candidate':
+            candidate_profile = instance.candidate_profile
+            candidate_profile.bio = validated_data.get('bio', candidate_profile.bio)
+            if validated_data.get('cv'):
+                candidate_profile.cv = store_cv(validated_data['cv'])
+            elif 'cv' in validated_data:
+                candidate_profile.cv = None
+            candidate_profile.save()
+            if 'bio' in validated_data or 'cv' in validated_data:
+                # Caractéristiques recalculées à l'écriture (puis à la fin de l'analyse du nouveau CV)
+                refresh_features([candidate_profile])
+            
+        elif instance.role == 'employer':
+            employer_profile = instance.employer_profile
+            employer_profile.company_name = validated_data.get('company_name', employer_profile.company_name)
+            employer_profile.sector = validated_data.get('sector', employer_profile.sector)
+            employer_profile.description = validated_data.get('description', employer_profile.description)
+            employer_profile.save()
             
-            # Mise à jour des chmps en fonction du rôle 
-            if instance.role == 'candidate':
-                candidate_profile = instance.candidate_profile
-                candidate_profile.bio = validated_data.get('bio', candidate_profile.bio)
-                candidate_profile.cv = validated_data.get('cv', candidate_profile.cv)
-                candidate_profile.save()
-                
-            elif instance.role == 'employer':
-                employer_profile = instance.employer_profile
-                employer_profile.company_name = validated_data.get('company_name', employer_profile.company_name)
-                employer_profile.sector = validated_data.get('sector', employer_profile.sector)
-                employer_profile.description = validated_data.get('description', employer_profile.description)
-                employer_profile.save()
-                
-            return instance
\ No newline at end of file
+        return instance
\ No newline at end of file
@@ -4,6 +4,12 @@ from rest_framework.permissions import AllowAny
 from .serializers import UserWithCandidateProfileSerializer, UserWithEmployerProfileSerializer, UserSerializer, UserUpdateSerializer
 from rest_framework import generics, status, viewsets
 from .models import User, CandidateProfile, EmployerProfile
+from recruitment_backend.pagination import KeysetPagination
+
+
+# Utilisateurs : les plus récents d'abord
+class UserPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
 
 
 
@@ -29,6 +35,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [AllowAny]
+    pagination_class = UserPagination
     
 class CandidateProfileViewSet(viewsets.ModelViewSet):
     queryset = CandidateProfile.objects.all()